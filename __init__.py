@@ -20,6 +20,54 @@ truck_capacity = 16
 truck_speed = 18
 starting_location = 0
 
+# The speed of the trucks from each time of day on, as (seconds since midnight, miles per hour) pairs such as
+# [(7 * 3600, 12), (9 * 3600, 18)], None to drive at truck_speed all day
+speed_profile = None
+
+# Seconds each truck spends improving its greedy route with 2-opt and Or-opt moves, 0 to keep the greedy route
+route_improvement_time_budget = 1.0
+
+# Routes with at most this many stops are solved exactly with Held-Karp instead of improved heuristically
+exact_route_max_stops = 15
+
+# Routes too large to solve exactly are improved from this many starts in parallel processes, 0 to improve one start
+multi_start_routes = 0
+
+# Routing over at least this many addresses only considers the candidate_neighbors nearest addresses of each address
+candidate_list_min_locations = 1000
+candidate_neighbors = 10
+
+# Seconds spent searching for a shorter split of the packages between the trucks, 0 to keep the loading plan in main.
+# The search runs as many iterations as fit in the time, so without an iteration cap its plan varies between runs
+fleet_optimization_time_budget = 0
+
+# Iterations the fleet search stops after, so it finds the same plan on every run that finishes them within its time
+# budget, 0 for no cap
+fleet_optimization_max_iterations = 0
+
+# Packages are read from the csv file and added to the package store this many at a time
+package_chunk_size = 10_000
+
+# Store packages in typed column arrays instead of one Package object per package
+columnar_package_store = False
+
 address_csv_file = "data/address.csv"
 distance_csv_file = "data/distance.csv"
 package_csv_file = "data/package.csv"
+package_table_file = "data/package.bin"
+
+# Answer queries from the package_table_file of an earlier run instead of running the day again, while that run read
+# the same files and had the same settings
+reuse_package_table_file = True
+
+# An edge list of road segments to build the distances from instead of distance_csv_file, None to use the csv file
+road_edge_csv_file = None
+
+# The latitude and longitude of each address, to compute distances from on demand when there is no distance matrix
+address_coordinate_csv_file = None
+
+# The most address pair distances a distance oracle keeps cached
+distance_oracle_cache_size = 1 << 20
+
+# Parsed distance matrices are cached here, keyed by the hash of the file they were read from
+distance_cache_directory = "data"
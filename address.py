@@ -19,6 +19,8 @@ class Address:
         id: int,
         name: str,
         address: str,
+        latitude: float = None,
+        longitude: float = None,
     ):
         """
         Initializes an Address object instance with its information.
@@ -27,11 +29,15 @@ class Address:
             id (int): The id of the location.
             name (str): The name of the location.
             address (str): The address.
+            latitude (float): The latitude of the location in degrees, or None if it is not known.
+            longitude (float): The longitude of the location in degrees, or None if it is not known.
         """
 
         self.id = id
         self.name = name
         self.address = address
+        self.latitude = latitude
+        self.longitude = longitude
         self.packages = []
 
     def __str__(self):
@@ -0,0 +1,924 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import concurrent.futures
+import csv
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import __init__
+import address
+import delivery_time_calculator
+import distance_file
+import distance_matrix
+import distance_oracle
+import hash_table
+import nearest_neighbor
+import package
+import read_csv_file
+import road_graph
+import route_optimizer
+import truck
+
+
+def time_call(function, *args) -> float:
+    """
+    Times a single call of a function.
+
+    Args:
+        function (callable): The function to call.
+        *args: The arguments to call the function with.
+
+    Returns:
+        float: The wall-clock time of the call in seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_batch_operations(sizes: [int] = (10_000, 1_000_000)) -> None:
+    """
+    Compares one call per key with the batch operations of the hash table for add, get and update, and prints the
+    timings for each number of keys.
+
+    Args:
+        sizes ([int]): The numbers of keys to benchmark with.
+
+    Returns:
+        None
+    """
+
+    def add_each(table, items):
+        for key, value in items:
+            table.add(key, value)
+
+    def get_each(table, keys):
+        for key in keys:
+            table.get(key)
+
+    def update_each(table, items):
+        for key, value in items:
+            table.update(key, value)
+
+    for size in sizes:
+        items = [(i, i) for i in range(1, size + 1)]
+        keys = [i[0] for i in items]
+
+        single_table = hash_table.HashTable()
+        batch_table = hash_table.HashTable()
+
+        results = [
+            ("add", time_call(add_each, single_table, items), time_call(batch_table.add_many, items)),
+            ("get", time_call(get_each, single_table, keys), time_call(batch_table.get_many, keys)),
+            ("update", time_call(update_each, single_table, items), time_call(batch_table.update_many, items)),
+        ]
+
+        print(f"{size} keys:")
+        for name, single_time, batch_time in results:
+            print(
+                f"\t{name}: {single_time:.4f} s one at a time, {batch_time:.4f} s batched, "
+                f"{single_time / batch_time:.2f}x"
+            )
+
+def benchmark_direct_addressing(sizes: [int] = (40, 10_000, 1_000_000), rounds: int = 3) -> None:
+    """
+    Compares the separate chaining hash table with the direct address hash table on the package table access pattern
+    of Truck.deliver, a get of each package followed by an update of it with its new state, and prints the timings for
+    each number of package IDs. Then checks that sparse and negative integer keys fall back to the buckets.
+
+    Args:
+        sizes ([int]): The numbers of package IDs to benchmark with.
+        rounds (int): The number of times every package is read and written.
+
+    Returns:
+        None
+    """
+
+    def deliver_each(table, keys):
+        for _ in range(rounds):
+            for key in keys:
+                table.update(key, table.get(key))
+
+    for size in sizes:
+        items = [(i, i) for i in range(1, size + 1)]
+        keys = [i[0] for i in items]
+        random.Random(size).shuffle(keys)
+
+        results = []
+        for table_class in (hash_table.HashTable, hash_table.DirectAddressHashTable):
+            table = table_class()
+            table.add_many(items)
+            results.append(time_call(deliver_each, table, keys))
+
+        print(
+            f"{size} package IDs: {results[0]:.4f} s chained, {results[1]:.4f} s direct, "
+            f"{results[0] / results[1]:.2f}x"
+        )
+
+    # Sparse and negative integer keys fall back to the buckets and still come back in order
+    table = hash_table.DirectAddressHashTable()
+    sparse_items = [(i, i) for i in (5, 10 ** 9, -3, 2 ** 40, 7)]
+    table.add_many(sparse_items[:2])
+    for key, value in sparse_items[2:]:
+        table.add(key, value)
+    assert table.chained_count == 3 and table.direct_count == 2, "The keys were not stored where expected."
+    assert list(table.items()) == sorted(sparse_items), "The sparse keys are out of order."
+    assert all(table.get(key) == value for key, value in sparse_items), "A sparse key was lost."
+
+
+def random_distances(size: int, seed: int = 0) -> [[float]]:
+    """
+    Creates a symmetric distance matrix between random points on a plane, rounded to tenths of a mile like the
+    distance CSV file.
+
+    Args:
+        size (int): The number of locations.
+        seed (int): The seed of the random points.
+
+    Returns:
+        [[float]]: The distance matrix.
+    """
+    generator = random.Random(seed)
+    points = [(generator.uniform(0, 20), generator.uniform(0, 20)) for _ in range(size)]
+
+    return [[round(math.dist(i, j), 1) for j in points] for i in points]
+
+
+def benchmark_nearest_neighbor(sizes: [int] = (100, 500, 1000)) -> None:
+    """
+    Compares routing a truck through every location by sorting the distance row at each stop in pure Python, and with
+    NumPy when it is installed, with routing it through a neighbor index cursor. Checks that every way visits the
+    locations in the same order, and prints the timings for each number of locations with the speedup of the neighbor
+    index over the pure Python sort.
+
+    Args:
+        sizes ([int]): The numbers of locations to benchmark with.
+
+    Returns:
+        None
+    """
+
+    def route_sorted(distances):
+        visited = [0]
+        current = 0
+        while len(visited) < len(distances):
+            current = nearest_neighbor.sorted_unvisited_neighbors(distances[current], visited)[0]
+            visited.append(current)
+        return visited
+
+    def route_python(distances):
+        # Sort each row without NumPy, as sorted_unvisited_neighbors does when it is not installed
+        numpy_module = nearest_neighbor.numpy
+        nearest_neighbor.numpy = None
+        try:
+            return route_sorted(distances)
+        finally:
+            nearest_neighbor.numpy = numpy_module
+
+    def route_cursor(distances):
+        cursor = nearest_neighbor.NeighborIndex(distances).cursor([0])
+        visited = [0]
+        current = cursor.nearest(0)
+        while current is not None:
+            visited.append(current)
+            cursor.visit(current)
+            current = cursor.nearest(current)
+        return visited
+
+    for size in sizes:
+        distances = random_distances(size, size)
+
+        assert route_python(distances) == route_cursor(distances), "The routes differ."
+
+        python_time = time_call(route_python, distances)
+        cursor_time = time_call(route_cursor, distances)
+
+        numpy_result = ""
+        if nearest_neighbor.numpy is not None:
+            assert route_sorted(distances) == route_cursor(distances), "The routes differ."
+            numpy_result = f"{time_call(route_sorted, distances):.4f} s sorting each row with NumPy, "
+
+        print(
+            f"{size} locations: {python_time:.4f} s sorting each row, {numpy_result}{cursor_time:.4f} s neighbor "
+            f"index, {python_time / cursor_time:.2f}x"
+        )
+
+
+def benchmark_numpy_nearest_neighbor(sizes: [int] = (1000, 3000)) -> None:
+    """
+    Compares routing a truck through every location with the neighbor index cursor, including building the index,
+    with the NumPy masked argmin cursor, checks that both visit the locations in the same order, and prints the
+    timings for each number of locations. Prints a notice instead when NumPy is not installed.
+
+    Args:
+        sizes ([int]): The numbers of locations to benchmark with.
+
+    Returns:
+        None
+    """
+    if nearest_neighbor.numpy is None:
+        print("NumPy is not installed, skipping the NumPy nearest neighbor benchmark")
+        return
+
+    def route(cursor):
+        visited = [0]
+        current = cursor.nearest(0)
+        while current is not None:
+            visited.append(current)
+            cursor.visit(current)
+            current = cursor.nearest(current)
+        return visited
+
+    def route_index(distances):
+        return route(nearest_neighbor.NeighborIndex(distances).cursor([0]))
+
+    def route_numpy(distances):
+        return route(nearest_neighbor.NumpyNeighborCursor(nearest_neighbor.distance_array(distances), [0]))
+
+    for size in sizes:
+        distances = random_distances(size, size)
+
+        assert route_index(distances) == route_numpy(distances), "The routes differ."
+
+        index_time = time_call(route_index, distances)
+        numpy_time = time_call(route_numpy, [list(i) for i in distances])
+
+        print(
+            f"{size} locations: {index_time:.4f} s neighbor index, {numpy_time:.4f} s NumPy, "
+            f"{index_time / numpy_time:.2f}x"
+        )
+
+def greedy_route(distances: [[float]]) -> [int]:
+    """
+    Plans a nearest neighbor route from location 0 through every location and back to location 0.
+
+    Args:
+        distances ([[float]]): The distance matrix.
+
+    Returns:
+        [int]: The locations of the route in visiting order.
+    """
+    cursor = nearest_neighbor.neighbor_cursor(distances, [0])
+    route = [0]
+    current = cursor.nearest(0)
+    while current is not None:
+        route.append(current)
+        cursor.visit(current)
+        current = cursor.nearest(current)
+
+    return route + [0]
+
+
+def benchmark_route_improvement(sizes: [int] = (50, 200, 500), time_budget: float = 5.0) -> None:
+    """
+    Improves nearest neighbor routes through random locations with 2-opt and Or-opt moves and prints how much shorter
+    the improved routes are and how long the improvement took for each number of locations.
+
+    Args:
+        sizes ([int]): The numbers of locations to benchmark with.
+        time_budget (float): The number of seconds each route may be improved for.
+
+    Returns:
+        None
+    """
+    for size in sizes:
+        distances = random_distances(size, size)
+        route = greedy_route(distances)
+
+        start = time.perf_counter()
+        improved_route = route_optimizer.improve_route(route, distances, time_budget)
+        elapsed = time.perf_counter() - start
+
+        assert sorted(improved_route) == sorted(route), "The improved route does not visit the same locations."
+
+        greedy_distance = route_optimizer.route_distance(route, distances)
+        improved_distance = route_optimizer.route_distance(improved_route, distances)
+
+        print(
+            f"{size} locations: {greedy_distance:.1f} miles greedy, {improved_distance:.1f} miles improved "
+            f"in {elapsed:.2f} s, greedy is {greedy_distance / improved_distance - 1:.1%} longer"
+        )
+
+def benchmark_exact_routes(sizes: [int] = (8, 12, 15), seeds: int = 5) -> None:
+    """
+    Compares Held-Karp routes with 2-opt and Or-opt routes through random locations and prints the average solve times
+    and how much longer the heuristic routes are for each number of stops.
+
+    Args:
+        sizes ([int]): The numbers of stops to benchmark with.
+        seeds (int): The number of random location sets per number of stops.
+
+    Returns:
+        None
+    """
+    for size in sizes:
+        exact_time = heuristic_time = 0.0
+        exact_distance = heuristic_distance = 0.0
+
+        for seed in range(seeds):
+            distances = random_distances(size + 1, seed)
+            route = greedy_route(distances)
+
+            start = time.perf_counter()
+            exact_route = route_optimizer.solve_exact(route, distances)
+            exact_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            heuristic_route = route_optimizer.improve_route(route, distances)
+            heuristic_time += time.perf_counter() - start
+
+            exact_distance += route_optimizer.route_distance(exact_route, distances)
+            heuristic_distance += route_optimizer.route_distance(heuristic_route, distances)
+
+        assert exact_distance <= heuristic_distance + 1e-6, "Held-Karp found a longer route than the heuristic."
+
+        print(
+            f"{size} stops: {exact_time / seeds:.4f} s Held-Karp, {heuristic_time / seeds:.4f} s 2-opt and Or-opt, "
+            f"heuristic routes {heuristic_distance / exact_distance - 1:.2%} longer"
+        )
+
+def benchmark_multi_start(size: int = 200, starts: int = 8, time_budget: float = 2.0) -> None:
+    """
+    Compares improving a nearest neighbor route through random locations once with improving it from many starts in a
+    process pool, and prints the route distances and timings.
+
+    Args:
+        size (int): The number of locations.
+        starts (int): The number of starts of the multi-start search.
+        time_budget (float): The number of seconds each start may spend improving its route.
+
+    Returns:
+        None
+    """
+    distances = random_distances(size, size)
+    route = greedy_route(distances)
+
+    start = time.perf_counter()
+    single_route = route_optimizer.improve_route(route, distances, time_budget)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    multi_route = route_optimizer.multi_start_route(
+        route, distances, delivery_time_calculator.clock_time(8), {}, starts, time_budget
+    )
+    multi_time = time.perf_counter() - start
+
+    assert sorted(multi_route) == sorted(route), "The multi-start route does not visit the same locations."
+
+    print(
+        f"{size} locations: {route_optimizer.route_distance(single_route, distances):.1f} miles from one start "
+        f"in {single_time:.2f} s, {route_optimizer.route_distance(multi_route, distances):.1f} miles from "
+        f"{starts} starts on {os.cpu_count()} processors in {multi_time:.2f} s"
+    )
+
+def benchmark_candidate_lists(size: int = 1500, k: int = 10, time_budget: float = 60.0) -> None:
+    """
+    Compares routing and improving a route through random locations with full distance rows and with k-nearest
+    candidate lists, checks that both build the same nearest neighbor route, and prints the distances and timings.
+
+    Args:
+        size (int): The number of locations.
+        k (int): The number of candidates per location.
+        time_budget (float): The number of seconds each improvement may take.
+
+    Returns:
+        None
+    """
+
+    def route_with(index):
+        cursor = index.cursor([0])
+        route = [0]
+        current = cursor.nearest(0)
+        while current is not None:
+            route.append(current)
+            cursor.visit(current)
+            current = cursor.nearest(current)
+        return route + [0]
+
+    distances = random_distances(size, size)
+
+    start = time.perf_counter()
+    full_route = route_with(nearest_neighbor.NeighborIndex(distances))
+    full_route_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidate_index = nearest_neighbor.CandidateIndex(distances, k)
+    candidate_route = route_with(candidate_index)
+    candidate_route_time = time.perf_counter() - start
+
+    assert full_route == candidate_route, "The nearest neighbor routes differ."
+
+    start = time.perf_counter()
+    full_improved = route_optimizer.improve_route(full_route, distances, time_budget)
+    full_improve_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidate_improved = route_optimizer.improve_route(
+        candidate_route, distances, time_budget, candidates=candidate_index.candidates
+    )
+    candidate_improve_time = time.perf_counter() - start
+
+    print(
+        f"{size} locations, routing: {full_route_time:.2f} s sorted rows, {candidate_route_time:.2f} s {k} candidates"
+    )
+    print(
+        f"{size} locations, improving: {route_optimizer.route_distance(full_improved, distances):.1f} miles in "
+        f"{full_improve_time:.2f} s with every move, {route_optimizer.route_distance(candidate_improved, distances):.1f} "
+        f"miles in {candidate_improve_time:.2f} s with {k} candidates"
+    )
+
+
+def benchmark_distance_cache(size: int = 2000) -> None:
+    """
+    Writes a random distance matrix as a lower triangular csv file like data/distance.csv, and compares parsing it
+    with loading it from its binary cache. Prints the timings.
+
+    Args:
+        size (int): The number of locations.
+
+    Returns:
+        None
+    """
+    distances = random_distances(size, size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_file = os.path.join(directory, "distance.csv")
+        with open(csv_file, "w", newline="") as file_open:
+            writer = csv.writer(file_open)
+            for i in range(size):
+                writer.writerow(distances[i][: i + 1] + [""] * (size - i - 1))
+
+        start = time.perf_counter()
+        parsed = read_csv_file.get_distances(csv_file, cache=False)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        distance_file.cached_distances(csv_file, read_csv_file.parse_distances, directory)
+        first_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached = distance_file.cached_distances(csv_file, read_csv_file.parse_distances, directory)
+        cached_time = time.perf_counter() - start
+
+        assert cached.values.tolist() == parsed.values.tolist(), "The cached matrix differs."
+
+        print(
+            f"{size} locations: {parse_time:.2f} s parsing the csv file, {first_time:.2f} s parsing and writing the "
+            f"cache, {cached_time:.3f} s loading the cache"
+        )
+        del cached
+
+
+def benchmark_distance_matrix(size: int = 2000) -> None:
+    """
+    Compares the memory of a random distance matrix as a list of lists of floats and as a DistanceMatrix, and the time
+    to read every distance of each. Prints the results.
+
+    Args:
+        size (int): The number of locations.
+
+    Returns:
+        None
+    """
+    tracemalloc.start()
+    rows = random_distances(size, size)
+    rows_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    matrix = distance_matrix.DistanceMatrix.from_rows(rows)
+    matrix_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    pairs = [(i, j) for i in range(0, size, 7) for j in range(size)]
+    rows_time = time_call(lambda: sum(rows[i][j] for i, j in pairs))
+    matrix_time = time_call(lambda: sum(matrix.dist(i, j) for i, j in pairs))
+
+    print(
+        f"{size} locations: {rows_memory / 2 ** 20:.1f} MiB as lists, {matrix_memory / 2 ** 20:.1f} MiB as a "
+        f"DistanceMatrix; {len(pairs)} reads in {rows_time:.3f} s from lists, {matrix_time:.3f} s with dist"
+    )
+
+
+def benchmark_distance_oracle(size: int = 100_000, seed: int = 0) -> None:
+    """
+    Routes random addresses with coordinates around Salt Lake City nearest address first through a distance oracle
+    and its spatial index, then adds up the route twice, the second time from the oracle's cache. A DistanceMatrix of
+    the same addresses would hold size * (size - 1) / 2 doubles. Prints the timings, the memory of the oracle and a
+    cursor, and the cache statistics.
+
+    Args:
+        size (int): The number of addresses.
+        seed (int): The seed of the random coordinates.
+
+    Returns:
+        None
+    """
+    generator = random.Random(seed)
+    addresses = [
+        address.Address(
+            i, f"Location {i}", f"{i} Main St", 40.6 + generator.random() * 0.2, -112.0 + generator.random() * 0.2
+        )
+        for i in range(size)
+    ]
+
+    tracemalloc.start()
+    oracle = distance_oracle.DistanceOracle(addresses)
+    cursor = nearest_neighbor.neighbor_cursor(oracle, [0])
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    route = [0]
+    location = cursor.nearest(0)
+    while location is not None:
+        route.append(location)
+        cursor.visit(location)
+        location = cursor.nearest(location)
+    route_time = time.perf_counter() - start
+
+    first_time = time_call(route_optimizer.route_distance, route + [0], oracle)
+    second_time = time_call(route_optimizer.route_distance, route + [0], oracle)
+
+    print(
+        f"{size} addresses: {route_time:.2f} s routing {route_optimizer.route_distance(route + [0], oracle):.1f} "
+        f"miles, {first_time:.2f} s adding up the route, {second_time:.2f} s again from the cache, "
+        f"{memory / 2 ** 20:.0f} MiB instead of a {distance_matrix.triangle_size(size) * 8 / 2 ** 30:.0f} GiB matrix, "
+        f"{oracle.cache_info()}"
+    )
+
+
+def benchmark_arrival_times(
+    size: int = 1000, stops: [int] = (16, 64, 256), candidates: int = 2000
+) -> None:
+    """
+    Works out the arrival times of random candidate routes three ways: one time_updater call per leg, as Truck.deliver
+    used to, route_arrival_times for each route, and batch_arrival_times for all of them at once. Checks that all three
+    agree and prints the timings.
+
+    Args:
+        size (int): The number of locations of the distance matrix.
+        stops ([int]): The numbers of stops of the routes.
+        candidates (int): The number of routes of each length.
+
+    Returns:
+        None
+    """
+    distances = distance_matrix.DistanceMatrix.from_rows(random_distances(size))
+    start_time = delivery_time_calculator.clock_time(8)
+    delivery_time_calculator.travel_times(distances)
+
+    def per_leg(routes):
+        all_times = []
+        for route in routes:
+            times = [start_time]
+            for i in range(1, len(route)):
+                times.append(
+                    delivery_time_calculator.time_updater(times[-1], distances.dist(route[i - 1], route[i]))
+                )
+            all_times.append(times)
+        return all_times
+
+    def per_route(routes):
+        return [delivery_time_calculator.route_arrival_times(i, distances, start_time) for i in routes]
+
+    def batch(routes):
+        return delivery_time_calculator.batch_arrival_times(routes, distances, start_time)
+
+    generator = random.Random(0)
+    for length in stops:
+        routes = [[0] + generator.sample(range(1, size), length) + [0] for _ in range(candidates)]
+        assert per_leg(routes) == per_route(routes) == batch(routes), "The arrival times differ."
+
+        per_leg_time = time_call(per_leg, routes)
+        per_route_time = time_call(per_route, routes)
+        batch_time = time_call(batch, routes)
+
+        print(
+            f"{candidates} routes of {length} stops: {per_leg_time:.3f} s per leg, {per_route_time:.3f} s per route, "
+            f"{batch_time:.3f} s batched, {per_leg_time / batch_time:.1f}x"
+        )
+
+
+def benchmark_speed_profile(size: int = 1000, legs: int = 200_000, candidates: int = 2000, stops: int = 64) -> None:
+    """
+    Builds the travel time tables of a random distance matrix for a speed profile with slow rush hours, then looks up
+    random legs at random departure times in the tables and works them out from their distances, and drives random
+    candidate routes through the tables one at a time and batched. Checks that the lookups agree with the profile,
+    that no leg arrives earlier by leaving later, and prints the timings.
+
+    Args:
+        size (int): The number of locations of the distance matrix.
+        legs (int): The number of legs looked up.
+        candidates (int): The number of candidate routes.
+        stops (int): The number of stops of each candidate route.
+
+    Returns:
+        None
+    """
+    distances = distance_matrix.DistanceMatrix.from_rows(random_distances(size))
+    profile = delivery_time_calculator.SpeedProfile(
+        [(0, 30), (7 * 3600, 12), (9 * 3600, 20), (16 * 3600, 10), (18 * 3600, 25)]
+    )
+
+    build_time = time_call(delivery_time_calculator.TravelTimeTables, distances, profile)
+    tables = delivery_time_calculator.travel_times(distances, profile)
+
+    generator = random.Random(0)
+    queries = [
+        (generator.randrange(size), generator.randrange(size), generator.randrange(delivery_time_calculator.seconds_per_day))
+        for _ in range(legs)
+    ]
+
+    def lookup():
+        return [tables.time(i, j, departure) for i, j, departure in queries]
+
+    def compute():
+        return [profile.travel_time(distances.dist(i, j), departure) for i, j, departure in queries]
+
+    assert lookup() == compute(), "The tables and the profile disagree."
+    for i, j, departure in queries[:200]:
+        arrivals = [k + tables.time(i, j, k) for k in range(departure, departure + 600)]
+        assert arrivals == sorted(arrivals), "Leaving later arrives earlier."
+
+    lookup_time = time_call(lookup)
+    compute_time = time_call(compute)
+
+    routes = [[0] + generator.sample(range(1, size), stops) + [0] for _ in range(candidates)]
+    start_time = delivery_time_calculator.clock_time(8)
+
+    def per_route():
+        return [delivery_time_calculator.route_arrival_times(i, distances, start_time, profile) for i in routes]
+
+    def batch():
+        return delivery_time_calculator.batch_arrival_times(routes, distances, start_time, profile)
+
+    assert per_route() == batch(), "The arrival times differ."
+    per_route_time = time_call(per_route)
+    batch_time = time_call(batch)
+
+    print(
+        f"{size} locations: {build_time:.2f} s building {len(set(map(id, tables.tables)))} tables, {legs} legs "
+        f"{lookup_time:.3f} s looked up, {compute_time:.3f} s from distances, {candidates} routes of {stops} stops "
+        f"{per_route_time:.3f} s one at a time, {batch_time:.3f} s batched"
+    )
+
+
+def benchmark_road_graph(size: int = 1000, degree: int = 4, workers: int = 4) -> None:
+    """
+    Writes a random connected road graph as an edge list csv file, and compares building its distance matrix with
+    Dijkstra's algorithm in this process and across a process pool. Checks the two matrices match and meet the
+    triangle inequality on random triples. Prints the timings.
+
+    Args:
+        size (int): The number of locations.
+        degree (int): The number of random road segments from each location, on top of a path through all of them.
+        workers (int): The number of worker processes.
+
+    Returns:
+        None
+    """
+    generator = random.Random(size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        edge_file = os.path.join(directory, "road.csv")
+        with open(edge_file, "w", newline="") as file_open:
+            writer = csv.writer(file_open)
+            for i in range(1, size):
+                writer.writerow([i - 1, i, round(generator.uniform(0.1, 10), 1)])
+            for i in range(size):
+                for _ in range(degree):
+                    writer.writerow([i, generator.randrange(size), round(generator.uniform(0.1, 10), 1)])
+
+        start = time.perf_counter()
+        serial = road_graph.read_distances(edge_file, 1)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = road_graph.read_distances(edge_file, workers)
+        pooled_time = time.perf_counter() - start
+
+        assert serial.values == pooled.values, "The process pool matrix differs."
+        for _ in range(10_000):
+            i, j, k = (generator.randrange(size) for _ in range(3))
+            assert serial[i][k] <= serial[i][j] + serial[j][k] + 1e-9, "The triangle inequality does not hold."
+
+        print(
+            f"{size} locations, {size * (degree + 1)} road segments: {serial_time:.2f} s in one process, "
+            f"{pooled_time:.2f} s across {workers} processes"
+        )
+
+
+def benchmark_package_ingestion(
+    package_count: int = 200_000, address_count: int = 5_000, chunk_sizes: [int] = (1_000, 10_000)
+) -> None:
+    """
+    Writes a large random package csv file like data/package.csv, and times streaming it into a package table in
+    chunks. Also reads the chunks without keeping them to show the memory the reader itself holds. Prints the timings
+    and peak memory for each chunk size.
+
+    Args:
+        package_count (int): The number of packages in the file.
+        address_count (int): The number of addresses the packages go to.
+        chunk_sizes ([int]): The chunk sizes to compare.
+
+    Returns:
+        None
+    """
+    generator = random.Random(package_count)
+    addresses = [address.Address(i, f"Location {i}", f"{i} Main St") for i in range(address_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        package_file = os.path.join(directory, "package.csv")
+        with open(package_file, "w", newline="") as file_open:
+            writer = csv.writer(file_open)
+            for i in range(1, package_count + 1):
+                writer.writerow(
+                    [i, addresses[generator.randrange(address_count)].address, "Salt Lake City", "UT", "84101",
+                     "EOD", generator.randint(1, 50), ""]
+                )
+
+        for chunk_size in chunk_sizes:
+            tracemalloc.start()
+            for _ in read_csv_file.read_package_chunks(package_file, addresses, chunk_size):
+                pass
+            reader_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            table = package.PackageTable()
+            for chunk in read_csv_file.read_package_chunks(package_file, addresses, chunk_size):
+                table.add_many(chunk)
+            load_time = time.perf_counter() - start
+
+            assert table.count == package_count, "Packages are missing from the table."
+            print(
+                f"{package_count} packages, {address_count} addresses, chunks of {chunk_size}: {load_time:.2f} s "
+                f"into a package table, {reader_peak / 2 ** 20:.1f} MiB peak while streaming"
+            )
+
+
+def benchmark_truck_delivery(package_counts: [int] = (1000, 5000), address_count: int = 1000) -> None:
+    """
+    Loads one truck with random packages to random addresses, sends it out, and drives a random route through all
+    of its addresses without improving it, so the timings are those of the truck keeping track of its packages and
+    not of choosing its stops. Checks every package is delivered and prints the timings of each step.
+
+    Args:
+        package_counts ([int]): The numbers of packages on the truck.
+        address_count (int): The number of addresses.
+
+    Returns:
+        None
+    """
+    saved = (__init__.addresses, __init__.distances, __init__.packages, __init__.route_improvement_time_budget)
+    __init__.addresses = [address.Address(i, f"Location {i}", f"{i} Main St") for i in range(address_count)]
+    __init__.distances = distance_matrix.DistanceMatrix.from_rows(random_distances(address_count))
+    __init__.route_improvement_time_budget = 0
+
+    # Build the travel times and the neighbor index up front, so they are not timed with the first truck
+    delivery_time_calculator.travel_times(__init__.distances)
+    nearest_neighbor.neighbor_cursor(__init__.distances, [])
+
+    try:
+        for package_count in package_counts:
+            generator = random.Random(package_count)
+            __init__.packages = package.PackageTable()
+            __init__.packages.add_many(
+                (
+                    i,
+                    package.Package(
+                        id=i,
+                        address_id=generator.randrange(1, address_count),
+                        address_name="",
+                        address="",
+                        city="Salt Lake City",
+                        state="UT",
+                        zip="84101",
+                        delivery_deadline="EOD",
+                        weight_kilo=1,
+                        special_notes="",
+                    ),
+                )
+                for i in range(1, package_count + 1)
+            )
+            new_truck = truck.Truck(1, "At Hub", 0)
+
+            start = time.perf_counter()
+            for i in range(1, package_count + 1):
+                new_truck.load_truck(i)
+            load_time = time.perf_counter() - start
+
+            depart_time = time_call(new_truck.depart_truck, delivery_time_calculator.clock_time(8))
+
+            route = new_truck.addresses[1:]
+            generator.shuffle(route)
+            deliver_time = time_call(new_truck.deliver_all, route)
+
+            assert len(new_truck.packages_delivered) == package_count, "Packages were not delivered."
+            print(
+                f"{package_count} packages to {len(route)} addresses on one truck: {load_time:.3f} s loading, "
+                f"{depart_time:.3f} s departing, {deliver_time:.3f} s delivering"
+            )
+    finally:
+        __init__.addresses, __init__.distances, __init__.packages, __init__.route_improvement_time_budget = saved
+
+
+def stress_concurrent_table(
+    key_count: int = 100_000,
+    writers: int = 4,
+    readers: int = 4,
+    rounds: int = 5,
+) -> None:
+    """
+    Runs writer and reader threads against one concurrent hash table in a thread pool. Each writer owns a slice of the
+    keys and rewrites it every round with a new round number, while readers look up random keys and check that every
+    value they see belongs to its key and never goes back to an older round. Raises an AssertionError on any
+    inconsistency and prints the throughput otherwise.
+
+    Args:
+        key_count (int): The number of keys in the table.
+        writers (int): The number of writer threads.
+        readers (int): The number of reader threads.
+        rounds (int): The number of times each writer rewrites its keys.
+
+    Returns:
+        None
+    """
+    table = hash_table.ConcurrentHashTable()
+    done = []
+
+    def write(writer: int) -> int:
+        keys = range(writer, key_count, writers)
+        for round_number in range(rounds):
+            for key in keys:
+                table.add(key, (key, round_number))
+        return len(keys) * rounds
+
+    def read(seed: int) -> int:
+        generator = random.Random(seed)
+        last_seen = {}
+        reads = 0
+        while len(done) == 0:
+            key = generator.randrange(key_count)
+            value = table.get(key)
+            reads += 1
+            if value is not None:
+                assert value[0] == key, f"Key {key} returned the value of key {value[0]}."
+                assert value[1] >= last_seen.get(key, 0), f"Key {key} went back to an older round."
+                last_seen[key] = value[1]
+        return reads
+
+    start = time.perf_counter()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=writers + readers) as executor:
+        read_futures = [executor.submit(read, i) for i in range(readers)]
+        write_futures = [executor.submit(write, i) for i in range(writers)]
+
+        writes = sum(i.result() for i in write_futures)
+        done.append(True)
+        reads = sum(i.result() for i in read_futures)
+
+    elapsed = time.perf_counter() - start
+
+    assert len(table) == key_count, f"Table has {len(table)} keys instead of {key_count}."
+    for key in range(key_count):
+        assert table.get(key) == (key, rounds - 1), f"Key {key} lost its last write."
+
+    print(
+        f"Concurrent table: {writes} writes and {reads} reads by {writers} writers and {readers} readers "
+        f"in {elapsed:.2f} s, consistent"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_batch_operations()
+    benchmark_direct_addressing()
+    benchmark_nearest_neighbor()
+    benchmark_numpy_nearest_neighbor()
+    benchmark_route_improvement()
+    benchmark_exact_routes()
+    benchmark_multi_start()
+    benchmark_candidate_lists()
+    benchmark_distance_cache()
+    benchmark_distance_matrix()
+    benchmark_distance_oracle()
+    benchmark_arrival_times()
+    benchmark_speed_profile()
+    benchmark_road_graph()
+    benchmark_package_ingestion()
+    benchmark_truck_delivery()
+    stress_concurrent_table()
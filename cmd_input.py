@@ -18,6 +18,7 @@
 import datetime
 
 import __init__
+import delivery_time_calculator
 import hash_table
 import package
 import search_function
@@ -49,7 +50,7 @@ def prompt_menu():
                 time_input = prompt_time()
                 packages_at_time = package_list_at_time(time_input, __init__.packages)
                 show_all_packages(time_input, packages_at_time)
-                show_truck_distances(packages_at_time, time_input, __init__.trucks)
+                show_truck_distances(__init__.packages, time_input, __init__.trucks)
                 option = None
             elif option == 2:
                 time_input = prompt_time()
@@ -65,23 +66,25 @@ def prompt_menu():
             option = None
 
 
-def prompt_time() -> datetime.time:
+def prompt_time() -> int:
     """
     Get the command line input from the user. The user is prompted to enter an hour, minute, and AM/PM. The function
     checks the input is a number between 1 and 12 for the hour, between 0 and 59 for the minute, and either AM or PM for
     the time of day. If the input is not valid, the function raises a ValueError. If the input is valid, the function
-    returns the time as a datetime.time object. The function is used to get the time that the user wants to look back
+    returns the time on the simulation clock. The function is used to get the time that the user wants to look back
     into.
 
     Returns:
-        datetime.time: The time as a datetime.time object.
+        int: The time in seconds since midnight.
     """
     time_input = None
 
     while time_input is None:
         time_input = input("Enter time (HH:MM AM/PM): ")
         try:
-            time_input = datetime.datetime.strptime(time_input, "%I:%M %p").time()
+            time_input = delivery_time_calculator.to_seconds(
+                datetime.datetime.strptime(time_input, "%I:%M %p").time()
+            )
         except ValueError:
             print("Invalid input. Please enter time in the format HH:MM AM/PM.")
             time_input = None
@@ -90,7 +93,7 @@ def prompt_time() -> datetime.time:
 
 
 def package_list_at_time(
-        time: datetime.time,
+        time: int,
         packages: hash_table.HashTable = __init__.packages,
 ) -> list:
     """
@@ -98,7 +101,7 @@ def package_list_at_time(
     function is used to get the list of packages in the system at a specific time.
 
     Args:
-        time (datetime.time): The time to check the status of the packages.
+        time (int): The time to check the status of the packages.
         packages (hash_table.HashTable): The HashTable of packages in the system.
 
     Returns:
@@ -106,24 +109,21 @@ def package_list_at_time(
 
     Notes:
         time complexity:
-            best case: O(n^2)
-            worst case: O(n^2)
-            average case: O(n^2)
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
         space complexity:
             best case: O(n)
             worst case: O(n)
             average case: O(n)
     """
-    packages_table = packages.get_all()  # O(n^2) - function call
-    packages_list = [i[1] for i in packages_table]  # O(n) - for loop
-
     return search_function.package_status_at_time(
-        packages_list, time
-    )  # O(n^2) - function call
+        packages, time
+    )  # O(n) - function call
 
 
 def show_all_packages(
-        time: datetime.time,
+        time: int,
         packages_at_time: [package.Package],
 ) -> None:
     """
@@ -131,7 +131,7 @@ def show_all_packages(
     each package in the system. The function is used to display all the packages in the system to the user.
 
     Args:
-        time (datetime.time): The time to check the status of the packages.
+        time (int): The time to check the status of the packages.
         packages_at_time ([package.Package]): The list of packages in the system at the specific
 
 
@@ -149,13 +149,13 @@ def show_all_packages(
             average case: O(n)
     """
 
-    print(f"\nAll Packages at {time.strftime('%I:%M %p')}:\n")
+    print(f"\nAll Packages at {delivery_time_calculator.to_time(time).strftime('%I:%M %p')}:\n")
 
     # Print all the packages in the system
     for package in packages_at_time:  # O(n) - for loop
         if package.delivery_status == "Delivered":
             print(
-                f"ID: {package.id}, Address: {package.address}, City: {package.city}, State: {package.state}, Zip: {package.zip}, Weight: {package.weight_kilo}, Truck: {package.truck_id}, Delivery Deadline: {package.delivery_deadline}, Delivery Status: {package.delivery_status}, Delivery Time: {package.delivery_time}"
+                f"ID: {package.id}, Address: {package.address}, City: {package.city}, State: {package.state}, Zip: {package.zip}, Weight: {package.weight_kilo}, Truck: {package.truck_id}, Delivery Deadline: {package.delivery_deadline}, Delivery Status: {package.delivery_status}, Delivery Time: {delivery_time_calculator.to_time(package.delivery_time)}"
             )
         else:
             print(
@@ -166,8 +166,8 @@ def show_all_packages(
 
 
 def show_truck_distances(
-        packages_at_time: [package.Package],
-        time: datetime.time,
+        packages: package.PackageTable,
+        time: int,
         trucks: list = __init__.trucks,
 ) -> None:
     """
@@ -176,7 +176,8 @@ def show_truck_distances(
     user.
 
     Args:
-        time (datetime.time): The time to check the status of the packages.
+        packages (package.PackageTable): The package table to look up the packages of the trucks in.
+        time (int): The time to check the status of the packages.
         trucks (list): The list of trucks in the system.
 
     Returns:
@@ -184,9 +185,9 @@ def show_truck_distances(
 
     Notes:
         time complexity:
-            best case: O(n^2)
-            worst case: O(n^2)
-            average case: O(n^2)
+            best case: O(n log n)
+            worst case: O(n log n)
+            average case: O(n log n)
         space complexity:
             best case: O(n)
             worst case: O(n)
@@ -196,19 +197,20 @@ def show_truck_distances(
     total_distances = float(0)
     for i in trucks:  # O(n) - for loop
         distance_traveled = search_function.distance_traveled(
-            i, packages_at_time, time
-        )  # O(n^2) - function call
-        print(f"Truck {i.id} mileage: {distance_traveled} miles")
+            i, packages, time
+        )  # O(k log k) - function call
+        # Distances are in tenths of a mile, so round away the noise of adding them up in a different order
+        print(f"Truck {i.id} mileage: {round(distance_traveled, 1)} miles")
         distance_traveled_list.append(distance_traveled)
         total_distances += distance_traveled
 
     print(
-        f"\nTotal mileage of all trucks at {time.strftime('%I:%M %p')}: {total_distances} miles\n"
+        f"\nTotal mileage of all trucks at {delivery_time_calculator.to_time(time).strftime('%I:%M %p')}: {round(total_distances, 1)} miles\n"
     )
 
 
 def show_specific_package(
-        time: datetime.time, packages: hash_table.HashTable = __init__.packages
+        time: int, packages: hash_table.HashTable = __init__.packages
 ) -> None:
     """
     Show a specific package in the system. The function prompts the user to enter a package ID. The function checks if
@@ -218,7 +220,7 @@ def show_specific_package(
     package in the system to the user.
 
     Args:
-        time (datetime.time): The time to check the status of the packages.
+        time (int): The time to check the status of the packages.
         packages (hash_table.HashTable): The HashTable of packages in the system.
 
     Returns:
@@ -254,7 +256,7 @@ def show_specific_package(
             else:
                 if package.delivery_status == "Delivered":
                     print(
-                        f"\nID: {package.id}, Address: {package.address}, City: {package.city}, State: {package.state}, Zip: {package.zip}, Weight: {package.weight_kilo}, Truck: {package.truck_id}, Delivery Deadline: {package.delivery_deadline}, Delivery Status: {package.delivery_status}, Delivery Time: {package.delivery_time}\n"
+                        f"\nID: {package.id}, Address: {package.address}, City: {package.city}, State: {package.state}, Zip: {package.zip}, Weight: {package.weight_kilo}, Truck: {package.truck_id}, Delivery Deadline: {package.delivery_deadline}, Delivery Status: {package.delivery_status}, Delivery Time: {delivery_time_calculator.to_time(package.delivery_time)}\n"
                     )
                 else:
                     print(
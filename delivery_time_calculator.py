@@ -16,22 +16,122 @@
 #
 #  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import array
+import bisect
 import datetime
+import itertools
+import sys
 
 import __init__
+import distance_matrix
+
+try:
+    import numpy
+except ImportError:
+    # Add up the legs of routes in pure Python when NumPy is not installed
+    numpy = None
+
+# Times in the simulation are whole seconds since midnight of the day the trucks leave, and go past a day for trucks
+# still out after midnight. They become datetime.time only to be shown.
+seconds_per_day = 24 * 3600
+
+# The deadline of packages due by the end of the day, one second before midnight
+end_of_day = seconds_per_day - 1
+
+# A time after every event of the simulation, to look at everything that has happened
+latest_time = sys.maxsize
+
+# The number of long-lived distance matrices and speeds whose travel times are kept, such as the city at each speed
+travel_time_cache_size = 8
+
+# The fewest stops a route needs for NumPy to add up its legs faster than a Python loop
+numpy_route_min_stops = 32
+
+
+def clock_time(hour: int, minute: int = 0, second: int = 0) -> int:
+    """Returns a time of the day the trucks leave on the simulation clock.
+
+    Args:
+        hour (int): The hour, from 0 to 23.
+        minute (int): The minute. Defaults to 0.
+        second (int): The second. Defaults to 0.
+
+    Returns:
+        int: The number of seconds since midnight.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    return hour * 3600 + minute * 60 + second
+
+
+def to_seconds(time: datetime.time) -> int:
+    """Converts a time of day to the simulation clock.
+
+    Args:
+        time (datetime.time): The time of day.
+
+    Returns:
+        int: The number of seconds since midnight.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    return clock_time(time.hour, time.minute, time.second)
+
+
+def to_time(seconds: int or None) -> datetime.time or None:
+    """Converts a time on the simulation clock to a time of day to show it. Times after midnight show as the time on
+    the next day.
+
+    Args:
+        seconds (int or None): The number of seconds since midnight, or None for no time.
+
+    Returns:
+        datetime.time or None: The time of day, or None if there is no time.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    if seconds is None:
+        return None
+
+    seconds %= seconds_per_day
+    return datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
 
 
 def delivery_time_calculator(
     distance: float, speed: float = __init__.truck_speed
-) -> datetime.time:
-    """Calculates the delivery time based on the distance and speed.
+) -> int:
+    """Calculates the time it takes to travel a distance at a speed, to the nearest second.
 
     Args:
         distance (float): The distance to be traveled.
         speed (float): The speed of the vehicle.
 
     Returns:
-        datetime.time: The delivery time.
+        int: The travel time in seconds.
 
     Notes:
         time complexity:
@@ -43,26 +143,23 @@ def delivery_time_calculator(
             worst case: O(1)
             average case: O(1)
     """
-    time = distance / speed
-    hours = int(time)
-    minutes = int((time - hours) * 60)
-    return datetime.time(hours, minutes)
+    return round(distance * 3600 / speed)
 
 
 def time_updater(
-    current_time: datetime.time,
+    current_time: int,
     distance: float,
     speed: float = __init__.truck_speed,
-) -> datetime.time:
+) -> int:
     """Updates the current time based on the delivery time.
 
     Args:
-        current_time (datetime.time): The current time.
+        current_time (int): The current time in seconds since midnight.
         distance (float): The distance to be traveled.
         speed (float): The speed of the vehicle. Defaults to truck_speed.
 
     Returns:
-        datetime.time: The updated time.
+        int: The updated time in seconds since midnight.
 
     Notes:
         time complexity:
@@ -74,18 +171,688 @@ def time_updater(
             worst case: O(1)
             average case: O(1)
     """
-    # Convert the current time to hours
-    current_time_converted = current_time.hour + current_time.minute / 60
+    return current_time + delivery_time_calculator(distance, speed)
+
+
+def truck_speed() -> float:
+    """Returns the speed of the trucks, read when called so a changed truck_speed is used.
+
+    Returns:
+        float: The speed of the trucks in miles per hour.
+    """
+    return __init__.truck_speed
+
+
+# The speed profile built from speed_profile, with the setting it was built from
+_speed_profile = (None, None)
+
+
+def current_speed():
+    """Returns the speed the trucks drive at: a SpeedProfile of speed_profile when it is set, truck_speed all day
+    otherwise. The profile is built once for each speed_profile setting.
+
+    Returns:
+        float or SpeedProfile: The speed of the trucks.
+
+    Notes:
+        time complexity: O(1) once built, O(p log p) to build
+        space complexity: O(p)
+    """
+    global _speed_profile
+
+    if __init__.speed_profile is None:
+        return truck_speed()
+
+    if _speed_profile[0] is not __init__.speed_profile:
+        _speed_profile = (__init__.speed_profile, SpeedProfile(__init__.speed_profile))
+
+    return _speed_profile[1]
+
+
+class SpeedProfile:
+    """
+    The speed of the trucks through the day, constant within each period and the same every day. A truck that drives
+    into the next period drives the rest of its leg at the speed of that period, so departing later never means
+    arriving earlier.
+
+    Attributes:
+        starts ([int]): The time of day each period starts, in seconds since midnight, the first at midnight.
+        ends ([int]): The time of day each period ends, the last at the end of the day.
+        speeds ([float]): The speed of each period in miles per hour.
+        distances_before ([float]): The miles driven from midnight to the start of each period.
+        day_distance (float): The miles driven in a whole day.
+        minute_periods (array.array): The period each minute of the day starts in.
+    """
+
+    def __init__(self, periods: [(int, float)]):
+        """
+        Initializes a speed profile.
+
+        Args:
+            periods ([(int, float)]): The time of day each period starts, in seconds since midnight, and its speed in
+                miles per hour. The time before the first period has the speed of the last period.
+
+        Raises:
+            ValueError: If there are no periods, two periods start at the same time, a period starts outside the day,
+                or a speed is not above 0.
+
+        Notes:
+            time complexity:
+                best case: O(p log p)
+                worst case: O(p log p)
+                average case: O(p log p)
+            space complexity:
+                best case: O(p)
+                worst case: O(p)
+                average case: O(p)
+        """
+        periods = sorted(periods)  # O(p log p) - sort by start
+        if not periods:
+            raise ValueError("A speed profile needs at least one period.")
+
+        for i, (start, speed) in enumerate(periods):  # O(p) - for loop
+            if not 0 <= start < seconds_per_day:
+                raise ValueError(f"The period starting at {start} does not start within a day.")
+            if speed <= 0:
+                raise ValueError(f"The period starting at {start} has a speed of {speed}, not above 0.")
+            if i > 0 and start == periods[i - 1][0]:
+                raise ValueError(f"Two periods start at {start}.")
+
+        if periods[0][0] != 0:
+            periods.insert(0, (0, periods[-1][1]))
+
+        self.starts = [i[0] for i in periods]
+        self.ends = self.starts[1:] + [seconds_per_day]
+        self.speeds = [i[1] for i in periods]
+        self.distances_before = list(
+            itertools.accumulate(
+                (
+                    (end - start) * speed / 3600
+                    for start, end, speed in zip(self.starts, self.ends, self.speeds)
+                ),
+                initial=0.0,
+            )
+        )  # O(p) - running sum
+        self.day_distance = self.distances_before.pop()
+        self.minute_periods = array.array(
+            "I", (bisect.bisect_right(self.starts, i) - 1 for i in range(0, seconds_per_day, 60))
+        )  # O(m log p) - generator over the minutes of the day
+
+    def period(self, time: int) -> int:
+        """
+        Returns the period of the day a time is in.
+
+        Args:
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            int: The index of the period.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        time_of_day = time % seconds_per_day
+        period = self.minute_periods[time_of_day // 60]
+
+        # A period may start part of the way through the minute
+        while time_of_day >= self.ends[period]:
+            period += 1
+
+        return period
+
+    def distance_at(self, time: int) -> float:
+        """
+        Returns the miles a truck driving since midnight has driven by a time.
+
+        Args:
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            float: The miles driven.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        day, time_of_day = divmod(time, seconds_per_day)
+        period = self.period(time_of_day)
+
+        return (
+            day * self.day_distance
+            + self.distances_before[period]
+            + (time_of_day - self.starts[period]) * self.speeds[period] / 3600
+        )
+
+    def time_at(self, distance: float) -> float:
+        """
+        Returns the time a truck driving since midnight has driven a distance by.
+
+        Args:
+            distance (float): The miles driven.
+
+        Returns:
+            float: The time in seconds since midnight.
+
+        Notes:
+            time complexity: O(log p)
+            space complexity: O(1)
+        """
+        day, rest = divmod(distance, self.day_distance)
+        period = bisect.bisect_right(self.distances_before, rest) - 1
+
+        return (
+            day * seconds_per_day
+            + self.starts[period]
+            + (rest - self.distances_before[period]) * 3600 / self.speeds[period]
+        )
+
+    def travel_time(self, distance: float, departure: int) -> int:
+        """
+        Returns the time it takes to drive a distance leaving at a time, to the nearest second.
+
+        Args:
+            distance (float): The distance to drive.
+            departure (int): The time the truck leaves, in seconds since midnight.
+
+        Returns:
+            int: The travel time in seconds.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(log p)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        period = self.period(departure)
+        seconds = distance * 3600 / self.speeds[period]
+
+        # A leg that ends within the period it starts in is driven at one speed
+        if departure % seconds_per_day + seconds <= self.ends[period]:
+            return round(seconds)
+
+        return round(self.time_at(self.distance_at(departure) + distance)) - departure
+
+
+class TravelTimeMatrix(distance_matrix.DistanceMatrix):
+    """
+    The travel time in whole seconds between every pair of locations of a distance matrix at one speed, stored like
+    distance_matrix.DistanceMatrix, so driving a leg is one lookup and an add on the simulation clock.
+
+    Attributes:
+        speed (float): The speed the travel times are for.
+    """
+
+    typecode = "q"
+
+    zero = 0
+
+    def __init__(self, size: int = 0, values=None, speed: float = None):
+        """
+        Initializes a travel time matrix, with every travel time zero or over existing values.
+
+        Args:
+            size (int): The number of locations. Defaults to 0.
+            values (array.array): The travel times below the diagonal, row by row. Defaults to zeros.
+            speed (float): The speed the travel times are for. Defaults to truck_speed.
+        """
+        super().__init__(size, values)
+        self.speed = speed if speed is not None else truck_speed()
+
+    @classmethod
+    def from_distances(cls, distances, speed: float = None) -> "TravelTimeMatrix":
+        """
+        Returns the travel times of a distance matrix at a speed.
+
+        Args:
+            distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix.
+            speed (float): The speed to travel at. Defaults to truck_speed.
+
+        Returns:
+            TravelTimeMatrix: The travel time between every pair of locations.
+
+        Notes:
+            time complexity:
+                best case: O(n^2)
+                worst case: O(n^2)
+                average case: O(n^2)
+            space complexity:
+                best case: O(n^2)
+                worst case: O(n^2)
+                average case: O(n^2)
+        """
+        if speed is None:
+            speed = truck_speed()
+        if not isinstance(distances, distance_matrix.DistanceMatrix):
+            distances = distance_matrix.DistanceMatrix.from_rows(distances)  # O(n^2) - function call
+
+        values = array.array(
+            cls.typecode, [delivery_time_calculator(i, speed) for i in distances.values]
+        )  # O(n^2) - list comprehension
+
+        return cls(len(distances), values, speed)
+
+    def time(self, i: int, j: int, departure: int = None) -> int:
+        """
+        Returns the travel time between two locations, which is the same at any departure time.
+
+        Args:
+            i (int): The first location.
+            j (int): The second location.
+            departure (int): The time the truck leaves the first location. Not used.
+
+        Returns:
+            int: The travel time in seconds.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        return self.dist(i, j)
+
+
+class TravelTimeTables:
+    """
+    The travel times between every pair of locations of a distance matrix in each period of a speed profile, as one
+    TravelTimeMatrix for each speed of the profile. The travel time of a leg is a lookup in the table of the period it
+    leaves in, and only a leg that drives into the next period is worked out from its distance.
+
+    Attributes:
+        profile (SpeedProfile): The speed profile.
+        distances (distance_matrix.DistanceMatrix): The distance matrix.
+        tables ([TravelTimeMatrix]): The travel times of each period of the profile.
+    """
+
+    def __init__(self, distances, profile: SpeedProfile):
+        """
+        Initializes the travel time tables of a distance matrix.
+
+        Args:
+            distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix.
+            profile (SpeedProfile): The speed profile.
+
+        Notes:
+            time complexity:
+                best case: O(n^2)
+                worst case: O(s * n^2) for s different speeds
+                average case: O(s * n^2)
+            space complexity:
+                best case: O(n^2)
+                worst case: O(s * n^2)
+                average case: O(s * n^2)
+        """
+        if not isinstance(distances, distance_matrix.DistanceMatrix):
+            distances = distance_matrix.DistanceMatrix.from_rows(distances)  # O(n^2) - function call
+
+        self.profile = profile
+        self.distances = distances
+
+        by_speed = {}
+        for speed in profile.speeds:  # O(p) - for loop
+            if speed not in by_speed:
+                by_speed[speed] = TravelTimeMatrix.from_distances(distances, speed)  # O(n^2) - function call
+        self.tables = [by_speed[i] for i in profile.speeds]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of locations.
+
+        Returns:
+            int: The number of locations.
+        """
+        return len(self.distances)
+
+    def time(self, i: int, j: int, departure: int) -> int:
+        """
+        Returns the travel time between two locations leaving at a time.
+
+        Args:
+            i (int): The first location.
+            j (int): The second location.
+            departure (int): The time the truck leaves the first location, in seconds since midnight.
+
+        Returns:
+            int: The travel time in seconds.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(log p)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        profile = self.profile
+        period = profile.period(departure)
+        seconds = self.tables[period].dist(i, j)
+
+        if departure % seconds_per_day + seconds <= profile.ends[period]:
+            return seconds
+
+        return profile.travel_time(self.distances.dist(i, j), departure)  # O(log p) - leg into the next period
+
+
+# The travel times of the long-lived distance matrices seen last, by the id of the distances and the speed, with the
+# distances kept so an id is not reused while it is in the cache
+_travel_time_cache = {}
+
+# The last short-lived distance matrix, such as the stop distances of one route, its speed and its travel times, kept
+# apart so it never pushes a long-lived matrix out of _travel_time_cache
+_scratch_travel_times = (None, None, None)
+
+
+def travel_times(distances, speed=None) -> TravelTimeMatrix or TravelTimeTables or None:
+    """
+    Returns the travel times of a distance matrix. A distance matrix is turned into a TravelTimeMatrix at a constant
+    speed, or into TravelTimeTables for a speed profile, the first time it is seen with the speed. The travel times of
+    the last travel_time_cache_size long-lived matrices, a DistanceMatrix or the distances of the addresses, are kept,
+    while only the last of any other matrix is, such as the stop distances built for one route. A distance oracle has
+    no matrix, so its travel times are computed from its distances on demand.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or distance_oracle.DistanceOracle or [[float]]): The distances.
+        speed (float or SpeedProfile): The speed to travel at. Defaults to the speed of the trucks.
+
+    Returns:
+        TravelTimeMatrix or TravelTimeTables or None: The travel times, or None for a distance oracle.
+
+    Notes:
+        time complexity:
+            best case: O(1) when cached
+            worst case: O(s * n^2) to build for s different speeds
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(s * n^2)
+            average case: O(s * n^2)
+    """
+    if speed is None:
+        speed = current_speed()
+
+    global _scratch_travel_times
+
+    if not isinstance(distances, distance_matrix.DistanceMatrix) and hasattr(distances, "dist"):
+        return None
+
+    if not isinstance(distances, distance_matrix.DistanceMatrix) and distances is not __init__.distances:
+        if _scratch_travel_times[0] is not distances or _scratch_travel_times[1] != speed:
+            _scratch_travel_times = (
+                distances, speed, _build_travel_times(distances, speed)
+            )  # O(s * n^2) - function call
+        return _scratch_travel_times[2]
+
+    key = (id(distances), speed)
+    if key not in _travel_time_cache:
+        if len(_travel_time_cache) >= travel_time_cache_size:
+            del _travel_time_cache[next(iter(_travel_time_cache))]  # O(1) - drop the oldest matrix
+        _travel_time_cache[key] = (distances, _build_travel_times(distances, speed))  # O(s * n^2) - function call
+
+    return _travel_time_cache[key][1]
+
+
+def _build_travel_times(distances, speed) -> TravelTimeMatrix or TravelTimeTables:
+    """
+    Builds the travel times of a distance matrix at a constant speed or for a speed profile.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix.
+        speed (float or SpeedProfile): The speed to travel at.
+
+    Returns:
+        TravelTimeMatrix or TravelTimeTables: The travel times.
+
+    Notes:
+        time complexity: O(s * n^2)
+        space complexity: O(s * n^2)
+    """
+    if isinstance(speed, SpeedProfile):
+        return TravelTimeTables(distances, speed)  # O(s * n^2) - function call
+
+    return TravelTimeMatrix.from_distances(distances, speed)  # O(n^2) - function call
+
+
+def travel_time_function(distances, speed=None):
+    """
+    Returns a function for the travel time between two locations leaving at a time, looked up in the travel times of
+    the distances.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or distance_oracle.DistanceOracle or [[float]]): The distances.
+        speed (float or SpeedProfile): The speed to travel at. Defaults to the speed of the trucks.
+
+    Returns:
+        function: Takes two locations and the time the truck leaves the first, and returns the travel time between
+            them in seconds.
+
+    Notes:
+        time complexity: O(1) once built, O(s * n^2) to build
+        space complexity: O(s * n^2)
+    """
+    if speed is None:
+        speed = current_speed()
+
+    times = travel_times(distances, speed)  # O(s * n^2) - function call the first time
+    if times is None:
+        dist = distances.dist
+        if isinstance(speed, SpeedProfile):
+            return lambda i, j, departure: speed.travel_time(dist(i, j), departure)
+        return lambda i, j, departure=None: delivery_time_calculator(dist(i, j), speed)
+
+    return times.time
+
+
+def _leg_times(times: TravelTimeMatrix, stops):
+    """
+    Returns the travel time of every leg of routes with NumPy, by looking up each pair of consecutive stops in the
+    travel times at once.
+
+    Args:
+        times (TravelTimeMatrix): The travel times.
+        stops (numpy.ndarray): The locations of the routes in visiting order, one route per row.
+
+    Returns:
+        numpy.ndarray: The travel time of each leg, one route per row, with one column fewer than stops.
+
+    Notes:
+        time complexity: O(r * n)
+        space complexity: O(r * n)
+    """
+    start = stops[..., :-1]
+    end = stops[..., 1:]
+    high = numpy.maximum(start, end)
+    low = numpy.minimum(start, end)
+    same = high == low
 
-    # Calculate the delivery time and convert it to hours
-    delivery_time = delivery_time_calculator(distance, speed)
-    delivery_time_converted = delivery_time.hour + delivery_time.minute / 60
+    if len(times.values) == 0:
+        return numpy.zeros(high.shape, dtype=numpy.int64)
 
-    # Add the current time and delivery time to get the updated time
-    updated_time = current_time_converted + delivery_time_converted
+    values = numpy.frombuffer(times.values, dtype=numpy.int64)
+    legs = values[numpy.where(same, 0, high * (high - 1) // 2 + low)]  # O(r * n) - gather
+    legs[same] = 0
 
-    # Convert the updated time to hours and minutes
-    hours = int(updated_time)
-    minutes = int((updated_time - hours) * 60)
+    return legs
+
+
+def _profile_arrival_times(tables: TravelTimeTables, stops, start_time: int):
+    """
+    Returns the arrival times of routes through travel time tables with NumPy. The legs of every route are looked up
+    in the table of every period at once, then the routes are driven a leg at a time together, each leg taking the
+    travel time of the period it leaves in. Legs that drive into the next period are worked out one by one.
+
+    Args:
+        tables (TravelTimeTables): The travel time tables.
+        stops (numpy.ndarray): The locations of the routes in visiting order, one route per row.
+        start_time (int): The time the trucks leave the first location of their route, in seconds since midnight.
+
+    Returns:
+        numpy.ndarray: The arrival times, one route per row.
+
+    Notes:
+        time complexity: O(s * r * n)
+        space complexity: O(s * r * n)
+    """
+    profile = tables.profile
+    starts = numpy.asarray(profile.starts, dtype=numpy.int64)
+    ends = numpy.asarray(profile.ends, dtype=numpy.int64)
+
+    gathered = {}
+    for i in tables.tables:  # O(s) - for loop
+        if id(i) not in gathered:
+            gathered[id(i)] = _leg_times(i, stops)  # O(r * n) - function call
+    legs = numpy.stack([gathered[id(i)] for i in tables.tables])
+
+    rows = numpy.arange(len(stops))
+    arrivals = numpy.empty(stops.shape, dtype=numpy.int64)
+    arrivals[:, 0] = start_time
+
+    for k in range(stops.shape[1] - 1):  # O(n) - for loop over the legs of all routes together
+        departure = arrivals[:, k]
+        time_of_day = departure % seconds_per_day
+        period = numpy.searchsorted(starts, time_of_day, side="right") - 1
+        seconds = legs[period, rows, k]
+        arrivals[:, k + 1] = departure + seconds
+
+        for i in numpy.flatnonzero(time_of_day + seconds > ends[period]):  # O(r) - legs into the next period
+            arrivals[i, k + 1] = departure[i] + tables.time(
+                int(stops[i, k]), int(stops[i, k + 1]), int(departure[i])
+            )
+
+    return arrivals
+
+
+def route_arrival_times(
+    route: [int], distances, start_time: int, speed=None
+) -> [int]:
+    """
+    Returns the time a truck arrives at each location of a route. At a constant speed, it is the start time plus the
+    running sum of the travel times of the legs, looked up and added together with NumPy when it is installed and the
+    route has at least numpy_route_min_stops stops, and in a Python loop otherwise. With a speed profile, each leg
+    takes the travel time of when it leaves, so the legs are driven one after another.
+
+    Args:
+        route ([int]): The locations of the route in visiting order, starting with the location the truck is at.
+        distances (distance_matrix.DistanceMatrix or distance_oracle.DistanceOracle or [[float]]): The distances.
+        start_time (int): The time the truck leaves the first location, in seconds since midnight.
+        speed (float or SpeedProfile): The speed to travel at. Defaults to the speed of the trucks.
+
+    Returns:
+        [int]: The arrival time at each location of the route, with the start time for the first location.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(s * n^2) to build the travel times
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(s * n^2)
+            average case: O(n)
+    """
+    if speed is None:
+        speed = current_speed()
+
+    times = travel_times(distances, speed)  # O(s * n^2) - function call the first time
+
+    if isinstance(times, TravelTimeMatrix):
+        if numpy is not None and len(route) >= numpy_route_min_stops:
+            legs = _leg_times(times, numpy.asarray(route, dtype=numpy.int64))  # O(n) - function call
+            return [start_time] + (numpy.cumsum(legs) + start_time).tolist()  # O(n) - running sum
+
+        return list(
+            itertools.accumulate(map(times.time, route[:-1], route[1:]), initial=start_time)
+        )  # O(n) - running sum
+
+    time = travel_time_function(distances, speed)
+    arrivals = [start_time]
+    for i in range(1, len(route)):  # O(n) - for loop, each leg leaving when the last one arrives
+        arrivals.append(arrivals[-1] + time(route[i - 1], route[i], arrivals[-1]))
+
+    return arrivals
+
+
+def batch_arrival_times(
+    routes: [[int]], distances, start_time: int, speed=None
+) -> [[int]]:
+    """
+    Returns the arrival times of many routes from the same start time, such as the candidates of a local search. With
+    NumPy installed, routes with the same number of stops are evaluated together: every leg of every route is looked
+    up at once, then the running sums are taken along each route at a constant speed, or the routes are driven a leg
+    at a time together with a speed profile.
+
+    Args:
+        routes ([[int]]): The routes, each the locations in visiting order.
+        distances (distance_matrix.DistanceMatrix or distance_oracle.DistanceOracle or [[float]]): The distances.
+        start_time (int): The time the trucks leave the first location of their route, in seconds since midnight.
+        speed (float or SpeedProfile): The speed to travel at. Defaults to the speed of the trucks.
+
+    Returns:
+        [[int]]: The arrival times of each route, as route_arrival_times returns them.
+
+    Notes:
+        time complexity:
+            best case: O(r * n)
+            worst case: O(s * (r * n + n^2)) to build the travel times
+            average case: O(r * n)
+        space complexity:
+            best case: O(r * n)
+            worst case: O(s * (r * n + n^2))
+            average case: O(r * n)
+    """
+    if speed is None:
+        speed = current_speed()
+
+    times = travel_times(distances, speed)  # O(s * n^2) - function call the first time
+
+    if (
+        numpy is None
+        or times is None
+        or not routes
+        or len(set(map(len, routes))) != 1
+        or len(routes[0]) < 2
+    ):
+        return [
+            route_arrival_times(i, distances, start_time, speed) for i in routes
+        ]  # O(r * n) - list comprehension
+
+    stops = numpy.asarray(routes, dtype=numpy.int64)
+
+    if isinstance(times, TravelTimeTables):
+        return _profile_arrival_times(times, stops, start_time).tolist()  # O(s * r * n) - function call
+
+    arrivals = numpy.empty(stops.shape, dtype=numpy.int64)
+    arrivals[:, 0] = 0
+    numpy.cumsum(_leg_times(times, stops), axis=1, out=arrivals[:, 1:])  # O(r * n) - running sums
+    arrivals += start_time
+
+    return arrivals.tolist()
+
+
+def deadline_time(delivery_deadline: str) -> int:
+    """Converts a package delivery deadline to a time on the simulation clock.
+
+    Args:
+        delivery_deadline (str): The delivery deadline as HH:MM AM/PM, or EOD for the end of the day.
+
+    Returns:
+        int: The time the package must be delivered by, in seconds since midnight.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    if delivery_deadline == "EOD":
+        return end_of_day
 
-    return datetime.time(hours, minutes)
+    return to_seconds(datetime.datetime.strptime(delivery_deadline, "%I:%M %p").time())
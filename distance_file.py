@@ -0,0 +1,216 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import array
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+
+import __init__
+import distance_matrix
+
+# The first bytes of every binary distance matrix file
+magic = b"DISTTRI1"
+
+# The magic bytes, the number of locations, and padding so the doubles after the header are 8-byte aligned
+header_struct = struct.Struct("<8sII")
+
+# The number of bytes read at a time when hashing a file
+hash_chunk_size = 1 << 20
+
+
+def content_hash(file: str) -> str:
+    """
+    Returns the SHA-256 hash of the contents of a file.
+
+    Args:
+        file (str): The path of the file to hash.
+
+    Returns:
+        str: The hexadecimal hash of the file contents.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    digest = hashlib.sha256()
+
+    with open(file, "rb") as file_open:
+        for chunk in iter(lambda: file_open.read(hash_chunk_size), b""):  # O(n) - for loop over chunks
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def cache_file(
+    source_file: str, cache_directory: str = __init__.distance_cache_directory
+) -> str:
+    """
+    Returns the path of the distance matrix cache of a source file, named after the source file and the hash of its
+    contents, so a changed source file never matches an old cache.
+
+    Args:
+        source_file (str): The path of the file the distance matrix is read from.
+        cache_directory (str): The directory of the cache files. Defaults to distance_cache_directory.
+
+    Returns:
+        str: The path of the cache file.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    stem = os.path.splitext(os.path.basename(source_file))[0]
+
+    return os.path.join(
+        cache_directory, f"{stem}-{content_hash(source_file)[:16]}.bin"
+    )  # O(n) - function call
+
+
+def dump(distances: distance_matrix.DistanceMatrix, file: str) -> None:
+    """
+    Writes a distance matrix to a binary distance matrix file: a header followed by the distances below the diagonal
+    as little-endian doubles, in the order of DistanceMatrix.values. The file is written next to its final path and
+    moved into place, so a reader never maps a half-written file.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix): The distance matrix to write.
+        file (str): The path of the file to write.
+
+    Returns:
+        None
+
+    Notes:
+        time complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+        space complexity:
+            best case: O(1)
+            worst case: O(n^2)
+            average case: O(1)
+    """
+    temporary_file = file + ".tmp"
+
+    with open(temporary_file, "wb") as file_open:
+        file_open.write(header_struct.pack(magic, distances.size, 0))
+        if sys.byteorder == "little":
+            file_open.write(memoryview(distances.values).cast("B"))  # O(n^2) - buffer write
+        else:
+            values = array.array("d", distances.values)  # O(n^2) - copy to swap
+            values.byteswap()
+            file_open.write(values.tobytes())
+
+    os.replace(temporary_file, file)
+
+
+def load(file: str) -> distance_matrix.DistanceMatrix:
+    """
+    Maps a distance matrix file written by dump into memory and returns a distance matrix over the mapping, so
+    distances are read without loading the file into Python objects. The operating system pages in only the parts of
+    the file that are used.
+
+    Args:
+        file (str): The path of the file to map.
+
+    Returns:
+        distance_matrix.DistanceMatrix: The distance matrix, backed by the mapped file.
+
+    Raises:
+        ValueError: If the file is not a distance matrix file.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    with open(file, "rb") as file_open:
+        mapping = mmap.mmap(file_open.fileno(), 0, access=mmap.ACCESS_READ)
+
+    file_magic, size, _ = header_struct.unpack_from(mapping)
+    count = distance_matrix.triangle_size(size)
+    if file_magic != magic or len(mapping) != header_struct.size + count * 8 or sys.byteorder != "little":
+        raise ValueError(f"{file} is not a distance matrix file of this machine.")
+
+    return distance_matrix.DistanceMatrix(
+        size, memoryview(mapping)[header_struct.size :].cast("d")
+    )  # O(n) - row views
+
+
+def cached_distances(
+    source_file: str,
+    read_function,
+    cache_directory: str = __init__.distance_cache_directory,
+) -> distance_matrix.DistanceMatrix:
+    """
+    Returns the distance matrix of a source file from its cache, reading the source file only when it has changed
+    since the cache was written. A fresh matrix is written to a new cache file and the caches of older versions of
+    the source file are removed.
+
+    Args:
+        source_file (str): The path of the file the distance matrix is read from.
+        read_function (function): Reads the distance matrix from the source file when there is no cache for it, as a
+            distance_matrix.DistanceMatrix.
+        cache_directory (str): The directory of the cache files. Defaults to distance_cache_directory.
+
+    Returns:
+        distance_matrix.DistanceMatrix: The distance matrix, backed by the mapped cache file or as just read.
+
+    Notes:
+        time complexity:
+            best case: O(n) to hash the source file and map the cache
+            worst case: O(n^2) plus the read function
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n^2)
+            average case: O(n)
+    """
+    file = cache_file(source_file, cache_directory)  # O(n) - function call
+
+    if os.path.exists(file):
+        try:
+            return load(file)  # O(n) - function call
+        except ValueError:
+            pass
+
+    distances = read_function(source_file)
+
+    os.makedirs(cache_directory, exist_ok=True)
+    dump(distances, file)  # O(n^2) - function call
+
+    # Remove the caches of older versions of the source file, leaving the caches of other source files
+    pattern = re.compile(re.escape(os.path.splitext(os.path.basename(source_file))[0]) + r"-[0-9a-f]{16}\.bin")
+    for i in os.listdir(cache_directory):  # O(f) - for loop
+        path = os.path.join(cache_directory, i)
+        if pattern.fullmatch(i) and path != file:
+            os.remove(path)
+
+    return distances
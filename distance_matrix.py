@@ -0,0 +1,316 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import array
+
+
+def triangle_size(size: int) -> int:
+    """
+    Returns the number of distances below the diagonal of a square matrix.
+
+    Args:
+        size (int): The number of rows and columns of the matrix.
+
+    Returns:
+        int: The number of distances stored for the matrix.
+    """
+    return size * (size - 1) // 2
+
+
+def distance_function(distances):
+    """
+    Returns a function for the distance between two locations of a DistanceMatrix, of anything else with a dist
+    method such as a distance_oracle.DistanceOracle, or of a list of rows.
+
+    Args:
+        distances (DistanceMatrix or [[float]]): The distance matrix.
+
+    Returns:
+        function: Takes two locations and returns the distance between them.
+    """
+    if hasattr(distances, "dist"):
+        return distances.dist
+
+    return lambda i, j: distances[i][j]
+
+
+def matrix_row(distances, i: int) -> [float]:
+    """
+    Returns the distances from a location to every location of a DistanceMatrix, of anything else with a row method
+    such as a distance_oracle.DistanceOracle, or of a list of rows.
+
+    Args:
+        distances (DistanceMatrix or [[float]]): The distance matrix.
+        i (int): The location.
+
+    Returns:
+        [float]: The distances from the location, in location order.
+
+    Notes:
+        time complexity: O(n) for a DistanceMatrix, O(1) for a list of rows
+        space complexity: O(n) for a DistanceMatrix, O(1) for a list of rows
+    """
+    if hasattr(distances, "row"):
+        return distances.row(i)  # O(n) - function call
+
+    return distances[i]
+
+
+class DistanceRow:
+    """
+    A view of one row of a DistanceMatrix, so code written for a list of rows can index it as distances[i][j].
+
+    Attributes:
+        matrix (DistanceMatrix): The matrix the row belongs to.
+        values (array.array or memoryview): The distances below the diagonal of the matrix.
+        index (int): The row of the matrix.
+        offset (int): The position of the first distance of the row in the values.
+    """
+
+    __slots__ = ("matrix", "values", "index", "offset")
+
+    def __init__(self, matrix, index: int):
+        """
+        Initializes a view of a row of a distance matrix.
+
+        Args:
+            matrix (DistanceMatrix): The matrix the row belongs to.
+            index (int): The row of the matrix.
+        """
+        self.matrix = matrix
+        self.values = matrix.values
+        self.index = index
+        self.offset = triangle_size(index)
+
+    def __getitem__(self, column: int) -> float:
+        """
+        Returns the distance from the location of the row to another location.
+
+        Args:
+            column (int): The other location.
+
+        Returns:
+            float: The distance between the two locations.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        if column < self.index:
+            return self.values[self.offset + column]
+        if column > self.index:
+            return self.values[column * (column - 1) // 2 + self.index]
+        return self.matrix.zero
+
+    def __len__(self) -> int:
+        """
+        Returns the number of columns of the row.
+
+        Returns:
+            int: The number of columns of the row.
+        """
+        return self.matrix.size
+
+    def __iter__(self):
+        """
+        Iterates over the distances from the location of the row to every location.
+
+        Returns:
+            iterator: The distances of the row, in column order.
+        """
+        return iter(self.tolist())
+
+    def tolist(self) -> [float]:
+        """
+        Returns the distances of the row as a list. The distances before the diagonal are one slice of the values, and
+        the distances after it are read one column at a time.
+
+        Returns:
+            [float]: The distances of the row, in column order.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        row = self.values[self.offset : self.offset + self.index].tolist()  # O(n) - slice copy
+        row.append(self.matrix.zero)
+
+        offset = self.offset + self.index
+        for column in range(self.index + 1, self.matrix.size):  # O(n) - for loop
+            # The row's distance to each later location is the same distance into that location's row
+            row.append(self.values[offset + self.index])
+            offset += column
+
+        return row
+
+
+class DistanceMatrix:
+    """
+    A symmetric distance matrix that stores each distance once. The distances below the diagonal are kept row by row
+    in one flat array of doubles, so distance (i, j) with i > j is at i * (i - 1) / 2 + j, and the diagonal is zero.
+    This takes 8 bytes per pair of locations instead of two boxed floats and two list slots per pair for a list of
+    lists.
+
+    Attributes:
+        size (int): The number of locations.
+        values (array.array or memoryview): The distances below the diagonal, row by row.
+        rows ([DistanceRow]): A view of each row, for code that indexes the matrix as distances[i][j].
+    """
+
+    # The array type code of the values of a new matrix
+    typecode = "d"
+
+    # The distance from a location to itself
+    zero = 0.0
+
+    def __init__(self, size: int = 0, values=None):
+        """
+        Initializes a distance matrix, with every distance zero or over existing values.
+
+        Args:
+            size (int): The number of locations. Defaults to 0.
+            values (array.array or memoryview): The distances below the diagonal, row by row. Defaults to a new array
+                of zeros of typecode. Only an array can grow with append_row.
+
+        Raises:
+            ValueError: If the number of values does not match the number of locations.
+        """
+        if values is None:
+            values = array.array(self.typecode, bytes(array.array(self.typecode).itemsize * triangle_size(size)))
+        elif len(values) != triangle_size(size):
+            raise ValueError(f"{len(values)} distances do not fill a matrix of {size} locations.")
+
+        self.size = 0
+        self.values = values
+        self.rows = []
+
+        for _ in range(size):  # O(n) - for loop
+            self.rows.append(DistanceRow(self, self.size))
+            self.size += 1
+
+    @classmethod
+    def from_rows(cls, rows) -> "DistanceMatrix":
+        """
+        Returns a distance matrix with the distances of a square matrix, keeping the distances below its diagonal.
+
+        Args:
+            rows ([[float]]): The rows of the square matrix.
+
+        Returns:
+            DistanceMatrix: The distance matrix.
+
+        Notes:
+            time complexity:
+                best case: O(n^2)
+                worst case: O(n^2)
+                average case: O(n^2)
+            space complexity:
+                best case: O(n^2)
+                worst case: O(n^2)
+                average case: O(n^2)
+        """
+        matrix = cls()
+
+        for row in rows:  # O(n) - for loop
+            matrix.append_row(row)  # O(n) - function call
+
+        return matrix
+
+    def append_row(self, row) -> None:
+        """
+        Adds a location to the matrix, given its distances to the locations already in the matrix. Any distances past
+        those are ignored, so a full row or a row of a lower triangular matrix can be passed.
+
+        Args:
+            row ([float]): The distances from the new location to each location already in the matrix.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the row is shorter than the number of locations already in the matrix.
+
+        Notes:
+            time complexity: O(n) amortized
+            space complexity: O(n)
+        """
+        if len(row) < self.size:
+            raise ValueError(f"A row of {len(row)} distances does not reach the {self.size} locations in the matrix.")
+
+        self.values.extend(row[i] for i in range(self.size))  # O(n) - array extend
+        self.rows.append(DistanceRow(self, self.size))
+        self.size += 1
+
+    def dist(self, i: int, j: int) -> float:
+        """
+        Returns the distance between two locations.
+
+        Args:
+            i (int): The first location.
+            j (int): The second location.
+
+        Returns:
+            float: The distance between the two locations.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        if i > j:
+            return self.values[i * (i - 1) // 2 + j]
+        if i < j:
+            return self.values[j * (j - 1) // 2 + i]
+        return self.zero
+
+    def row(self, i: int) -> [float]:
+        """
+        Returns the distances from a location to every location as a list.
+
+        Args:
+            i (int): The location.
+
+        Returns:
+            [float]: The distances from the location, in location order.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        return self.rows[i].tolist()  # O(n) - function call
+
+    def __len__(self) -> int:
+        """
+        Returns the number of locations of the matrix.
+
+        Returns:
+            int: The number of locations.
+        """
+        return self.size
+
+    def __getitem__(self, i: int) -> DistanceRow:
+        """
+        Returns a view of the row of a location, so the matrix can be indexed as distances[i][j].
+
+        Args:
+            i (int): The location.
+
+        Returns:
+            DistanceRow: The row of the location.
+        """
+        return self.rows[i]
+
+    def __iter__(self):
+        """
+        Iterates over the views of the rows of the matrix.
+
+        Returns:
+            iterator: The row of each location, in location order.
+        """
+        return iter(self.rows)
@@ -0,0 +1,223 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import functools
+import math
+
+import __init__
+import address
+import spatial_index
+
+# The mean radius of the Earth in miles
+earth_radius_miles = 3958.8
+
+
+def project(addresses: [address.Address]) -> [(float, float)]:
+    """
+    Projects the latitude and longitude of each address onto a plane measured in miles, with an equirectangular
+    projection centered on the middle latitude of the addresses. Straight line distances in the plane are within a
+    fraction of a percent of the great circle distances across a city.
+
+    Args:
+        addresses ([address.Address]): The addresses, in address ID order, each with a latitude and longitude.
+
+    Returns:
+        [(float, float)]: The x and y coordinates of each address in miles.
+
+    Raises:
+        ValueError: If an address has no coordinates.
+
+    Notes:
+        time complexity: O(n)
+        space complexity: O(n)
+    """
+    for i in addresses:  # O(n) - for loop
+        if i.latitude is None or i.longitude is None:
+            raise ValueError(f"Address {i.id} has no coordinates.")
+
+    latitudes = [i.latitude for i in addresses]
+    middle = math.radians((min(latitudes, default=0.0) + max(latitudes, default=0.0)) / 2)
+    scale = math.radians(earth_radius_miles)
+
+    return [
+        (i.longitude * math.cos(middle) * scale, i.latitude * scale) for i in addresses
+    ]  # O(n) - list comprehension
+
+
+class DistanceOracle:
+    """
+    The distances between addresses with coordinates, computed when they are asked for instead of stored for every
+    pair. The most recently used distances are kept in a bounded least recently used cache, and the addresses are
+    placed in a spatial index so nearest address searches only measure the addresses near the answer. It answers
+    dist(i, j) like distance_matrix.DistanceMatrix, so it can be used as the distances without an O(n^2) matrix.
+
+    Attributes:
+        size (int): The number of addresses.
+        spatial_index (spatial_index.GridIndex): The grid index over the projected coordinates of the addresses.
+        rows ([DistanceOracleRow]): A view of each row, for code that indexes the distances as distances[i][j].
+    """
+
+    def __init__(self, addresses: [address.Address], cache_size: int = None):
+        """
+        Projects the coordinates of the addresses and builds their spatial index.
+
+        Args:
+            addresses ([address.Address]): The addresses, in address ID order, each with a latitude and longitude.
+            cache_size (int): The most distances kept in the cache. Defaults to distance_oracle_cache_size.
+
+        Raises:
+            ValueError: If an address has no coordinates.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n + c)
+        """
+        if cache_size is None:
+            cache_size = __init__.distance_oracle_cache_size
+
+        self.size = len(addresses)
+        self.spatial_index = spatial_index.GridIndex(project(addresses))  # O(n) - index build
+        self.rows = [DistanceOracleRow(self, i) for i in range(self.size)]
+
+        # Each oracle has its own cache, so a cached distance never outlives the coordinates it was computed from
+        self._cached_distance = functools.lru_cache(maxsize=cache_size)(
+            self.spatial_index.distance
+        )
+
+    def dist(self, i: int, j: int) -> float:
+        """
+        Returns the distance between two addresses, from the cache if it was asked for recently.
+
+        Args:
+            i (int): The first address ID.
+            j (int): The second address ID.
+
+        Returns:
+            float: The straight line distance between the addresses in miles.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        if i > j:
+            return self._cached_distance(j, i)  # O(1) - cache lookup or computation
+        if i < j:
+            return self._cached_distance(i, j)  # O(1) - cache lookup or computation
+        return 0.0
+
+    def row(self, i: int) -> [float]:
+        """
+        Returns the distances from an address to every address as a list, without caching them.
+
+        Args:
+            i (int): The address ID.
+
+        Returns:
+            [float]: The distances from the address, in address ID order.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        distance = self.spatial_index.distance
+        return [distance(i, j) if i != j else 0.0 for j in range(self.size)]  # O(n) - list comprehension
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maximum size and current size of the distance cache.
+
+        Returns:
+            functools._CacheInfo: The statistics of the cache.
+        """
+        return self._cached_distance.cache_info()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of addresses.
+
+        Returns:
+            int: The number of addresses.
+        """
+        return self.size
+
+    def __getitem__(self, i: int) -> "DistanceOracleRow":
+        """
+        Returns a view of the row of an address, so the distances can be indexed as distances[i][j].
+
+        Args:
+            i (int): The address ID.
+
+        Returns:
+            DistanceOracleRow: The row of the address.
+        """
+        return self.rows[i]
+
+    def __iter__(self):
+        """
+        Iterates over the views of the rows of the oracle.
+
+        Returns:
+            iterator: The row of each address, in address ID order.
+        """
+        return iter(self.rows)
+
+
+class DistanceOracleRow:
+    """
+    A view of the distances from one address of a DistanceOracle, so code written for a list of rows can index it as
+    distances[i][j].
+
+    Attributes:
+        oracle (DistanceOracle): The oracle the row belongs to.
+        index (int): The address ID of the row.
+    """
+
+    __slots__ = ("oracle", "index")
+
+    def __init__(self, oracle: DistanceOracle, index: int):
+        """
+        Initializes a view of a row of a distance oracle.
+
+        Args:
+            oracle (DistanceOracle): The oracle the row belongs to.
+            index (int): The address ID of the row.
+        """
+        self.oracle = oracle
+        self.index = index
+
+    def __getitem__(self, column: int) -> float:
+        """
+        Returns the distance from the address of the row to another address.
+
+        Args:
+            column (int): The other address ID.
+
+        Returns:
+            float: The distance between the two addresses.
+        """
+        return self.oracle.dist(self.index, column)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of addresses.
+
+        Returns:
+            int: The number of addresses.
+        """
+        return self.oracle.size
+
+    def __iter__(self):
+        """
+        Iterates over the distances from the address of the row to every address.
+
+        Returns:
+            iterator: The distances of the row, in address ID order.
+        """
+        return iter(self.oracle.row(self.index))
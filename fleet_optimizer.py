@@ -0,0 +1,671 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import math
+import random
+import re
+import time
+
+import __init__
+import delivery_time_calculator
+import nearest_neighbor
+import route_optimizer
+
+# The minutes it takes to load a package once it is at the hub with its correct address
+loading_minutes = 2
+
+# The earliest time packages are loaded onto the trucks
+first_load_time = delivery_time_calculator.clock_time(8, 2)
+
+
+def ready_time(package) -> int:
+    """
+    Returns the time a package can be loaded onto a truck, once it has arrived at the hub and its address is correct.
+
+    Args:
+        package (package.Package): The package to check.
+
+    Returns:
+        int: The time the package is ready to be loaded.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    if package.modified_time is not None and package.modified_time > package.arrival_time:
+        return package.modified_time
+
+    return package.arrival_time
+
+
+def load_time(package) -> int:
+    """
+    Returns the time a package is loaded onto a truck, loading_minutes after it is ready and no earlier than
+    first_load_time.
+
+    Args:
+        package (package.Package): The package to load.
+
+    Returns:
+        int: The time the package is loaded.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    return max(ready_time(package) + loading_minutes * 60, first_load_time)
+
+
+class FleetPlan:
+    """
+    The packages each truck carries and the route it drives them on.
+
+    Attributes:
+        loads (dict): The package IDs on each truck ID, in ascending order.
+        routes (dict): The address IDs each truck ID visits in order, without the hub at either end.
+        distance (float): The total distance of the routes, including the trips out of and back to the hub.
+        initial_distance (float): The total distance of the loading plan the search started from.
+        iterations (int): The number of ruin and recreate iterations the search ran.
+    """
+
+    def __init__(
+        self,
+        loads: dict,
+        routes: dict,
+        distance: float,
+        initial_distance: float,
+        iterations: int,
+    ):
+        """
+        Initializes a fleet plan.
+
+        Args:
+            loads (dict): The package IDs on each truck ID.
+            routes (dict): The address IDs each truck ID visits in order, without the hub at either end.
+            distance (float): The total distance of the routes.
+            initial_distance (float): The total distance of the loading plan the search started from.
+            iterations (int): The number of ruin and recreate iterations the search ran.
+        """
+        self.loads = loads
+        self.routes = routes
+        self.distance = distance
+        self.initial_distance = initial_distance
+        self.iterations = iterations
+
+    def __str__(self):
+        """Returns the string representation of the FleetPlan object."""
+        lines = [
+            f"Fleet plan: {round(self.distance, 1)} miles, down from {round(self.initial_distance, 1)} miles "
+            f"after {self.iterations} iterations"
+        ]
+        for truck_id in sorted(self.loads):
+            lines.append(
+                f"Truck {truck_id}: packages {self.loads[truck_id]}, route {self.routes[truck_id]}"
+            )
+
+        return "\n".join(lines)
+
+
+class FleetOptimizer:
+    """
+    Searches for a shorter way to split the packages between the trucks and route them, with ruin and recreate moves.
+    Each iteration takes a few packages off the trucks, either at random or around a random address, and puts them
+    back one at a time at the truck and route position that adds the least distance while keeping every constraint.
+    A worse plan is sometimes kept so the search can leave a local optimum, with the chance shrinking as the time
+    budget or the iteration cap runs out, and the best plan found is returned.
+
+    With only a time budget, the number of iterations depends on the speed of the machine, so two runs with the same
+    seed can return different plans. With an iteration cap the search follows the iteration count alone, so a seeded
+    run that reaches the cap within its time budget always returns the same plan.
+
+    The constraints are read from the packages: trucks carry at most truck_capacity packages, a package only goes on a
+    truck that departs after it is ready, packages noted as only going on one truck go on that truck, packages noted as
+    delivered together share a truck, every delivery meets its deadline, and no more trucks are out at once than there
+    are drivers.
+
+    Args:
+        loading_plan (dict): The package IDs each truck ID starts out carrying.
+        departure_times (dict): The time each truck ID leaves the hub.
+        packages (package.PackageTable): The package table to read the packages from. Defaults to packages.
+        distances ([[float]]): The distance matrix. Defaults to distances.
+        capacity (int): The most packages a truck carries. Defaults to truck_capacity.
+        drivers (int): The number of drivers. Defaults to the number of drivers in driver.
+        seed (int): The seed of the random choices of the search. Defaults to 0.
+
+    Attributes:
+        departure_times (dict): The time each truck ID leaves the hub.
+        distances ([[float]]): The distance matrix.
+        capacity (int): The most packages a truck carries.
+        drivers (int): The number of drivers.
+        random (random.Random): The random number generator of the search.
+        addresses (dict): The address ID of each package ID.
+        deadlines (dict): The delivery deadline of each package ID.
+        ready_times (dict): The time each package ID is ready to be loaded.
+        allowed_trucks (dict): The only truck ID each restricted package ID may go on.
+        groups ([[int]]): The package IDs that must share a truck, with every other package in a group of its own.
+        loads (dict): The package IDs on each truck ID in the current plan.
+        routes (dict): The address IDs each truck ID visits in order in the current plan.
+        saved (dict): The load and route of each truck ID changed in the current iteration, as they were before it.
+    """
+
+    def __init__(
+        self,
+        loading_plan: dict,
+        departure_times: dict,
+        packages=None,
+        distances: [[float]] = None,
+        capacity: int = __init__.truck_capacity,
+        drivers: int = len(__init__.driver),
+        seed: int = 0,
+    ):
+        """
+        Initializes a fleet optimizer from a loading plan and checks the plan keeps every constraint.
+
+        Args:
+            loading_plan (dict): The package IDs each truck ID starts out carrying.
+            departure_times (dict): The time each truck ID leaves the hub.
+            packages (package.PackageTable): The package table to read the packages from. Defaults to packages.
+            distances ([[float]]): The distance matrix. Defaults to distances.
+            capacity (int): The most packages a truck carries. Defaults to truck_capacity.
+            drivers (int): The number of drivers. Defaults to the number of drivers in driver.
+            seed (int): The seed of the random choices of the search. Defaults to 0.
+
+        Raises:
+            ValueError: If the loading plan breaks a constraint.
+        """
+        if packages is None:
+            packages = __init__.packages
+        if distances is None:
+            distances = __init__.distances
+
+        self.departure_times = dict(departure_times)
+        self.distances = distances
+        self.capacity = capacity
+        self.drivers = drivers
+        self.random = random.Random(seed)
+
+        package_ids = [i for truck_id in loading_plan for i in loading_plan[truck_id]]
+
+        self.addresses = {}
+        self.deadlines = {}
+        self.ready_times = {}
+        self.allowed_trucks = {}
+        together = {}
+
+        for package in packages.get_many(package_ids):  # O(n) - batch get
+            self.addresses[package.id] = package.address_id
+            self.deadlines[package.id] = delivery_time_calculator.deadline_time(
+                package.delivery_deadline
+            )
+            self.ready_times[package.id] = ready_time(package)
+
+            notes = package.special_notes or ""
+            only_truck = re.search(r"only be on truck (\d+)", notes)
+            if only_truck:
+                self.allowed_trucks[package.id] = int(only_truck.group(1))
+            delivered_with = re.search(r"delivered with ([\d, ]+)", notes)
+            if delivered_with:
+                together[package.id] = [int(i) for i in re.findall(r"\d+", delivered_with.group(1))]
+
+        self.groups = self._group(package_ids, together)
+
+        self.loads = {i: set(loading_plan[i]) for i in loading_plan}
+        self.routes = {i: self._initial_route(i) for i in loading_plan}
+        self.saved = {}
+
+        for truck_id in self.loads:  # O(t) - for loop
+            for group in self._groups_on(truck_id):
+                if not self._can_carry(truck_id, group, len(self.loads[truck_id]) - len(group)):
+                    raise ValueError(f"The loading plan of truck {truck_id} breaks a package constraint.")
+            if self._return_time(truck_id, self.routes[truck_id]) is None:
+                raise ValueError(f"The loading plan of truck {truck_id} misses a delivery deadline.")
+        if not self._drivers_suffice(self._return_times()):
+            raise ValueError("The loading plan needs more drivers than there are.")
+
+    def _group(self, package_ids: [int], together: dict) -> [[int]]:
+        """
+        Groups the packages that must share a truck, following the delivered with notes in both directions.
+
+        Args:
+            package_ids ([int]): The IDs of the packages to group.
+            together (dict): The package IDs each package ID must be delivered with.
+
+        Returns:
+            [[int]]: The package IDs of each group, in ascending order.
+        """
+        parents = {i: i for i in package_ids}
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        for package_id, others in together.items():  # O(n) - for loop
+            for other in others:
+                if other in parents:
+                    parents[find(other)] = find(package_id)
+
+        groups = {}
+        for i in package_ids:  # O(n) - for loop
+            groups.setdefault(find(i), []).append(i)
+
+        return [sorted(i) for i in groups.values()]
+
+    def _groups_on(self, truck_id: int) -> [[int]]:
+        """
+        Returns the package groups on a truck.
+
+        Args:
+            truck_id (int): The ID of the truck.
+
+        Returns:
+            [[int]]: The package groups with a package on the truck.
+        """
+        return [i for i in self.groups if i[0] in self.loads[truck_id]]
+
+    def _initial_route(self, truck_id: int) -> [int]:
+        """
+        Routes the packages a truck starts out with, nearest address first and then shortened while every delivery
+        stays on time.
+
+        Args:
+            truck_id (int): The ID of the truck.
+
+        Returns:
+            [int]: The address IDs the truck visits in order, without the hub at either end.
+        """
+        stops = {self.addresses[i] for i in self.loads[truck_id]}
+        cursor = nearest_neighbor.neighbor_cursor(
+            self.distances, [i for i in range(len(self.distances)) if i not in stops]
+        )
+
+        route = [0]
+        address_id = cursor.nearest(0)
+        while address_id is not None:  # O(n) - while loop
+            route.append(address_id)
+            cursor.visit(address_id)
+            address_id = cursor.nearest(address_id)
+        route.append(0)
+
+        route = route_optimizer.optimize_route(
+            route,
+            self.distances,
+            on_time=route_optimizer.deadline_checker(
+                route,
+                self.distances,
+                self.departure_times[truck_id],
+                self._address_deadlines(self.loads[truck_id]),
+            ),
+        )
+
+        return route[1:-1]
+
+    def _address_deadlines(self, load) -> dict:
+        """
+        Finds the earliest deadline of the packages in a load for each address.
+
+        Args:
+            load (iterable): The package IDs of the load.
+
+        Returns:
+            dict: The earliest delivery deadline for each address ID of the load.
+        """
+        deadlines = {}
+        for i in load:  # O(n) - for loop
+            address_id = self.addresses[i]
+            deadlines[address_id] = min(
+                self.deadlines[i], deadlines.get(address_id, delivery_time_calculator.latest_time)
+            )
+
+        return deadlines
+
+    def _can_carry(self, truck_id: int, group: [int], load_size: int) -> bool:
+        """
+        Checks whether a truck may carry a package group on top of a load of the given size.
+
+        Args:
+            truck_id (int): The ID of the truck.
+            group ([int]): The package IDs of the group.
+            load_size (int): The number of packages already on the truck.
+
+        Returns:
+            bool: True if the group fits, is ready before the truck departs and is allowed on the truck.
+        """
+        if load_size + len(group) > self.capacity:
+            return False
+
+        for i in group:  # O(g) - for loop
+            if self.ready_times[i] > self.departure_times[truck_id]:
+                return False
+            if self.allowed_trucks.get(i, truck_id) != truck_id:
+                return False
+
+        return True
+
+    def _return_time(self, truck_id: int, route: [int], deadlines: dict = None) -> int or None:
+        """
+        Drives a route on paper and returns the time the truck gets back to the hub.
+
+        Args:
+            truck_id (int): The ID of the truck.
+            route ([int]): The address IDs the truck visits in order, without the hub at either end.
+            deadlines (dict): The earliest delivery deadline for each address ID. Defaults to the deadlines of the
+                packages on the truck.
+
+        Returns:
+            int or None: The time the truck gets back to the hub, or None if a delivery misses its deadline.
+        """
+        if deadlines is None:
+            deadlines = self._address_deadlines(self.loads[truck_id])
+
+        times = route_optimizer.arrival_times(
+            [0] + route + [0], self.distances, self.departure_times[truck_id]
+        )  # O(n) - function call
+
+        for address_id, arrival_time in zip(route, times[1:]):  # O(n) - for loop
+            if arrival_time > deadlines.get(address_id, delivery_time_calculator.latest_time):
+                return None
+
+        return times[-1]
+
+    def _return_times(self) -> dict:
+        """
+        Returns the time each truck gets back to the hub in the current plan.
+
+        Returns:
+            dict: The return time of each truck ID.
+        """
+        return {i: self._return_time(i, self.routes[i]) for i in self.routes}
+
+    def _drivers_suffice(self, return_times: dict) -> bool:
+        """
+        Checks that no more trucks are out at once than there are drivers.
+
+        Args:
+            return_times (dict): The time each truck ID gets back to the hub.
+
+        Returns:
+            bool: True if there is a driver for every truck while it is out.
+        """
+        events = []
+        for truck_id, return_time in return_times.items():  # O(t) - for loop
+            if return_time is None:
+                return False
+            events.append((self.departure_times[truck_id], 1))
+            events.append((return_time, -1))
+
+        # A driver who gets back at a departure time can take the departing truck, so returns sort first
+        out = 0
+        for _, change in sorted(events):  # O(t log t) - sort
+            out += change
+            if out > self.drivers:
+                return False
+
+        return True
+
+    def distance(self, routes: dict = None) -> float:
+        """
+        Returns the total distance of the routes of a plan.
+
+        Args:
+            routes (dict): The address IDs each truck ID visits in order. Defaults to the current plan.
+
+        Returns:
+            float: The total distance, including the trips out of and back to the hub.
+        """
+        if routes is None:
+            routes = self.routes
+
+        return sum(
+            route_optimizer.route_distance([0] + i + [0], self.distances)
+            for i in routes.values()
+        )
+
+    def _save(self, truck_id: int) -> None:
+        """
+        Keeps the load and route of a truck as they were before the current iteration changes them, so a rejected
+        iteration only restores the trucks it changed.
+
+        Args:
+            truck_id (int): The ID of the truck about to change.
+
+        Returns:
+            None
+        """
+        if truck_id not in self.saved:
+            self.saved[truck_id] = (set(self.loads[truck_id]), list(self.routes[truck_id]))
+
+    def _restore(self) -> None:
+        """
+        Puts back the loads and routes of the trucks the current iteration changed.
+
+        Returns:
+            None
+        """
+        for truck_id, (load, route) in self.saved.items():  # O(t) - for loop
+            self.loads[truck_id] = load
+            self.routes[truck_id] = route
+
+    def _remove(self, group: [int]) -> None:
+        """
+        Takes a package group off its truck and drops the addresses the truck no longer delivers to from its route.
+
+        Args:
+            group ([int]): The package IDs of the group.
+
+        Returns:
+            None
+        """
+        for truck_id, load in self.loads.items():  # O(t) - for loop
+            if group[0] in load:
+                self._save(truck_id)
+                load.difference_update(group)
+                remaining = {self.addresses[i] for i in load}
+                self.routes[truck_id] = [i for i in self.routes[truck_id] if i in remaining]
+                return
+
+    def _insertion(self, truck_id: int, group: [int]) -> (float, [int]) or None:
+        """
+        Finds the cheapest way to add a package group to the route of a truck, adding each new address at the
+        position that adds the least distance while every delivery stays on time.
+
+        Args:
+            truck_id (int): The ID of the truck.
+            group ([int]): The package IDs of the group.
+
+        Returns:
+            (float, [int]) or None: The added distance and the new route, or None if the truck cannot take the group.
+        """
+        load = self.loads[truck_id]
+        if not self._can_carry(truck_id, group, len(load)):
+            return None
+
+        deadlines = self._address_deadlines(list(load) + group)
+        route = list(self.routes[truck_id])
+        added = 0.0
+        d = self.distances
+
+        for address_id in sorted({self.addresses[i] for i in group}):  # O(g) - for loop
+            if address_id in route:
+                continue
+
+            stops = [0] + route + [0]
+            positions = sorted(
+                range(len(stops) - 1),
+                key=lambda p: d[stops[p]][address_id] + d[address_id][stops[p + 1]] - d[stops[p]][stops[p + 1]],
+            )  # O(n log n) - sort
+
+            for p in positions:  # O(n) - for loop, stopping at the first on time position
+                candidate = route[:p] + [address_id] + route[p:]
+                if self._return_time(truck_id, candidate, deadlines) is not None:
+                    added += d[stops[p]][address_id] + d[address_id][stops[p + 1]] - d[stops[p]][stops[p + 1]]
+                    route = candidate
+                    break
+            else:
+                return None
+
+        # The new deadlines may be tighter at addresses the route already visits
+        if self._return_time(truck_id, route, deadlines) is None:
+            return None
+
+        return added, route
+
+    def _insert(self, group: [int]) -> bool:
+        """
+        Puts a package group on the truck and at the route positions that add the least distance.
+
+        Args:
+            group ([int]): The package IDs of the group.
+
+        Returns:
+            bool: True if the group was put on a truck. False if no truck can take it.
+        """
+        best = None
+        for truck_id in self.loads:  # O(t) - for loop
+            insertion = self._insertion(truck_id, group)
+            if insertion is None or (best is not None and insertion[0] >= best[0]):
+                continue
+
+            return_times = self._return_times()
+            return_times[truck_id] = self._return_time(
+                truck_id, insertion[1], self._address_deadlines(list(self.loads[truck_id]) + group)
+            )
+            if self._drivers_suffice(return_times):
+                best = (insertion[0], truck_id, insertion[1])
+
+        if best is None:
+            return False
+
+        self._save(best[1])
+        self.loads[best[1]].update(group)
+        self.routes[best[1]] = best[2]
+        return True
+
+    def _ruin(self) -> [[int]]:
+        """
+        Picks the package groups to take off the trucks, either at random or the ones closest to a random address.
+
+        Returns:
+            [[int]]: The package groups to take off.
+        """
+        count = self.random.randint(1, max(2, len(self.groups) // 5))
+
+        if self.random.random() < 0.5:
+            return self.random.sample(self.groups, min(count, len(self.groups)))
+
+        center = self.addresses[self.random.choice(self.random.choice(self.groups))]
+        return sorted(
+            self.groups,
+            key=lambda g: min(self.distances[center][self.addresses[i]] for i in g),
+        )[:count]
+
+    def optimize(self, time_budget: float = None, max_iterations: int = None) -> FleetPlan:
+        """
+        Runs ruin and recreate iterations until the time budget or the iteration cap runs out and returns the best
+        plan found. Each iteration copies the load and route of only the trucks it changes.
+
+        Args:
+            time_budget (float): The number of seconds to search for. Defaults to fleet_optimization_time_budget, read
+                when the search starts.
+            max_iterations (int): The most iterations to run, with the chance of keeping a worse plan following the
+                iteration count instead of the time, or 0 for no cap. Defaults to fleet_optimization_max_iterations,
+                read when the search starts.
+
+        Returns:
+            FleetPlan: The shortest plan found that keeps every constraint.
+
+        Notes:
+            time complexity:
+                best case: O(k * t * n^2) per iteration, bounded by the time budget
+                worst case: O(k * t * n^2 log n) per iteration, bounded by the time budget
+                average case: O(k * t * n^2) per iteration, bounded by the time budget
+            space complexity:
+                best case: O(n)
+                worst case: O(n)
+                average case: O(n)
+        """
+        if time_budget is None:
+            time_budget = __init__.fleet_optimization_time_budget
+        if max_iterations is None:
+            max_iterations = __init__.fleet_optimization_max_iterations
+
+        start = time.perf_counter()
+        initial_distance = current_distance = best_distance = self.distance()
+        best = ({i: set(j) for i, j in self.loads.items()}, {i: list(j) for i, j in self.routes.items()})
+
+        # The trucks changed by kept iterations since the best plan was copied
+        changed_since_best = set()
+
+        # Worse plans are kept with a chance that starts at one in e for a 1% longer plan and shrinks to nothing
+        initial_temperature = 0.01 * initial_distance
+        iterations = 0
+
+        while (
+            time.perf_counter() - start < time_budget
+            and (max_iterations <= 0 or iterations < max_iterations)
+        ):  # O(i) - while loop, bounded by the time budget and the iteration cap
+            iterations += 1
+            self.saved = {}
+
+            removed = self._ruin()
+            for group in removed:  # O(k) - for loop
+                self._remove(group)
+
+            # Put the packages with the earliest deadlines back first, as they have the fewest places to go
+            self.random.shuffle(removed)
+            removed.sort(key=lambda g: min(self.deadlines[i] for i in g))
+
+            if not all(self._insert(i) for i in removed):  # O(k * t * n^2) - function call per group
+                self._restore()  # O(t) - function call
+                continue
+
+            new_distance = self.distance()
+            if max_iterations > 0:
+                progress = iterations / max_iterations
+            else:
+                progress = (time.perf_counter() - start) / time_budget
+            temperature = initial_temperature * (1 - progress)
+            if new_distance < current_distance - route_optimizer.epsilon or (
+                temperature > 0
+                and self.random.random() < math.exp(-(new_distance - current_distance) / temperature)
+            ):
+                current_distance = new_distance
+                changed_since_best.update(self.saved)
+                if new_distance < best_distance - route_optimizer.epsilon:
+                    best_distance = new_distance
+                    for i in changed_since_best:  # O(t) - for loop
+                        best[0][i] = set(self.loads[i])
+                        best[1][i] = list(self.routes[i])
+                    changed_since_best = set()
+            else:
+                self._restore()  # O(t) - function call
+
+        self.loads, self.routes = best
+
+        return FleetPlan(
+            {i: sorted(j) for i, j in self.loads.items()},
+            {i: list(j) for i, j in self.routes.items()},
+            best_distance,
+            initial_distance,
+            iterations,
+        )
@@ -9,23 +9,145 @@
 #  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
+import array
+import bisect
+import threading
+
+
+class SecondaryIndex:
+    """
+    A secondary index mapping a value derived from each item in a hash table to the keys of the items with that value.
+
+    Args:
+        key_function (callable): Derives the indexed value from an item in the hash table.
+
+    Attributes:
+        key_function (callable): Derives the indexed value from an item in the hash table.
+        keys_by_value (dict): The set of keys for each indexed value.
+        value_by_key (dict): The indexed value currently recorded for each key.
+    """
+
+    def __init__(self, key_function):
+        """
+        Initializes an empty secondary index.
+
+        Args:
+            key_function (callable): Derives the indexed value from an item in the hash table.
+        """
+        self.key_function = key_function
+        self.keys_by_value = {}
+        self.value_by_key = {}
+
+    def insert(self, key, item) -> None:
+        """
+        Records the key under the value derived from the item, moving it out of the value it was recorded under before.
+
+        Args:
+            key: The key of the item in the hash table.
+            item: The item to derive the indexed value from.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        value = self.key_function(item)
+
+        if key in self.value_by_key:
+            if self.value_by_key[key] == value:
+                return
+            self.remove(key)
+
+        self.value_by_key[key] = value
+        self.keys_by_value.setdefault(value, set()).add(key)
+
+    def remove(self, key) -> None:
+        """
+        Removes the key from the index.
+
+        Args:
+            key: The key to remove.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        if key not in self.value_by_key:
+            return
+
+        value = self.value_by_key.pop(key)
+        keys = self.keys_by_value[value]
+        keys.discard(key)
+
+        if len(keys) == 0:
+            del self.keys_by_value[value]
+
+    def lookup(self, value) -> [any]:
+        """
+        Gets the keys of the items with the given indexed value.
+
+        Args:
+            value: The indexed value to look up.
+
+        Returns:
+            list: The keys of the items with the given value, sorted.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(k log k)
+                average case = O(k log k)
+            space complexity:
+                best case = O(1)
+                worst case = O(k)
+                average case = O(k)
+        """
+        return sorted(self.keys_by_value.get(value, ()))  # O(k log k) - sort
+
+
 class HashTable:
     """
-    A hash table data structure.
+    A hash table data structure using separate chaining. The table doubles its number of buckets and rehashes every
+    key-value pair once the average number of pairs per bucket grows past the load factor. The keys are kept in
+    ascending order as well, so they must be hashable and comparable with each other.
 
     Args:
-        size (int): The size of the hash table. Defaults to 10.
+        size (int): The initial number of buckets in the hash table. Defaults to 10.
+        load_factor (float): The maximum average number of pairs per bucket before the table grows. Defaults to 0.75.
 
     Attributes:
         table (list): The hash table.
+        load_factor (float): The maximum average number of pairs per bucket before the table grows.
+        count (int): The number of key-value pairs in the hash table.
+        ordered_keys (list): The keys in the hash table in ascending order.
+        indexes (dict): The secondary indexes of the hash table by name.
     """
 
-    def __init__(self, size: int = 10):
+    def __init__(self, size: int = 10, load_factor: float = 0.75):
         """
         Initializes a hash table object.
 
         Args:
-            size (int): The size of the hash table. Defaults to 10.
+            size (int): The initial number of buckets in the hash table. Defaults to 10.
+            load_factor (float): The maximum average number of pairs per bucket before the table grows. Defaults to
+                0.75.
 
         Returns:
             None
@@ -40,7 +162,16 @@ class HashTable:
                 worst case = O(n)
                 average case = O(n)
         """
+        if size < 1:
+            raise ValueError("Hash table size must be at least 1.")
+        if load_factor <= 0:
+            raise ValueError("Hash table load factor must be greater than 0.")
+
         self.table = []
+        self.load_factor = load_factor
+        self.count = 0
+        self.ordered_keys = []
+        self.indexes = {}
 
         # Initialize the hash table with empty lists
         for i in range(size):  # O(n) - for loop
@@ -67,7 +198,16 @@ class HashTable:
                 average case = O(1)
         """
         # Hash the key and return the hash value
-        return hash(key) % len(self.table)
+        return hash(key) % self._capacity()
+
+    def _capacity(self) -> int:
+        """
+        Returns the number of buckets in the hash table.
+
+        Returns:
+            int: The number of buckets in the hash table.
+        """
+        return len(self.table)
 
     def get(self, key) -> any:
         """
@@ -83,7 +223,7 @@ class HashTable:
             time complexity:
                 best case = O(1)
                 worst case = O(n)
-                average case = O(n)
+                average case = O(1)
             space complexity:
                 best case = O(1)
                 worst case = O(1)
@@ -93,7 +233,7 @@ class HashTable:
         hash_value = self._hash(key)
 
         # Search for the key in the hash table and return the value if found
-        for i in self.table[hash_value]:  # O(n) - for loop
+        for i in self.table[hash_value]:  # O(1) - bucket length is bounded by the load factor
             item_key, item_value = i
             if item_key == key:
                 return i[1]
@@ -106,33 +246,124 @@ class HashTable:
         Gets all the key-value pairs in the hash table.
 
         Returns:
-            list: A list of key-value pairs in the hash table.
+            list: A list of key-value pairs in the hash table, sorted by key.
 
         Notes:
             time complexity:
-                best case = O(n^2)
-                worst case = O(n^2)
-                average case = O(n^2)
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
             space complexity:
                 best case = O(n)
                 worst case = O(n)
                 average case = O(n)
         """
-        items = []
+        return list(self.items())  # O(n) - function call
 
-        # Get all the key-value pairs in the hash table
-        for i in self.table:  # O(n) - for loop
-            for j in i:  # O(n) - for loop
-                items.append(j)
+    def items(self):
+        """
+        Yields the key-value pairs in the hash table in ascending key order without sorting.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        for key in self.ordered_keys:  # O(n) - for loop
+            yield key, self.get(key)  # O(1) - hash table get
+
+    def range(self, low, high):
+        """
+        Yields the key-value pairs whose keys are at least low and less than high in ascending key order.
 
-        # Sort the key-value pairs by key
-        items.sort(key=lambda x: x[0])  # O(n log n) - sort
+        Args:
+            low: The smallest key to yield.
+            high: The key to stop before.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(log n)
+                worst case = O(log n + k)
+                average case = O(log n + k)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        start = bisect.bisect_left(self.ordered_keys, low)  # O(log n) - binary search
+        end = bisect.bisect_left(self.ordered_keys, high)  # O(log n) - binary search
+
+        for i in range(start, end):  # O(k) - for loop
+            key = self.ordered_keys[i]
+            yield key, self.get(key)  # O(1) - hash table get
+
+    def _check_orderable(self, low, high) -> None:
+        """
+        Checks that keys from low to high can be ordered with the keys in the hash table, before the table changes.
+
+        Args:
+            low: The smallest key to add.
+            high: The largest key to add.
+
+        Raises:
+            TypeError: If the keys cannot be compared with the keys in the hash table.
 
-        return items
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        if len(self.ordered_keys) == 0:
+            return
+
+        try:
+            self.ordered_keys[0] < high
+            low < self.ordered_keys[-1]
+        except TypeError as error:
+            raise TypeError(
+                f"Keys of type {type(low).__name__} cannot be ordered with the keys in the hash table, all keys must "
+                f"be comparable with each other."
+            ) from error
+
+    def _check_batch_orderable(self, items: list) -> None:
+        """
+        Checks that the keys of a batch can be ordered with each other and with the keys in the hash table, before the
+        table changes.
+
+        Args:
+            items (list): The key-value pairs to add.
+
+        Raises:
+            TypeError: If the keys cannot be compared with each other or with the keys in the hash table.
+
+        Notes:
+            time complexity: O(k)
+            space complexity: O(1)
+        """
+        try:
+            low = min(i[0] for i in items)  # O(k) - comparison of every key
+            high = max(i[0] for i in items)  # O(k) - comparison of every key
+        except TypeError as error:
+            raise TypeError(
+                "The keys cannot be ordered with each other, all keys must be comparable with each other."
+            ) from error
+
+        self._check_orderable(low, high)  # O(1) - function call
 
     def add(self, key, value) -> None:
         """
-        Sets the value for the given key in the hash table.
+        Sets the value for the given key in the hash table. If the key is already in the hash table, its value is
+        replaced. Grows the hash table when the load factor is crossed and records new keys in the sorted key array.
 
         Args:
             key: The key to set.
@@ -141,20 +372,34 @@ class HashTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the key cannot be compared with the keys in the hash table. The table is left unchanged.
+
         Notes:
             time complexity:
                 best case = O(1)
-                worst case = O(1)
-                average case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
             space complexity:
                 best case = O(1)
-                worst case = O(1)
-                average case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
         """
-        hash_value = self._hash(key)
+        self._check_orderable(key, key)  # O(1) - function call
 
-        # Append the key-value pair to the hash table
-        self.table[hash_value].append((key, value))
+        if self._insert(key, value):
+            self.count += 1
+
+            # Keep the keys in order, which is an O(1) append when keys arrive in ascending order
+            if len(self.ordered_keys) == 0 or self.ordered_keys[-1] < key:
+                self.ordered_keys.append(key)
+            else:
+                bisect.insort(self.ordered_keys, key)  # O(n) - insertion into the sorted keys
+
+            # Double the number of buckets once the load factor is crossed
+            self._reserve(0)  # O(n) - function call when the table grows
+
+        self._index(key, value)
 
     def update(self, key, value):
         """
@@ -171,40 +416,1408 @@ class HashTable:
             time complexity:
                 best case = O(1)
                 worst case = O(n)
-                average case = O(n)
+                average case = O(1)
             space complexity:
                 best case = O(1)
                 worst case = O(1)
                 average case = O(1)
         """
-        hash_value = self._hash(key)
+        if self._replace(key, value):
+            self._index(key, value)
 
-        # Search for the key in the hash table and update the value if found
-        for i in range(len(self.table[hash_value])):  # O(n) - for loop
-            if self.table[hash_value][i][0] == key:
-                self.table[hash_value][i] = key, value
-                return
+    def add_many(self, items) -> None:
+        """
+        Sets the values for many keys in the hash table in one pass. The hash table grows at most once for the whole
+        batch, the buckets are scanned without a method call per pair, and the new keys are merged into the sorted key
+        array in a single merge.
 
-    def __len__(self) -> int:
+        Args:
+            items (iterable): The key-value pairs to set.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the keys cannot be compared with each other or with the keys in the hash table. The table is
+                left unchanged.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk + k log k)
+                average case = O(n + k)
+            space complexity:
+                best case = O(k)
+                worst case = O(n + k)
+                average case = O(k)
+        """
+        items = [tuple(i) for i in items]  # O(k) - list comprehension
+
+        if len(items) > 0:
+            self._check_batch_orderable(items)  # O(k) - function call
+
+        # Grow once for the whole batch instead of once per crossed load factor
+        self._reserve(len(items))  # O(n) - function call
+
+        new_keys = self._insert_many(items)  # O(k) - function call
+        self.count += len(new_keys)
+
+        # Merge the new keys into the sorted keys, which is an O(k) extend when they arrive in ascending order
+        if len(new_keys) > 0:
+            new_keys.sort()  # O(k log k) - sort
+            in_order = len(self.ordered_keys) == 0 or self.ordered_keys[-1] < new_keys[0]
+            self.ordered_keys.extend(new_keys)
+            if not in_order:
+                self.ordered_keys.sort()  # O(n + k) - merge of two sorted runs
+
+        if len(self.indexes) > 0:
+            for key, value in items:  # O(k) - for loop
+                self._index(key, value)
+
+    def get_many(self, keys) -> [any]:
+        """
+        Gets the values for many keys in the hash table in one pass, without a method call per key.
+
+        Args:
+            keys (iterable): The keys to get the values for.
+
+        Returns:
+            list: The value for each key, in the order of the keys. None for keys that are not in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        table = self.table
+        capacity = len(table)
+        values = []
+
+        for key in keys:  # O(k) - for loop
+            for item_key, item_value in table[hash(key) % capacity]:  # O(1) - bucket scan
+                if item_key == key:
+                    values.append(item_value)
+                    break
+            else:
+                values.append(None)
+
+        return values
+
+    def update_many(self, items) -> None:
+        """
+        Updates the values for many keys that are already in the hash table in one pass. Keys that are not in the hash
+        table are ignored.
+
+        Args:
+            items (list): The key-value tuples to update.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        replaced = self._replace_many(items)  # O(k) - function call
+
+        if len(self.indexes) > 0:
+            for key, value in replaced:  # O(k) - for loop
+                self._index(key, value)
+
+    def _insert_many(self, items: list) -> list:
+        """
+        Stores many key-value pairs in their buckets in one pass, without a method call per pair.
+
+        Args:
+            items (list): The key-value pairs to store.
+
+        Returns:
+            list: The keys that were not in the hash table before.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        table = self.table
+        capacity = len(table)
+        new_keys = []
+
+        for item in items:  # O(k) - for loop
+            key = item[0]
+            bucket = table[hash(key) % capacity]
+
+            for i in range(len(bucket)):  # O(1) - bucket scan
+                if bucket[i][0] == key:
+                    bucket[i] = item
+                    break
+            else:
+                bucket.append(item)
+                new_keys.append(key)
+
+        return new_keys
+
+    def _replace_many(self, items: list) -> list:
+        """
+        Replaces the values of many keys that are already stored in one pass, without a method call per pair.
+
+        Args:
+            items (list): The key-value pairs to replace.
+
+        Returns:
+            list: The key-value pairs whose keys were found and replaced.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        table = self.table
+        capacity = len(table)
+        replaced = []
+
+        for item in items:  # O(k) - for loop
+            key = item[0]
+            bucket = table[hash(key) % capacity]
+
+            for i in range(len(bucket)):  # O(1) - bucket scan
+                if bucket[i][0] == key:
+                    bucket[i] = item
+                    replaced.append(item)
+                    break
+
+        return replaced
+
+    def add_index(self, name: str, key_function) -> None:
         """
-        Returns the size of the hash table.
+        Adds a secondary index to the hash table and indexes every key-value pair already stored. The index is kept up
+        to date by add, update and reindex.
+
+        Args:
+            name (str): The name of the index.
+            key_function (callable): Derives the indexed value from a value in the hash table.
 
         Returns:
-            int: The size of the hash table.
+            None
 
         Notes:
             time complexity:
                 best case = O(n)
                 worst case = O(n)
                 average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        index = SecondaryIndex(key_function)
+
+        for key, value in self._entries():  # O(n) - for loop
+            index.insert(key, value)
+
+        self.indexes[name] = index
+
+    def lookup(self, name: str, value) -> [any]:
+        """
+        Gets the keys whose values have the given indexed value in the named secondary index.
+
+        Args:
+            name (str): The name of the index.
+            value: The indexed value to look up.
+
+        Returns:
+            list: The keys with the given indexed value, sorted.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(k log k)
+                average case = O(k log k)
+            space complexity:
+                best case = O(1)
+                worst case = O(k)
+                average case = O(k)
+        """
+        if name not in self.indexes:
+            raise KeyError(f"Hash table has no index named {name}.")
+
+        return self.indexes[name].lookup(value)  # O(k log k) - function call
+
+    def reindex(self, key) -> None:
+        """
+        Refreshes every secondary index entry of the given key after its value was mutated in place.
+
+        Args:
+            key: The key to refresh.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
             space complexity:
                 best case = O(1)
                 worst case = O(1)
                 average case = O(1)
         """
-        size = 0
+        if len(self.indexes) == 0:
+            return
 
-        for i in self.table:  # O(n) - for loop
-            size += len(i)
+        value = self.get(key)  # O(1) - hash table get
+
+        if value is not None:
+            self._index(key, value)
+
+    def _index(self, key, value) -> None:
+        """
+        Records the key-value pair in every secondary index.
+
+        Args:
+            key: The key to record.
+            value: The value to derive the indexed values from.
+
+        Returns:
+            None
+        """
+        for i in self.indexes.values():  # O(1) - for loop over the indexes
+            i.insert(key, value)
+
+    def _load(self) -> int:
+        """
+        Returns the number of key-value pairs stored in the buckets, which the load factor applies to.
+
+        Returns:
+            int: The number of key-value pairs stored in the buckets.
+        """
+        return self.count
+
+    def _reserve(self, extra: int) -> None:
+        """
+        Grows the hash table, doubling its number of buckets as many times as needed, so that the given number of
+        extra key-value pairs fit without crossing the load factor.
+
+        Args:
+            extra (int): The number of key-value pairs about to be added.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+        """
+        capacity = self._capacity()
+
+        while self._load() + extra > capacity * self.load_factor:  # O(log n) - while loop
+            capacity *= 2
+
+        if capacity != self._capacity():
+            self._resize(capacity)  # O(n) - function call
+
+    def _insert(self, key, value) -> bool:
+        """
+        Stores the key-value pair in its bucket, replacing the value if the key is already stored.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+
+        Returns:
+            bool: True if the key was not in the hash table before. False if its value was replaced.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        bucket = self.table[self._hash(key)]
+
+        for i in range(len(bucket)):  # O(1) - bucket length is bounded by the load factor
+            if bucket[i][0] == key:
+                bucket[i] = key, value
+                return False
+
+        # Append the key-value pair to the hash table
+        bucket.append((key, value))
+        return True
+
+    def _replace(self, key, value) -> bool:
+        """
+        Replaces the value of a key that is already stored in the hash table.
+
+        Args:
+            key: The key to replace the value of.
+            value: The new value.
+
+        Returns:
+            bool: True if the key was found and its value replaced. False otherwise.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        hash_value = self._hash(key)
+
+        # Search for the key in the hash table and update the value if found
+        for i in range(len(self.table[hash_value])):  # O(1) - bucket length is bounded by the load factor
+            if self.table[hash_value][i][0] == key:
+                self.table[hash_value][i] = key, value
+                return True
+
+        return False
+
+    def _entries(self):
+        """
+        Yields every key-value pair in the hash table in bucket order.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        for i in self.table:  # O(n) - for loop
+            for j in i:  # O(1) - bucket length is bounded by the load factor
+                yield j
+
+    def _resize(self, size: int) -> None:
+        """
+        Rebuilds the hash table with the given number of buckets and rehashes every key-value pair into it.
+
+        Args:
+            size (int): The new number of buckets.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        old_table = self.table
+
+        self.table = []
+        for i in range(size):  # O(n) - for loop
+            self.table.append([])
+
+        for bucket in old_table:  # O(n) - for loop
+            for key, value in bucket:  # O(1) - bucket length is bounded by the load factor
+                self.table[self._hash(key)].append((key, value))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of key-value pairs in the hash table.
+
+        Returns:
+            int: The number of key-value pairs in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterates over the keys in the hash table in ascending order without sorting.
+
+        Returns:
+            iterator: An iterator over the keys in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        return iter(self.ordered_keys)
+
+
+class OpenAddressingHashTable(HashTable):
+    """
+    A hash table data structure using open addressing on flat arrays. Collisions are resolved with linear probing,
+    optionally with Robin Hood displacement, which moves keys that are far from their home slot ahead of keys that are
+    close to theirs and keeps probe sequences short at high load.
+
+    Args:
+        size (int): The initial number of slots in the hash table. Defaults to 16.
+        load_factor (float): The maximum fraction of occupied slots before the table grows. Defaults to 0.7.
+        robin_hood (bool): Whether to use Robin Hood probing instead of plain linear probing. Defaults to True.
+
+    Attributes:
+        keys (list): The key stored in each slot.
+        values (list): The value stored in each slot.
+        probe_lengths (array.array): The distance of each slot's key from its home slot, or -1 if the slot is empty.
+        load_factor (float): The maximum fraction of occupied slots before the table grows.
+        robin_hood (bool): Whether Robin Hood probing is used.
+        count (int): The number of key-value pairs in the hash table.
+        ordered_keys (list): The keys in the hash table in ascending order.
+        indexes (dict): The secondary indexes of the hash table by name.
+    """
+
+    def __init__(
+        self, size: int = 16, load_factor: float = 0.7, robin_hood: bool = True
+    ):
+        """
+        Initializes an open addressing hash table object.
+
+        Args:
+            size (int): The initial number of slots in the hash table. Defaults to 16.
+            load_factor (float): The maximum fraction of occupied slots before the table grows. Defaults to 0.7.
+            robin_hood (bool): Whether to use Robin Hood probing instead of plain linear probing. Defaults to True.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        if size < 1:
+            raise ValueError("Hash table size must be at least 1.")
+        if not 0 < load_factor < 1:
+            raise ValueError("Open addressing load factor must be between 0 and 1.")
+
+        self.load_factor = load_factor
+        self.robin_hood = robin_hood
+        self.count = 0
+        self.ordered_keys = []
+        self.indexes = {}
+        self._allocate(size)  # O(n) - function call
+
+    def _allocate(self, size: int) -> None:
+        """
+        Replaces the slot arrays with empty ones of the given size.
+
+        Args:
+            size (int): The number of slots.
+
+        Returns:
+            None
+        """
+        self.keys = [None] * size
+        self.values = [None] * size
+        self.probe_lengths = array.array("i", [-1]) * size
+
+    def _capacity(self) -> int:
+        """
+        Returns the number of slots in the hash table.
+
+        Returns:
+            int: The number of slots in the hash table.
+        """
+        return len(self.keys)
+
+    def _find(self, key) -> int:
+        """
+        Finds the slot holding the given key.
+
+        Args:
+            key: The key to find.
+
+        Returns:
+            int: The index of the slot holding the key, or -1 if the key is not in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        capacity = len(self.keys)
+        index = self._hash(key)
+        distance = 0
+
+        while True:  # O(1) - probe length is bounded by the load factor
+            slot_distance = self.probe_lengths[index]
+
+            # An empty slot ends every probe sequence
+            if slot_distance == -1:
+                return -1
+
+            # A Robin Hood key is never stored behind a key closer to its home slot
+            if self.robin_hood and slot_distance < distance:
+                return -1
+
+            if self.keys[index] == key:
+                return index
+
+            index = (index + 1) % capacity
+            distance += 1
+
+    def get(self, key) -> any:
+        """
+        Gets the value for the given key in the hash table.
+
+        Args:
+            key: The key to get the value for.
+
+        Returns:
+            any: The value for the given key.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        index = self._find(key)  # O(1) - function call
+
+        if index == -1:
+            return None
+
+        return self.values[index]
+
+    def _insert(self, key, value) -> bool:
+        """
+        Stores the key-value pair in the first free slot of its probe sequence, replacing the value if the key is
+        already stored. With Robin Hood probing, the pair takes over any slot whose key is closer to its home slot and
+        the displaced pair continues probing.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+
+        Returns:
+            bool: True if the key was not in the hash table before. False if its value was replaced.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        capacity = len(self.keys)
+        index = self._hash(key)
+        distance = 0
+        displaced = False
+
+        while True:  # O(1) - probe length is bounded by the load factor
+            slot_distance = self.probe_lengths[index]
+
+            if slot_distance == -1:
+                self.keys[index] = key
+                self.values[index] = value
+                self.probe_lengths[index] = distance
+                return True
+
+            if not displaced and self.keys[index] == key:
+                self.values[index] = value
+                return False
+
+            if self.robin_hood and slot_distance < distance:
+                # Swap the carried pair with the richer pair in this slot and keep probing for the richer one
+                key, self.keys[index] = self.keys[index], key
+                value, self.values[index] = self.values[index], value
+                distance, self.probe_lengths[index] = slot_distance, distance
+                displaced = True
+
+            index = (index + 1) % capacity
+            distance += 1
+
+    def _replace(self, key, value) -> bool:
+        """
+        Replaces the value of a key that is already stored in the hash table.
+
+        Args:
+            key: The key to replace the value of.
+            value: The new value.
+
+        Returns:
+            bool: True if the key was found and its value replaced. False otherwise.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        index = self._find(key)  # O(1) - function call
+
+        if index == -1:
+            return False
+
+        self.values[index] = value
+        return True
+
+    def get_many(self, keys) -> [any]:
+        """
+        Gets the values for many keys in the hash table.
+
+        Args:
+            keys (iterable): The keys to get the values for.
+
+        Returns:
+            list: The value for each key, in the order of the keys. None for keys that are not in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        return [self.get(i) for i in keys]  # O(k) - list comprehension
+
+    def _insert_many(self, items: list) -> list:
+        """
+        Stores many key-value pairs in their probe sequences.
+
+        Args:
+            items (list): The key-value pairs to store.
+
+        Returns:
+            list: The keys that were not in the hash table before.
+        """
+        return [key for key, value in items if self._insert(key, value)]  # O(k) - list comprehension
+
+    def _replace_many(self, items: list) -> list:
+        """
+        Replaces the values of many keys that are already stored.
+
+        Args:
+            items (list): The key-value pairs to replace.
+
+        Returns:
+            list: The key-value pairs whose keys were found and replaced.
+        """
+        return [i for i in items if self._replace(i[0], i[1])]  # O(k) - list comprehension
+
+    def _entries(self):
+        """
+        Yields every key-value pair in the hash table in slot order.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        for i in range(len(self.keys)):  # O(n) - for loop
+            if self.probe_lengths[i] != -1:
+                yield self.keys[i], self.values[i]
+
+    def _resize(self, size: int) -> None:
+        """
+        Rebuilds the slot arrays with the given number of slots and reinserts every key-value pair into them.
+
+        Args:
+            size (int): The new number of slots.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        items = list(self._entries())  # O(n) - function call
+
+        self._allocate(size)  # O(n) - function call
+
+        for key, value in items:  # O(n) - for loop
+            self._insert(key, value)
+
+
+class ConcurrentHashTable(HashTable):
+    """
+    A thread-safe hash table using separate chaining with lock striping. Each bucket is an immutable tuple that writers
+    replace whole while holding the lock of the bucket's stripe, so writers to buckets in different stripes run
+    concurrently and get never takes a lock: a reader sees either the bucket before or after a write, never a bucket in
+    the middle of one. Growing the table takes every stripe lock and swaps in the rehashed bucket list in one
+    assignment.
+
+    Args:
+        size (int): The initial number of buckets in the hash table. Defaults to 16.
+        load_factor (float): The maximum average number of pairs per bucket before the table grows. Defaults to 0.75.
+        stripes (int): The number of locks the buckets are striped across. Defaults to 16.
+
+    Attributes:
+        locks (list): The lock of each stripe. Bucket i is guarded by lock i % stripes.
+        meta_lock (threading.Lock): Guards the count, the sorted key array and the secondary indexes.
+    """
+
+    def __init__(self, size: int = 16, load_factor: float = 0.75, stripes: int = 16):
+        """
+        Initializes a thread-safe hash table object.
+
+        Args:
+            size (int): The initial number of buckets in the hash table. Defaults to 16.
+            load_factor (float): The maximum average number of pairs per bucket before the table grows. Defaults to
+                0.75.
+            stripes (int): The number of locks the buckets are striped across. Defaults to 16.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        if stripes < 1:
+            raise ValueError("Hash table must have at least 1 lock stripe.")
+
+        super().__init__(size, load_factor)
+
+        self.table = [()] * size
+        self.locks = [threading.Lock() for i in range(stripes)]
+        self.meta_lock = threading.Lock()
+
+    def get(self, key) -> any:
+        """
+        Gets the value for the given key in the hash table without taking a lock.
+
+        Args:
+            key: The key to get the value for.
+
+        Returns:
+            any: The value for the given key.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        # Read the bucket list once so a concurrent resize cannot mix the old and new lists
+        table = self.table
+
+        for item_key, item_value in table[hash(key) % len(table)]:  # O(1) - bucket scan
+            if item_key == key:
+                return item_value
+
+        return None
+
+    def get_many(self, keys) -> [any]:
+        """
+        Gets the values for many keys in the hash table without taking a lock.
+
+        Args:
+            keys (iterable): The keys to get the values for.
+
+        Returns:
+            list: The value for each key, in the order of the keys. None for keys that are not in the hash table.
+        """
+        return [self.get(i) for i in keys]  # O(k) - list comprehension
+
+    def add(self, key, value) -> None:
+        """
+        Sets the value for the given key in the hash table, locking only the stripe of its bucket while the bucket is
+        replaced.
+
+        Args:
+            key: The key to set.
+            value: The value to set.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the key cannot be compared with the keys in the hash table. The table is left unchanged.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
+        """
+        self._check_orderable(key, key)  # O(1) - function call
+
+        if self._insert(key, value):
+            with self.meta_lock:
+                self.count += 1
+
+                if len(self.ordered_keys) == 0 or self.ordered_keys[-1] < key:
+                    self.ordered_keys.append(key)
+                else:
+                    bisect.insort(self.ordered_keys, key)  # O(n) - insertion into the sorted keys
+
+            capacity = self._capacity()
+            if self.count > capacity * self.load_factor:
+                self._resize(capacity * 2)  # O(n) - function call
+
+        self._index(key, value)
+
+    def add_many(self, items) -> None:
+        """
+        Sets the values for many keys in the hash table, locking one stripe at a time.
+
+        Args:
+            items (iterable): The key-value pairs to set.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the keys cannot be compared with each other or with the keys in the hash table. The table is
+                left unchanged.
+        """
+        items = [tuple(i) for i in items]  # O(k) - list comprehension
+
+        if len(items) > 0:
+            self._check_batch_orderable(items)  # O(k) - function call
+
+        for key, value in items:  # O(k) - for loop
+            self.add(key, value)
+
+    def update_many(self, items) -> None:
+        """
+        Updates the values for many keys that are already in the hash table, locking one stripe at a time.
+
+        Args:
+            items (iterable): The key-value pairs to update.
+
+        Returns:
+            None
+        """
+        for key, value in items:  # O(k) - for loop
+            self.update(key, value)
+
+    def items(self):
+        """
+        Yields the key-value pairs in the hash table in ascending key order, as of the start of the iteration.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+        """
+        for key in self.ordered_keys[:]:  # O(n) - for loop over a copy of the sorted keys
+            yield key, self.get(key)
+
+    def _insert(self, key, value) -> bool:
+        """
+        Replaces the bucket of the key with a copy holding the key-value pair while holding the stripe lock.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+
+        Returns:
+            bool: True if the key was not in the hash table before. False if its value was replaced.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+        """
+        while True:
+            table = self.table
+            index = hash(key) % len(table)
+
+            with self.locks[index % len(self.locks)]:
+                # Start over if the table was resized while waiting for the lock
+                if self.table is not table:
+                    continue
+
+                bucket = table[index]
+                for i in range(len(bucket)):  # O(1) - bucket scan
+                    if bucket[i][0] == key:
+                        table[index] = bucket[:i] + ((key, value),) + bucket[i + 1:]
+                        return False
+
+                table[index] = bucket + ((key, value),)
+                return True
+
+    def _replace(self, key, value) -> bool:
+        """
+        Replaces the bucket of the key with a copy holding the new value while holding the stripe lock.
+
+        Args:
+            key: The key to replace the value of.
+            value: The new value.
+
+        Returns:
+            bool: True if the key was found and its value replaced. False otherwise.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+        """
+        while True:
+            table = self.table
+            index = hash(key) % len(table)
+
+            with self.locks[index % len(self.locks)]:
+                # Start over if the table was resized while waiting for the lock
+                if self.table is not table:
+                    continue
+
+                bucket = table[index]
+                for i in range(len(bucket)):  # O(1) - bucket scan
+                    if bucket[i][0] == key:
+                        table[index] = bucket[:i] + ((key, value),) + bucket[i + 1:]
+                        return True
+
+                return False
+
+    def _index(self, key, value) -> None:
+        """
+        Records the key-value pair in every secondary index while holding the meta lock.
+
+        Args:
+            key: The key to record.
+            value: The value to derive the indexed values from.
+
+        Returns:
+            None
+        """
+        if len(self.indexes) == 0:
+            return
+
+        with self.meta_lock:
+            super()._index(key, value)
+
+    def _entries(self):
+        """
+        Yields every key-value pair in the hash table in bucket order, as of the start of the iteration.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+        """
+        for i in self.table:  # O(n) - for loop
+            yield from i
+
+    def _resize(self, size: int) -> None:
+        """
+        Rehashes every key-value pair into a new bucket list of the given size while holding every stripe lock, then
+        swaps the new list in. Does nothing if another thread already grew the table to at least that size.
+
+        Args:
+            size (int): The new number of buckets.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(n)
+        """
+        for lock in self.locks:  # O(1) - for loop over the stripes
+            lock.acquire()
+
+        try:
+            if size <= len(self.table):
+                return
+
+            buckets = [[] for i in range(size)]
+            for key, value in self._entries():  # O(n) - for loop
+                buckets[hash(key) % size].append((key, value))
+
+            # Swap the whole bucket list in with a single assignment
+            self.table = [tuple(i) for i in buckets]
+        finally:
+            for lock in self.locks:  # O(1) - for loop over the stripes
+                lock.release()
+
+
+class DirectAddressHashTable(HashTable):
+    """
+    A hash table specialized for dense non-negative integer keys, such as package IDs counting up from 1. Keys whose
+    addition keeps the slot list at least min_density full are stored in a flat list at the position equal to the key,
+    so get and update are a single list index with no hashing or bucket scan. Any other integer key, negative or too
+    far past the slot list, falls back to the separate chaining buckets of HashTable. Keys must be integers, since the
+    table keeps all its keys in ascending order.
+
+    Args:
+        size (int): The initial number of fallback buckets. Defaults to 10.
+        load_factor (float): The maximum average number of fallback pairs per bucket before the buckets grow. Defaults
+            to 0.75.
+        min_density (float): The minimum fraction of filled slots the slot list may drop to when it grows to fit a
+            key. Defaults to 0.5.
+
+    Attributes:
+        slots (list): The value of each directly addressed key, by key, or the empty marker.
+        min_density (float): The minimum fraction of filled slots the slot list may drop to when it grows.
+        direct_count (int): The number of key-value pairs stored in the slot list.
+        chained_count (int): The number of key-value pairs stored in the fallback buckets.
+    """
+
+    # The number of slots the slot list may always grow to, however few of them are filled
+    minimum_slots = 64
+
+    # Marks a slot that holds no value, so None can still be stored as a value
+    empty = object()
+
+    def __init__(
+        self, size: int = 10, load_factor: float = 0.75, min_density: float = 0.5
+    ):
+        """
+        Initializes a direct address hash table object.
+
+        Args:
+            size (int): The initial number of fallback buckets. Defaults to 10.
+            load_factor (float): The maximum average number of fallback pairs per bucket before the buckets grow.
+                Defaults to 0.75.
+            min_density (float): The minimum fraction of filled slots the slot list may drop to when it grows to fit
+                a key. Defaults to 0.5.
+
+        Returns:
+            None
+        """
+        if not 0 < min_density <= 1:
+            raise ValueError("Direct address minimum density must be between 0 and 1.")
+
+        super().__init__(size, load_factor)
+
+        self.slots = []
+        self.min_density = min_density
+        self.direct_count = 0
+        self.chained_count = 0
+
+    def _is_direct(self, key) -> bool:
+        """
+        Checks whether the key is stored, or would be stored, in the slot list.
+
+        Args:
+            key: The key to check.
+
+        Returns:
+            bool: True if the key is a non-negative integer within the slot list or close enough to grow it to.
+        """
+        if type(key) is not int or key < 0:
+            return False
+
+        if key < len(self.slots):
+            return True
+
+        # Grow the slot list only while it stays at least min_density full
+        return key < max(self.minimum_slots, (self.direct_count + 1) / self.min_density)
+
+    def get(self, key) -> any:
+        """
+        Gets the value for the given key in the hash table.
+
+        Args:
+            key: The key to get the value for.
+
+        Returns:
+            any: The value for the given key.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        if type(key) is int and 0 <= key < len(self.slots):
+            value = self.slots[key]
+            if value is not self.empty:
+                return value
+
+        # Keys added while they were too sparse for the slot list stay in the buckets
+        if self.chained_count > 0:
+            return super().get(key)  # O(1) - hash table get
+
+        return None
+
+    def get_many(self, keys) -> [any]:
+        """
+        Gets the values for many keys in the hash table in one pass, without a method call per directly addressed
+        key.
+
+        Args:
+            keys (iterable): The keys to get the values for.
+
+        Returns:
+            list: The value for each key, in the order of the keys. None for keys that are not in the hash table.
+
+        Notes:
+            time complexity:
+                best case = O(k)
+                worst case = O(nk)
+                average case = O(k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
+        """
+        slots = self.slots
+        slot_count = len(slots)
+        empty = self.empty
+        values = []
+
+        for key in keys:  # O(k) - for loop
+            if type(key) is int and 0 <= key < slot_count and slots[key] is not empty:
+                values.append(slots[key])
+            elif self.chained_count > 0:
+                values.append(super().get(key))  # O(1) - hash table get
+            else:
+                values.append(None)
+
+        return values
+
+    def _load(self) -> int:
+        """
+        Returns the number of key-value pairs stored in the fallback buckets, which the load factor applies to.
+
+        Returns:
+            int: The number of key-value pairs stored in the fallback buckets.
+        """
+        return self.chained_count
+
+    def _reserve(self, extra: int) -> None:
+        """
+        Grows the fallback buckets to fit the pairs already stored in them. Batches do not reserve buckets up front
+        because dense keys go to the slot list; the buckets grow as fallback pairs arrive instead.
+
+        Args:
+            extra (int): The number of key-value pairs about to be added, which is ignored.
+
+        Returns:
+            None
+        """
+        super()._reserve(0)  # O(n) - function call when the buckets grow
+
+    def _insert(self, key, value) -> bool:
+        """
+        Stores the key-value pair in the slot list if the key is dense enough, or in the fallback buckets otherwise,
+        replacing the value if the key is already stored.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+
+        Returns:
+            bool: True if the key was not in the hash table before. False if its value was replaced.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1) amortized
+        """
+        if not self._is_direct(key):
+            if super()._insert(key, value):  # O(1) - bucket insert
+                self.chained_count += 1
+                return True
+            return False
+
+        if key >= len(self.slots):
+            self.slots.extend([self.empty] * (key + 1 - len(self.slots)))  # O(1) amortized - list extend
+
+        if self.slots[key] is not self.empty:
+            self.slots[key] = value
+            return False
+
+        # The key may have been stored in the buckets before the slot list grew to reach it
+        if self.chained_count > 0 and super()._replace(key, value):
+            return False
+
+        self.slots[key] = value
+        self.direct_count += 1
+        return True
+
+    def _insert_many(self, items: list) -> list:
+        """
+        Stores many key-value pairs, growing the fallback buckets as fallback pairs arrive.
+
+        Args:
+            items (list): The key-value pairs to store.
+
+        Returns:
+            list: The keys that were not in the hash table before.
+        """
+        new_keys = []
+
+        for key, value in items:  # O(k) - for loop
+            if self._insert(key, value):
+                new_keys.append(key)
+                if not self._is_direct(key):
+                    self._reserve(0)  # O(n) - function call when the buckets grow
+
+        return new_keys
+
+    def _replace(self, key, value) -> bool:
+        """
+        Replaces the value of a key that is already stored in the hash table.
+
+        Args:
+            key: The key to replace the value of.
+            value: The new value.
+
+        Returns:
+            bool: True if the key was found and its value replaced. False otherwise.
+
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
+            space complexity:
+                best case = O(1)
+                worst case = O(1)
+                average case = O(1)
+        """
+        if type(key) is int and 0 <= key < len(self.slots) and self.slots[key] is not self.empty:
+            self.slots[key] = value
+            return True
+
+        if self.chained_count > 0:
+            return super()._replace(key, value)  # O(1) - bucket replace
+
+        return False
+
+    def _replace_many(self, items: list) -> list:
+        """
+        Replaces the values of many keys that are already stored.
+
+        Args:
+            items (list): The key-value pairs to replace.
+
+        Returns:
+            list: The key-value pairs whose keys were found and replaced.
+        """
+        return [i for i in items if self._replace(i[0], i[1])]  # O(k) - list comprehension
+
+    def _entries(self):
+        """
+        Yields every key-value pair in the hash table, the directly addressed ones first in key order.
+
+        Yields:
+            tuple: A key-value pair in the hash table.
+        """
+        for key in range(len(self.slots)):  # O(n) - for loop
+            if self.slots[key] is not self.empty:
+                yield key, self.slots[key]
 
-        return size
+        yield from super()._entries()  # O(n) - bucket entries
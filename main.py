@@ -1,160 +1,199 @@
 # Student Name: Sheldon Handler
 # Student ID: 007830903
 
-import datetime
-
 import __init__
 import address
 import cmd_input
+import delivery_time_calculator
+import fleet_optimizer
+import package_file
 import read_csv_file
 import truck
 
-# Initialize csv files into lists
-read_csv_file.init()
-
-# Set arrival times for packages that are delayed on flight
-__init__.packages.get(6).set_arrival_time(datetime.time(hour=9, minute=5))
-__init__.packages.get(25).set_arrival_time(datetime.time(hour=9, minute=5))
-__init__.packages.get(28).set_arrival_time(datetime.time(hour=9, minute=5))
-__init__.packages.get(32).set_arrival_time(datetime.time(hour=9, minute=5))
-
-# Set address for package 9 to be wrong and input correct address ID
-package_with_wrong_address = __init__.packages.get(9)
-wrong_address_update_time = datetime.time(hour=10, minute=20)
-package_with_wrong_address.update_address(19, wrong_address_update_time)
-
-items = __init__.packages.get_all()
-
-items_list = [i[1] for i in items]
-
-address.load_from_package_list(
-    __init__.addresses,
-    items_list,
-)
-
-new_truck_1 = truck.Truck(
-    1,
-    "At Hub",
-    0,
-)
-new_truck_2 = truck.Truck(
-    2,
-    "At Hub",
-    0,
-)
-new_truck_3 = truck.Truck(
-    3,
-    "At Hub",
-    0,
-)
-
-# print(
-#     nearest_neighbor.sorted_unvisited_neighbors(
-#         __init__.distances,
-#         [],
-#     ),
-#     "\n",
-# )
-
-__init__.trucks = [new_truck_1, new_truck_2, new_truck_3]
-
-# loading truck 1
-__init__.trucks[0].load_truck(14)
-__init__.trucks[0].load_truck(15)
-__init__.trucks[0].load_truck(19)
-__init__.trucks[0].load_truck(16)
-__init__.trucks[0].load_truck(13)
-__init__.trucks[0].load_truck(20)
-__init__.trucks[0].load_truck(21)
-__init__.trucks[0].load_truck(1)
-__init__.trucks[0].load_truck(34)
-__init__.trucks[0].load_truck(40)
-__init__.trucks[0].load_truck(4)
-__init__.trucks[0].load_truck(30)
-__init__.trucks[0].load_truck(22)
-__init__.trucks[0].load_truck(23)
-
-# loading truck 2
-__init__.trucks[1].load_truck(3)
-__init__.trucks[1].load_truck(18)
-__init__.trucks[1].load_truck(36)
-__init__.trucks[1].load_truck(38)
-__init__.trucks[1].load_truck(37)
-__init__.trucks[1].load_truck(24)
-__init__.trucks[1].load_truck(2)
-__init__.trucks[1].load_truck(33)
-__init__.trucks[1].load_truck(8)
-__init__.trucks[1].load_truck(29)
-__init__.trucks[1].load_truck(6, datetime.time(hour=9, minute=7))
-__init__.trucks[1].load_truck(25, datetime.time(hour=9, minute=7))
-__init__.trucks[1].load_truck(26)
-__init__.trucks[1].load_truck(31)
-__init__.trucks[1].load_truck(32, datetime.time(hour=9, minute=7))
-
-# loading truck 3
-__init__.trucks[2].load_truck(12)
-__init__.trucks[2].load_truck(17)
-__init__.trucks[2].load_truck(5)
-__init__.trucks[2].load_truck(28, datetime.time(hour=9, minute=7))
-__init__.trucks[2].load_truck(9, datetime.time(hour=10, minute=22))
-__init__.trucks[2].load_truck(27)
-__init__.trucks[2].load_truck(35)
-__init__.trucks[2].load_truck(7)
-__init__.trucks[2].load_truck(39)
-__init__.trucks[2].load_truck(10)
-__init__.trucks[2].load_truck(11)
-
-__init__.trucks[0].depart_truck(datetime.time(hour=8, minute=5))
-__init__.trucks[1].depart_truck(datetime.time(hour=9, minute=10))
-__init__.trucks[2].depart_truck(datetime.time(hour=10, minute=25))
-
-__init__.trucks[0].deliver_all()
-__init__.trucks[1].deliver_all()
-__init__.trucks[2].deliver_all()
-
-# input_time = cmd_input.prompt_time()
-#
-# item_tuples = __init__.packages.get_all()
-# item_values = [i[1] for i in item_tuples]
-#
-# package_list_at_time = search_function.package_status_at_time(
-#     item_values,
-#     input_time,
-# )
-#
-# distance_traveled_list = []
-# truck_view_list = []
-# total_distance_traveled_at_time = 0
-# total_distance_traveled_by_end_of_day = 0
-#
-# for i in __init__.trucks:  # O(n) - for loop
-#     distance_traveled = search_function.distance_traveled(
-#         i, package_list_at_time, input_time
-#     )  # O(n^2) - function call
-#
-#     total_distance_traveled_at_time += distance_traveled
-#     total_distance_traveled_by_end_of_day += i.distance_traveled
-#
-#     truck_status = ""
-#     if input_time < i.departure_time:
-#         truck_status = "At Hub"
-#     elif i.return_time > input_time:
-#         truck_status = "En Route"
-#     elif i.return_time <= input_time:
-#         truck_status = "At Hub"
-#
-#     truck_view = truck.TruckView(
-#         i.id, distance_traveled, i.distance_traveled, truck_status
-#     )
-#     truck_view_list.append(truck_view)
-
-# table_app.main_window(
-#     packages_list=package_list_at_time,
-#     trucks_view_list=truck_view_list,
-#     hour=input_time.hour,
-#     minute=input_time.minute,
-#     total_distance_at_time=total_distance_traveled_at_time,
-#     total_distance_by_end_of_day=total_distance_traveled_by_end_of_day,
-# )
-
-cmd_input.prompt_menu()
+
+def run_day(run_inputs: bytes) -> None:
+    """
+    Runs the day: delays the packages on the late flight, gives package 9 its correct address, loads the trucks by
+    the loading plan or a shorter fleet plan, delivers every package, and saves the delivered packages to
+    package_table_file.
+
+    Args:
+        run_inputs (bytes): The hash of the inputs of the day, saved with the packages.
+
+    Returns:
+        None
+    """
+    # Set arrival times for packages that are delayed on flight
+    __init__.packages.get(6).set_arrival_time(delivery_time_calculator.clock_time(9, 5))
+    __init__.packages.get(25).set_arrival_time(delivery_time_calculator.clock_time(9, 5))
+    __init__.packages.get(28).set_arrival_time(delivery_time_calculator.clock_time(9, 5))
+    __init__.packages.get(32).set_arrival_time(delivery_time_calculator.clock_time(9, 5))
+
+    # Set address for package 9 to be wrong and input correct address ID
+    package_with_wrong_address = __init__.packages.get(9)
+    wrong_address_update_time = delivery_time_calculator.clock_time(10, 20)
+    package_with_wrong_address.update_address(19, wrong_address_update_time)
+
+    # Packages each truck carries, in loading order
+    loading_plan = {
+        1: [14, 15, 19, 16, 13, 20, 21, 1, 34, 40, 4, 30, 22, 23],
+        2: [3, 18, 36, 38, 37, 24, 2, 33, 8, 29, 6, 25, 26, 31, 32],
+        3: [12, 17, 5, 28, 9, 27, 35, 7, 39, 10, 11],
+    }
+
+    departure_times = {
+        1: delivery_time_calculator.clock_time(8, 5),
+        2: delivery_time_calculator.clock_time(9, 10),
+        3: delivery_time_calculator.clock_time(10, 25),
+    }
+
+    # Search for a shorter split of the packages between the trucks when given the time for it
+    planned_routes = {}
+    if __init__.fleet_optimization_time_budget > 0:
+        fleet_plan = fleet_optimizer.FleetOptimizer(loading_plan, departure_times).optimize(
+            __init__.fleet_optimization_time_budget
+        )
+        print(fleet_plan, "\n")
+        loading_plan = fleet_plan.loads
+        planned_routes = fleet_plan.routes
+
+    # Load each package once it has arrived at the hub with its correct address
+    for i in __init__.trucks:  # O(n) - for loop
+        for package_id in loading_plan[i.id]:  # O(k) - for loop
+            i.load_truck(
+                package_id, fleet_optimizer.load_time(__init__.packages.get(package_id))
+            )
+
+    for i in __init__.trucks:  # O(n) - for loop
+        i.depart_truck(departure_times[i.id])
+
+    for i in __init__.trucks:  # O(n) - for loop
+        i.deliver_all(planned_routes.get(i.id))
+
+    # Save the delivered packages so query workers can map them without re-running the day
+    package_file.dump(__init__.packages, __init__.package_table_file, run_inputs)
+
+
+# Run the day only when started as a script, not when a worker process imports this module
+if __name__ == "__main__":
+    # The inputs of the day: the files it reads, this file that runs it and the settings that affect its results
+    run_inputs = package_file.input_hash(
+        [
+            __init__.address_csv_file,
+            __init__.distance_csv_file,
+            __init__.package_csv_file,
+            __init__.road_edge_csv_file,
+            __init__.address_coordinate_csv_file,
+            __file__,
+        ],
+        [
+            __init__.driver,
+            __init__.truck_capacity,
+            __init__.truck_speed,
+            __init__.starting_location,
+            __init__.speed_profile,
+            __init__.route_improvement_time_budget,
+            __init__.exact_route_max_stops,
+            __init__.multi_start_routes,
+            __init__.candidate_list_min_locations,
+            __init__.candidate_neighbors,
+            __init__.fleet_optimization_time_budget,
+            __init__.fleet_optimization_max_iterations,
+        ],
+    )
+
+    # Map the packages saved by an earlier run instead of running the day again while its inputs are the same
+    saved_packages = None
+    if __init__.reuse_package_table_file:
+        saved_packages = package_file.open_saved(__init__.package_table_file, run_inputs)
+
+    # Initialize csv files into lists, reading the packages only when the day is run again
+    read_csv_file.init(load_packages=saved_packages is None)
+
+    new_truck_1 = truck.Truck(
+        1,
+        "At Hub",
+        0,
+    )
+    new_truck_2 = truck.Truck(
+        2,
+        "At Hub",
+        0,
+    )
+    new_truck_3 = truck.Truck(
+        3,
+        "At Hub",
+        0,
+    )
+
+    # print(
+    #     nearest_neighbor.sorted_unvisited_neighbors(
+    #         __init__.distances,
+    #         [],
+    #     ),
+    #     "\n",
+    # )
+
+    __init__.trucks = [new_truck_1, new_truck_2, new_truck_3]
+
+    if saved_packages is None:
+        run_day(run_inputs)
+    else:
+        __init__.packages = saved_packages
+        for i in __init__.trucks:  # O(n) - for loop
+            i.restore(saved_packages)
+
+    items_list = [i[1] for i in __init__.packages.items()]
+
+    address.load_from_package_list(
+        __init__.addresses,
+        items_list,
+    )
+
+
+    # input_time = cmd_input.prompt_time()
+    #
+    # item_tuples = __init__.packages.get_all()
+    # item_values = [i[1] for i in item_tuples]
+    #
+    # package_list_at_time = search_function.package_status_at_time(
+    #     item_values,
+    #     input_time,
+    # )
+    #
+    # distance_traveled_list = []
+    # truck_view_list = []
+    # total_distance_traveled_at_time = 0
+    # total_distance_traveled_by_end_of_day = 0
+    #
+    # for i in __init__.trucks:  # O(n) - for loop
+    #     distance_traveled = search_function.distance_traveled(
+    #         i, package_list_at_time, input_time
+    #     )  # O(n^2) - function call
+    #
+    #     total_distance_traveled_at_time += distance_traveled
+    #     total_distance_traveled_by_end_of_day += i.distance_traveled
+    #
+    #     truck_status = ""
+    #     if input_time < i.departure_time:
+    #         truck_status = "At Hub"
+    #     elif i.return_time > input_time:
+    #         truck_status = "En Route"
+    #     elif i.return_time <= input_time:
+    #         truck_status = "At Hub"
+    #
+    #     truck_view = truck.TruckView(
+    #         i.id, distance_traveled, i.distance_traveled, truck_status
+    #     )
+    #     truck_view_list.append(truck_view)
+
+    # table_app.main_window(
+    #     packages_list=package_list_at_time,
+    #     trucks_view_list=truck_view_list,
+    #     hour=input_time.hour,
+    #     minute=input_time.minute,
+    #     total_distance_at_time=total_distance_traveled_at_time,
+    #     total_distance_by_end_of_day=total_distance_traveled_by_end_of_day,
+    # )
+
+    cmd_input.prompt_menu()
@@ -1,3 +1,17 @@
+import heapq
+
+import __init__
+import distance_matrix
+import distance_oracle
+import spatial_index
+
+try:
+    import numpy
+except ImportError:
+    # Pick nearest neighbors in pure Python when NumPy is not installed
+    numpy = None
+
+
 def sorted_neighbors(distances_list: [float]) -> [int]:
     """
     Sorts a list and returns a list of indexes sorted by the corresponding value in ascending order.
@@ -37,6 +51,15 @@ def sorted_unvisited_neighbors(
         time complexity: O(n^2 log n)
         space complexity: O(n)
     """
+    if numpy is not None:
+        # Sort the row and drop the visited locations with array operations
+        distances_array = numpy.asarray(distances_list, dtype=float)
+        unvisited = numpy.ones(len(distances_array), dtype=bool)
+        unvisited[list(visited_location_indices)] = False
+        order = numpy.argsort(distances_array, kind="stable")  # O(n log n) - stable sort
+
+        return order[unvisited[order]].tolist()  # O(n) - boolean mask
+
     unvisited_location_indices = []
     sorted_neighbors_list = sorted_neighbors(
         distances_list
@@ -47,3 +70,479 @@ def sorted_unvisited_neighbors(
             unvisited_location_indices.append(i)
 
     return unvisited_location_indices
+
+
+# The most locations a neighbor index is built for by neighbor_cursor, since it keeps every location's sorted row
+neighbor_index_max_locations = 3000
+
+
+class NeighborIndex:
+    """
+    Every location's neighbors sorted by distance, built once from the distance matrix so the routing loop never has
+    to sort a distance row again.
+
+    Attributes:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix the index was built from.
+        neighbors ([[int]]): The indices of all locations sorted by distance from each location.
+    """
+
+    def __init__(self, distances: [[float]]):
+        """
+        Sorts the neighbors of every location in the distance matrix.
+
+        Args:
+            distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix to index.
+
+        Notes:
+            time complexity: O(n^2 log n), vectorized with NumPy
+            space complexity: O(n^2)
+        """
+        self.distances = distances
+
+        if numpy is not None:
+            # A stable sort keeps ties in index order, like sorted_neighbors
+            self.neighbors = numpy.argsort(
+                distance_array(distances), axis=1, kind="stable"
+            ).tolist()  # O(n^2 log n) - vectorized sort
+        else:
+            self.neighbors = [
+                sorted_neighbors(distance_matrix.matrix_row(distances, i))
+                for i in range(len(distances))
+            ]  # O(n^2 log n) - function call per row
+
+    def cursor(self, visited_location_indices: [int] = ()) -> "NeighborCursor":
+        """
+        Creates a cursor over the index that skips the given locations.
+
+        Args:
+            visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+        Returns:
+            NeighborCursor: A cursor for finding the nearest unvisited neighbors.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        return NeighborCursor(self, visited_location_indices)
+
+
+class NeighborCursor:
+    """
+    Finds the nearest unvisited neighbor of a location from a neighbor index. Locations are marked visited in a bitset,
+    and each location keeps a position in its sorted neighbor list that only moves forward, because a visited location
+    never becomes unvisited again.
+
+    Attributes:
+        index (NeighborIndex): The neighbor index the cursor reads from.
+        visited (bytearray): 1 for each visited location, 0 for each unvisited location.
+        positions ([int]): The position of the nearest possibly unvisited neighbor in each sorted neighbor list.
+    """
+
+    def __init__(self, index: NeighborIndex, visited_location_indices: [int] = ()):
+        """
+        Creates a cursor over a neighbor index.
+
+        Args:
+            index (NeighborIndex): The neighbor index to read from.
+            visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        self.index = index
+        self.visited = bytearray(len(index.neighbors))
+        self.positions = [0] * len(index.neighbors)
+
+        for i in visited_location_indices:  # O(n) - for loop
+            self.visited[i] = 1
+
+    def visit(self, location_index: int) -> None:
+        """
+        Marks a location as visited.
+
+        Args:
+            location_index (int): The index of the visited location.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        self.visited[location_index] = 1
+
+    def nearest(self, location_index: int) -> int or None:
+        """
+        Get the nearest unvisited neighbor of a location. Ties in distance go to the lower index, the same as
+        sorted_unvisited_neighbors.
+
+        Args:
+            location_index (int): The index of the location to search from.
+
+        Returns:
+            int or None: The index of the nearest unvisited neighbor. None if all locations have been visited.
+
+        Notes:
+            time complexity: O(1) amortized, O(n) worst case
+            space complexity: O(1)
+        """
+        neighbors = self.index.neighbors[location_index]
+        position = self.positions[location_index]
+
+        # Skip past visited neighbors for good, since they stay visited
+        while position < len(neighbors) and self.visited[neighbors[position]]:
+            position += 1
+
+        self.positions[location_index] = position
+
+        if position == len(neighbors):
+            return None
+
+        return neighbors[position]
+
+
+# The neighbor index of the last distance matrix passed to neighbor_index
+_cached_index = None
+
+
+def neighbor_index(distances: [[float]]) -> NeighborIndex:
+    """
+    Get the neighbor index of a distance matrix, building it only the first time the matrix is seen.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix to index.
+
+    Returns:
+        NeighborIndex: The neighbor index of the distance matrix.
+
+    Notes:
+        time complexity: O(1) once built, O(n^2 log n) to build
+        space complexity: O(n^2)
+    """
+    global _cached_index
+
+    if _cached_index is None or _cached_index.distances is not distances:
+        _cached_index = NeighborIndex(distances)  # O(n^2 log n) - index build
+
+    return _cached_index
+
+
+class NumpyNeighborCursor:
+    """
+    Finds the nearest unvisited neighbor of a location with a masked argmin over its row of the distance matrix as a
+    NumPy array, with no Python-level sorting or membership checks. It needs no index, so it scales to thousands of
+    locations where sorting every row up front would dominate.
+
+    Attributes:
+        matrix (numpy.ndarray): The distance matrix as a two-dimensional array.
+        visited (numpy.ndarray): True for each visited location, False for each unvisited location.
+    """
+
+    def __init__(self, matrix, visited_location_indices: [int] = ()):
+        """
+        Creates a cursor over a distance matrix array.
+
+        Args:
+            matrix (numpy.ndarray): The distance matrix as a two-dimensional array.
+            visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        self.matrix = matrix
+        self.visited = numpy.zeros(len(matrix), dtype=bool)
+        self.visited[list(visited_location_indices)] = True
+
+    def visit(self, location_index: int) -> None:
+        """
+        Marks a location as visited.
+
+        Args:
+            location_index (int): The index of the visited location.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        self.visited[location_index] = True
+
+    def nearest(self, location_index: int) -> int or None:
+        """
+        Get the nearest unvisited neighbor of a location. Ties in distance go to the lower index, the same as
+        sorted_unvisited_neighbors.
+
+        Args:
+            location_index (int): The index of the location to search from.
+
+        Returns:
+            int or None: The index of the nearest unvisited neighbor. None if all locations have been visited.
+
+        Notes:
+            time complexity: O(n), vectorized
+            space complexity: O(n)
+        """
+        masked_row = numpy.where(
+            self.visited, numpy.inf, self.matrix[location_index]
+        )  # O(n) - vectorized mask
+        nearest_index = int(masked_row.argmin())  # O(n) - vectorized argmin
+
+        if self.visited[nearest_index]:
+            return None
+
+        return nearest_index
+
+
+# The last distance matrix passed to distance_array and its NumPy array
+_cached_array = (None, None)
+
+
+def distance_array(distances: [[float]]):
+    """
+    Get a distance matrix as a two-dimensional NumPy array, converting it only the first time the matrix is seen. A
+    DistanceMatrix is unpacked from its flat lower triangle in one vectorized assignment per triangle.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix to convert.
+
+    Returns:
+        numpy.ndarray: The distance matrix as a two-dimensional array of floats.
+
+    Notes:
+        time complexity: O(1) once converted, O(n^2) to convert
+        space complexity: O(n^2)
+    """
+    global _cached_array
+
+    if _cached_array[0] is not distances:
+        if isinstance(distances, distance_matrix.DistanceMatrix):
+            size = len(distances)
+            array = numpy.zeros((size, size))
+            lower = numpy.tril_indices(size, -1)
+            values = numpy.frombuffer(distances.values, dtype=float)
+            array[lower] = values  # O(n^2) - vectorized assignment
+            array[lower[1], lower[0]] = values  # O(n^2) - vectorized assignment
+        else:
+            array = numpy.asarray(distances, dtype=float)  # O(n^2) - array conversion
+        _cached_array = (distances, array)
+
+    return _cached_array[1]
+
+
+class CandidateIndex:
+    """
+    The k nearest neighbors of every location, built once from the distance matrix. Each list holds the k + 1
+    nearest locations in the same order as sorted_neighbors, normally the location itself followed by its k nearest
+    other locations, so the first unvisited location in a list is the nearest unvisited location whenever there is
+    one. Routing reads these short lists instead of whole distance rows, and local search only tries moves that
+    create an edge to a nearby location.
+
+    Attributes:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix the index was built from.
+        k (int): The number of nearest other locations kept for each location.
+        candidates ([[int]]): The k + 1 nearest locations of each location, nearest first.
+    """
+
+    def __init__(self, distances: [[float]], k: int = None):
+        """
+        Finds the k nearest neighbors of every location in the distance matrix.
+
+        Args:
+            distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix to index.
+            k (int): The number of nearest other locations to keep for each location. Defaults to
+                candidate_neighbors, read when the index is built.
+
+        Notes:
+            time complexity: O(n^2 log k), or O(n^2 log n) vectorized with NumPy
+            space complexity: O(n * k), reading one row at a time
+        """
+        if k is None:
+            k = __init__.candidate_neighbors
+
+        self.distances = distances
+        self.k = k
+        self.candidates = []
+
+        for i in range(len(distances)):  # O(n) - for loop
+            row = distance_matrix.matrix_row(distances, i)  # O(n) - function call
+            if numpy is not None:
+                # A stable sort keeps ties in index order, like sorted_neighbors
+                self.candidates.append(
+                    numpy.argsort(numpy.asarray(row, dtype=float), kind="stable")[: k + 1].tolist()
+                )  # O(n log n) - vectorized sort
+            else:
+                self.candidates.append(
+                    heapq.nsmallest(k + 1, range(len(row)), key=row.__getitem__)
+                )  # O(n log k) - partial sort
+
+    def cursor(self, visited_location_indices: [int] = ()) -> "CandidateCursor":
+        """
+        Creates a cursor over the index that skips the given locations.
+
+        Args:
+            visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+        Returns:
+            CandidateCursor: A cursor for finding the nearest unvisited neighbors.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        return CandidateCursor(self, visited_location_indices)
+
+
+class CandidateCursor:
+    """
+    Finds the nearest unvisited neighbor of a location from its candidate list, and scans the whole distance row only
+    when every candidate has been visited.
+
+    Attributes:
+        index (CandidateIndex): The candidate index the cursor reads from.
+        dist (function): Returns the distance between two locations of the distance matrix of the index.
+        visited (bytearray): 1 for each visited location, 0 for each unvisited location.
+        unvisited (set): The unvisited locations, for the full scan.
+    """
+
+    def __init__(self, index: CandidateIndex, visited_location_indices: [int] = ()):
+        """
+        Creates a cursor over a candidate index.
+
+        Args:
+            index (CandidateIndex): The candidate index to read from.
+            visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        self.index = index
+        self.dist = distance_matrix.distance_function(index.distances)
+        self.visited = bytearray(len(index.candidates))
+
+        for i in visited_location_indices:  # O(n) - for loop
+            self.visited[i] = 1
+
+        self.unvisited = {i for i in range(len(self.visited)) if not self.visited[i]}
+
+    def visit(self, location_index: int) -> None:
+        """
+        Marks a location as visited.
+
+        Args:
+            location_index (int): The index of the visited location.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        self.visited[location_index] = 1
+        self.unvisited.discard(location_index)
+
+    def nearest(self, location_index: int) -> int or None:
+        """
+        Get the nearest unvisited neighbor of a location. Ties in distance go to the lower index, the same as
+        sorted_unvisited_neighbors.
+
+        Args:
+            location_index (int): The index of the location to search from.
+
+        Returns:
+            int or None: The index of the nearest unvisited neighbor. None if all locations have been visited.
+
+        Notes:
+            time complexity: O(k), O(n) when every candidate is visited
+            space complexity: O(1)
+        """
+        for i in self.index.candidates[location_index]:  # O(k) - for loop
+            if not self.visited[i]:
+                return i
+
+        if len(self.unvisited) == 0:
+            return None
+
+        # Every candidate is visited, so fall back to scanning the distances to every unvisited location
+        dist = self.dist
+        return min(
+            self.unvisited, key=lambda i: (dist(location_index, i), i)
+        )  # O(n) - full scan
+
+
+# The candidate index of the last distance matrix and candidate count passed to candidate_index
+_cached_candidates = None
+
+
+def candidate_index(
+    distances: [[float]], k: int = None
+) -> CandidateIndex:
+    """
+    Get the candidate index of a distance matrix, building it only the first time the matrix is seen with k.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix to index.
+        k (int): The number of nearest other locations to keep for each location. Defaults to candidate_neighbors,
+            read when the index is requested.
+
+    Returns:
+        CandidateIndex: The candidate index of the distance matrix.
+
+    Notes:
+        time complexity: O(1) once built, O(n^2 log k) to build
+        space complexity: O(n * k)
+    """
+    global _cached_candidates
+
+    if k is None:
+        k = __init__.candidate_neighbors
+
+    if (
+        _cached_candidates is None
+        or _cached_candidates.distances is not distances
+        or _cached_candidates.k != k
+    ):
+        _cached_candidates = CandidateIndex(distances, k)  # O(n^2 log k) - index build
+
+    return _cached_candidates
+
+
+def neighbor_cursor(
+    distances: [[float]], visited_location_indices: [int] = ()
+) -> NeighborCursor or NumpyNeighborCursor or CandidateCursor or spatial_index.GridCursor:
+    """
+    Creates a cursor for finding the nearest unvisited neighbors in a distance matrix, using the spatial index of a
+    distance oracle, candidate lists for at least candidate_list_min_locations locations, and the neighbor index,
+    built once per matrix and amortized O(1) per step, for up to neighbor_index_max_locations locations. Only larger
+    matrices with candidate lists turned off fall back to the NumPy masked argmin, O(n) per step, when NumPy is
+    installed.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix or distance_oracle.DistanceOracle or [[float]]): The distances to
+            search.
+        visited_location_indices ([int]): The locations that are already visited or must never be visited.
+
+    Returns:
+        NeighborCursor or NumpyNeighborCursor or CandidateCursor or spatial_index.GridCursor: A cursor for finding the
+            nearest unvisited neighbors.
+
+    Notes:
+        time complexity: O(n) once the array or index is built
+        space complexity: O(n)
+    """
+    if isinstance(distances, distance_oracle.DistanceOracle):
+        return distances.spatial_index.cursor(
+            visited_location_indices
+        )  # O(n) - function call
+
+    if len(distances) >= __init__.candidate_list_min_locations:
+        return candidate_index(distances).cursor(
+            visited_location_indices
+        )  # O(n^2 log k) - function call on the first cursor
+
+    if numpy is not None and len(distances) > neighbor_index_max_locations:
+        return NumpyNeighborCursor(
+            distance_array(distances), visited_location_indices
+        )  # O(n^2) - function call on the first cursor
+
+    return neighbor_index(distances).cursor(
+        visited_location_indices
+    )  # O(n^2 log n) - function call on the first cursor
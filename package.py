@@ -8,10 +8,11 @@
 #
 #  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import copy
-import datetime
 
 import __init__
+import delivery_time_calculator
 import hash_table
+import package_history
 
 
 class Package:
@@ -31,11 +32,11 @@ class Package:
         special_notes: str,
         delivery_status: str = None,
         truck_id: int = None,
-        arrival_time: datetime.time = datetime.time(hour=8, minute=0),
-        load_time: datetime.time = None,
-        departure_time: datetime.time = None,
-        delivery_time: datetime.time = None,
-        modified_time: datetime.time = None,
+        arrival_time: int = delivery_time_calculator.clock_time(8),
+        load_time: int = None,
+        departure_time: int = None,
+        delivery_time: int = None,
+        modified_time: int = None,
     ):
         """
         Initializes a Package class instance. Converts the string values to the appropriate data types.
@@ -48,16 +49,20 @@ class Package:
             city (str): The package city.
             state (str): The package state.
             zip (str): The package zip code.
-            delivery_deadline (datetime.time): The package delivery deadline.
+            delivery_deadline (str): The package delivery deadline.
             weight_kilo (int): The package weight in kilos.
             special_notes (str): The package special notes.
             delivery_status (str): The package delivery status.
             truck_id (int): The id of truck assigned to the package.
-            arrival_time (datetime.time): The time when the package arrives at the hub.
-            load_time (datetime.time): The time when the package is loaded onto the truck.
-            departure_time (datetime.time): The time when the truck departs to deliver the package.
-            delivery_time (datetime.time): The package delivery time.
-            modified_time (ModifiedTime): The time the package was modified.
+            arrival_time (int): The time when the package arrives at the hub, in seconds since midnight like every
+                time of the package.
+            load_time (int): The time when the package is loaded onto the truck.
+            departure_time (int): The time when the truck departs to deliver the package.
+            delivery_time (int): The package delivery time.
+            modified_time (int): The time the package was modified.
+
+        Attributes:
+            package_table (PackageTable): The package table holding the package, which is notified of state changes.
         """
         self.id = id
         self.address_id = address_id
@@ -79,16 +84,17 @@ class Package:
         self.old_address_id = copy.deepcopy(address_id)
         self.old_address_name = copy.deepcopy(address_name)
         self.old_address = copy.deepcopy(address)
+        self.package_table = None
 
     def update_address(
-        self, correct_address_id: int, update_time: datetime.time
+        self, correct_address_id: int, update_time: int
     ) -> None:
         """
         Updates the address field to a corrected one.
 
         Args:
             correct_address_id (int): The correct address to replace existing address with.
-            update_time (datetime.time): The time the address was updated.
+            update_time (int): The time the address was updated.
 
         Returns:
             None
@@ -116,6 +122,7 @@ class Package:
         self.address = correct_address.address
 
         self.modified_time = update_time
+        self._notify()
 
     def update_delivery_status(self, updated_delivery_status: str) -> None:
         """Updates the delivery status of the package. If a delivery time is provided, it will also update the
@@ -138,13 +145,14 @@ class Package:
                 average case: O(1)
         """
         self.delivery_status = updated_delivery_status
+        self._notify()
         # print(f"Package {self.id} delivery status updated to {self.delivery_status}.\n")
 
-    def set_arrival_time(self, arrival_time: datetime.time) -> None:
+    def set_arrival_time(self, arrival_time: int) -> None:
         """Sets the arrival time of the package.
 
         Args:
-            arrival_time (datetime.time): The time when package arrives at the hub.
+            arrival_time (int): The time when package arrives at the hub.
 
         Returns:
             None
@@ -161,16 +169,17 @@ class Package:
         """
         self.delivery_status = "At Hub"
         self.arrival_time = arrival_time
+        self._notify()
         # print(f"Package {self.id} arrived to hub at {self.arrival_time}.\n")
 
     def load_package(
-        self, truck_id: int, load_time: datetime.time = datetime.time(hour=8, minute=2)
+        self, truck_id: int, load_time: int = delivery_time_calculator.clock_time(8, 2)
     ) -> None:
         """Loads the package onto the truck. Updates the truck_id attribute.
 
         Args:
             truck_id (int): The ID of the truck that will carry the package.
-            load_time (datetime.time): The time that the package was loaded onto the truck. Defaults to 8:00 AM.
+            load_time (int): The time that the package was loaded onto the truck. Defaults to 8:02 AM.
 
         Returns:
             None
@@ -188,13 +197,14 @@ class Package:
         self.truck_id = truck_id
         self.delivery_status = "At Hub"
         self.load_time = load_time
+        self._notify()
         # print(f"Package {self.id} loaded onto truck {self.truck_id}.\n")
 
-    def package_departure(self, departure_time: datetime.time) -> None:
+    def package_departure(self, departure_time: int) -> None:
         """Sends the truck to deliver the package. Updates departure_time and delivery_status attributes.
 
         Args:
-            departure_time (datetime.time): The time the truck departs to deliver the package.
+            departure_time (int): The time the truck departs to deliver the package.
 
         Returns:
             None
@@ -211,15 +221,16 @@ class Package:
         """
         self.departure_time = departure_time
         self.delivery_status = "En Route"
+        self._notify()
         # print(
         #     f"Truck {self.truck_id} sent to deliver package {self.id} at {self.departure_time}.\n"
         # )
 
-    def deliver_package(self, delivery_time: datetime.time) -> None:
+    def deliver_package(self, delivery_time: int) -> None:
         """Delivers the package. Updates the delivery_status and delivery_time attributes.
 
         Args:
-            delivery_time (datetime.time): The time that the package was delivered.
+            delivery_time (int): The time that the package was delivered.
 
         Returns:
             None
@@ -236,10 +247,30 @@ class Package:
         """
         self.delivery_status = "Delivered"
         self.delivery_time = delivery_time
+        self._notify()
         # print(
         #     f"Package {self.id} delivered at {self.delivery_time} on truck {self.truck_id}.\n"
         # )
 
+    def _notify(self) -> None:
+        """Refreshes the secondary indexes of the package table holding the package after a state change.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        if self.package_table is not None:
+            self.package_table.reindex(self.id)
+
     def __str__(self) -> str:
         """Returns the string representation of the Package object.
 
@@ -268,43 +299,217 @@ class Package:
             f"Special Notes: {self.special_notes}\n"
             f"Delivery Status: {self.delivery_status}\n"
             f"Truck ID: {self.truck_id}\n"
-            f"Arrival Time: {self.arrival_time}\n"
-            f"Load Time: {self.load_time}\n"
-            f"Departure Time: {self.departure_time}\n"
-            f"Delivery Time: {self.delivery_time}\n"
+            f"Arrival Time: {delivery_time_calculator.to_time(self.arrival_time)}\n"
+            f"Load Time: {delivery_time_calculator.to_time(self.load_time)}\n"
+            f"Departure Time: {delivery_time_calculator.to_time(self.departure_time)}\n"
+            f"Delivery Time: {delivery_time_calculator.to_time(self.delivery_time)}\n"
         )
 
 
+# The secondary indexes kept by every package store, by name
+package_indexes = {
+    "address_id": lambda x: x.address_id,
+    "truck_id": lambda x: x.truck_id,
+    "delivery_status": lambda x: x.delivery_status,
+    "delivery_deadline": lambda x: x.delivery_deadline,
+    "address_truck": lambda x: (x.address_id, x.truck_id),
+}
+
+
+class PackageTable(hash_table.DirectAddressHashTable):
+    """
+    A direct address hash table of packages keyed by package ID with secondary indexes on the address ID, truck ID,
+    delivery status, delivery deadline and the combined address ID and truck ID of each package. Packages added to the
+    table notify it of their state changes, so the indexes stay up to date without a call to update. The table also
+    keeps the history of its packages for point-in-time snapshots.
+
+    Args:
+        size (int): The initial number of fallback buckets in the hash table. Defaults to 10.
+        load_factor (float): The maximum average number of fallback pairs per bucket before the buckets grow. Defaults
+            to 0.75.
+
+    Attributes:
+        history (package_history.PackageHistory): The point-in-time versions of the packages in the table.
+    """
+
+    def __init__(self, size: int = 10, load_factor: float = 0.75):
+        """
+        Initializes an empty package table with its secondary indexes and history.
+
+        Args:
+            size (int): The initial number of fallback buckets in the hash table. Defaults to 10.
+            load_factor (float): The maximum average number of fallback pairs per bucket before the buckets grow.
+                Defaults to 0.75.
+        """
+        super().__init__(size, load_factor)
+
+        self.history = package_history.PackageHistory()
+
+        for name, key_function in package_indexes.items():  # O(1) - for loop
+            self.add_index(name, key_function)
+
+    def add(self, key, value: Package) -> None:
+        """
+        Adds a package to the table and subscribes the table to its state changes.
+
+        Args:
+            key: The package ID.
+            value (Package): The package.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1) amortized
+            space complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1) amortized
+        """
+        value.package_table = self
+        super().add(key, value)
+
+    def update(self, key, value: Package) -> None:
+        """
+        Updates a package in the table and subscribes the table to its state changes.
+
+        Args:
+            key: The package ID.
+            value (Package): The package.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        value.package_table = self
+        super().update(key, value)
+
+    def add_many(self, items) -> None:
+        """
+        Adds many packages to the table in one pass and subscribes the table to their state changes.
+
+        Args:
+            items (iterable): The package ID and package pairs to add.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(k)
+                worst case: O(n + k log k)
+                average case: O(n + k)
+            space complexity:
+                best case: O(k)
+                worst case: O(n + k)
+                average case: O(k)
+        """
+        items = list(items)
+
+        for _, value in items:  # O(k) - for loop
+            value.package_table = self
+
+        super().add_many(items)
+
+    def update_many(self, items) -> None:
+        """
+        Updates many packages in the table in one pass and subscribes the table to their state changes.
+
+        Args:
+            items (iterable): The package ID and package pairs to update.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(k)
+                worst case: O(n + k)
+                average case: O(k)
+            space complexity:
+                best case: O(k)
+                worst case: O(k)
+                average case: O(k)
+        """
+        items = list(items)
+
+        for _, value in items:  # O(k) - for loop
+            value.package_table = self
+
+        super().update_many(items)
+
+    def snapshot(self, time: int) -> package_history.Snapshot:
+        """
+        Gets a read-only snapshot of every package as it was at the given time.
+
+        Args:
+            time (int): The time to get the snapshot at.
+
+        Returns:
+            package_history.Snapshot: The packages as they were at the given time.
+
+        Notes:
+            time complexity:
+                best case: O(log n)
+                worst case: O(n log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(1)
+                worst case: O(n log n)
+                average case: O(1)
+        """
+        return self.history.snapshot(time, self)  # O(log n) - function call
+
+    def _index(self, key, value: Package) -> None:
+        """
+        Records the package in every secondary index and its change in the history.
+
+        Args:
+            key: The package ID.
+            value (Package): The package.
+
+        Returns:
+            None
+        """
+        super()._index(key, value)
+        self.history.record(key, value)
+
+
 def get_package_ids_with_address_id(
     address_id: int,
-    packages: hash_table.HashTable(),
+    packages: PackageTable,
 ) -> [int]:
     """
     This function returns a list of package ids whose address matches the address id.
 
     Args:
         address_id (int): id of the address to match.
-        packages (list): list of packages to search through.
+        packages (PackageTable): package table to search through.
 
     Returns:
         [int]: list of package ids that match the address id.
 
     Notes:
         time complexity:
-            best case: O(n)
-            worst case: O(n)
-            average case: O(n)
+            best case: O(1)
+            worst case: O(k log k)
+            average case: O(k log k)
         space complexity:
-            best case: O(n)
-            worst case: O(n)
-            average case: O(n)
+            best case: O(1)
+            worst case: O(k)
+            average case: O(k)
     """
-    item_values = [i[1] for i in packages]  # O(n) - list comprehension
-
-    # Search for the address id in the packages and return the package id if found
-    matching_packages = []
-    for i in item_values:  # O(n) - for loop
-        if i.address == address_id:
-            matching_packages.append(i.id)
-
-    return matching_packages
+    # Look up the package ids in the address id index
+    return packages.lookup("address_id", address_id)  # O(k log k) - index lookup
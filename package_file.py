@@ -0,0 +1,475 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+
+import distance_file
+import hash_table
+import package
+import package_history
+import package_store
+
+# The first bytes of every package table file
+magic = b"PKGTBL02"
+
+# The magic bytes, the number of records, the number of strings and the hash of the inputs the packages came from
+header_struct = struct.Struct("<8sII32s")
+
+# One fixed-width record per package with the columns of package_store.column_types in order
+record_struct = struct.Struct(
+    "<" + "".join(typecode for typecode, kind in package_store.column_types.values())
+)
+
+# The offset of each string in the string heap, plus the end of the heap
+offset_struct = struct.Struct("<Q")
+
+
+def input_hash(files: [str], settings: list) -> bytes:
+    """
+    Returns the SHA-256 hash of the inputs of a run: the contents of every file it reads and the settings that affect
+    its results. Files given as None are hashed as empty.
+
+    Args:
+        files ([str]): The paths of the files the run reads.
+        settings (list): The values of the settings that affect the results of the run.
+
+    Returns:
+        bytes: The 32-byte hash of the inputs.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    digest = hashlib.sha256()
+
+    for i in files:  # O(f) - for loop
+        if i is None:
+            digest.update(bytes(32))
+        else:
+            digest.update(bytes.fromhex(distance_file.content_hash(i)))  # O(n) - function call
+
+    digest.update(repr(settings).encode("utf-8"))
+
+    return digest.digest()
+
+
+def dump(packages, file: str, inputs: bytes = bytes(32)) -> None:
+    """
+    Writes the packages to a package table file: a header, one fixed-width record per package in ascending package ID
+    order, an offset table for the distinct strings and the UTF-8 string heap the offsets point into. The file is
+    written next to its final path and moved into place, so a reader never maps a half-written file.
+
+    Args:
+        packages: The package store to write, such as a package.PackageTable.
+        file (str): The path of the file to write.
+        inputs (bytes): The hash of the inputs the packages came from, such as from input_hash. Defaults to zeros.
+
+    Returns:
+        None
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    # Encode the packages into columns with interned strings
+    if isinstance(packages, package_store.ColumnarPackageStore):
+        store = packages
+    else:
+        store = package_store.ColumnarPackageStore()
+        store.add_many(packages.items())  # O(n) - function call
+
+    names = list(package_store.column_types)
+    string_columns = {
+        i for i in names if package_store.column_types[i][1] == "string"
+    }
+    strings = [
+        b"" if i is None else i.encode("utf-8") for i in store.strings.strings
+    ]  # O(n) - list comprehension
+
+    temporary_file = file + ".tmp"
+
+    with open(temporary_file, "wb") as file_open:
+        file_open.write(header_struct.pack(magic, len(store), len(strings), inputs))
+
+        for key in store.ordered_keys:  # O(n) - for loop
+            row = store.rows.get(key)  # O(1) - hash table get
+            values = []
+            for name in names:  # O(1) - for loop
+                value = store.columns[name][row]
+                # Record missing strings as -1 rather than as an empty string
+                if name in string_columns and store.strings[value] is None:
+                    value = -1
+                values.append(value)
+            file_open.write(record_struct.pack(*values))
+
+        offset = 0
+        for i in strings:  # O(n) - for loop
+            file_open.write(offset_struct.pack(offset))
+            offset += len(i)
+        file_open.write(offset_struct.pack(offset))
+
+        for i in strings:  # O(n) - for loop
+            file_open.write(i)
+
+    os.replace(temporary_file, file)
+
+
+def open_saved(file: str, inputs: bytes):
+    """
+    Opens the package table file saved by an earlier run, if that run had the same inputs.
+
+    Args:
+        file (str): The path of the package table file.
+        inputs (bytes): The hash of the inputs of this run, such as from input_hash.
+
+    Returns:
+        MappedPackageTable or None: The mapped package table, or None if the file is missing, not a package table
+            file, or saved by a run with different inputs.
+
+    Notes:
+        time complexity: O(1)
+        space complexity: O(1)
+    """
+    if not os.path.exists(file):
+        return None
+
+    try:
+        table = MappedPackageTable(file)
+    except (ValueError, struct.error):
+        return None
+
+    if table.inputs != inputs:
+        table.close()
+        return None
+
+    return table
+
+
+class MappedPackageTable:
+    """
+    A read-only package table backed by a memory-mapped package table file. Opening the table maps the file and reads
+    only its header, and each lookup decodes only the record and strings it needs, so the operating system pages in
+    only the parts of the file that are used. Packages are returned as immutable package_history.PackageVersion
+    records.
+
+    Args:
+        file (str): The path of the package table file.
+
+    Attributes:
+        file (str): The path of the package table file.
+        record_count (int): The number of packages in the file.
+        string_count (int): The number of distinct strings in the file.
+        inputs (bytes): The hash of the inputs the packages came from.
+        dense (bool): Whether the package IDs are consecutive, so a record is found by its ID without a search.
+        indexes (dict): The secondary indexes of the table by name, built on first use.
+        history (package_history.PackageHistory): The point-in-time versions of the packages in the table.
+    """
+
+    def __init__(self, file: str):
+        """
+        Opens and maps a package table file.
+
+        Args:
+            file (str): The path of the package table file.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        self.file = file
+        self.file_open = open(file, "rb")
+        self.map = mmap.mmap(self.file_open.fileno(), 0, access=mmap.ACCESS_READ)
+
+        file_magic, self.record_count, self.string_count, self.inputs = header_struct.unpack_from(
+            self.map, 0
+        )
+        if file_magic != magic:
+            self.close()
+            raise ValueError(f"{file} is not a package table file.")
+
+        self.records_offset = header_struct.size
+        self.offsets_offset = self.records_offset + self.record_count * record_struct.size
+        self.heap_offset = self.offsets_offset + (self.string_count + 1) * offset_struct.size
+        self.id_offset = 0
+
+        self.dense = self.record_count == 0 or (
+            self._id_at(self.record_count - 1) - self._id_at(0) == self.record_count - 1
+        )
+        if self.record_count > 0:
+            self.id_offset = self._id_at(0)
+
+        self.indexes = {}
+        self.history = package_history.PackageHistory()
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the package table file.
+
+        Returns:
+            None
+        """
+        self.map.close()
+        self.file_open.close()
+
+    def __enter__(self):
+        """Returns the table for use in a with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Closes the table at the end of a with statement."""
+        self.close()
+
+    def _id_at(self, position: int) -> int:
+        """
+        Reads the package ID of the record at the given position.
+
+        Args:
+            position (int): The position of the record.
+
+        Returns:
+            int: The package ID.
+        """
+        return struct.unpack_from(
+            "<q", self.map, self.records_offset + position * record_struct.size
+        )[0]
+
+    def _string(self, position: int) -> str or None:
+        """
+        Reads the string at the given position of the string table.
+
+        Args:
+            position (int): The position of the string, or -1 for a missing string.
+
+        Returns:
+            str or None: The string.
+        """
+        if position == -1:
+            return None
+
+        start, end = struct.unpack_from(
+            "<QQ", self.map, self.offsets_offset + position * offset_struct.size
+        )
+        return self.map[self.heap_offset + start:self.heap_offset + end].decode("utf-8")
+
+    def _find(self, key) -> int:
+        """
+        Finds the position of the record of the given package ID.
+
+        Args:
+            key: The package ID.
+
+        Returns:
+            int: The position of the record, or -1 if the package is not in the table.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(log n)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        if not isinstance(key, int) or self.record_count == 0:
+            return -1
+
+        if self.dense:
+            position = key - self.id_offset
+            return position if 0 <= position < self.record_count else -1
+
+        # Binary search the records, which are in ascending package ID order
+        low, high = 0, self.record_count
+        while low < high:  # O(log n) - binary search
+            middle = (low + high) // 2
+            if self._id_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.record_count and self._id_at(low) == key:
+            return low
+
+        return -1
+
+    def _read(self, position: int) -> package_history.PackageVersion:
+        """
+        Decodes the record at the given position.
+
+        Args:
+            position (int): The position of the record.
+
+        Returns:
+            package_history.PackageVersion: The package.
+        """
+        values = record_struct.unpack_from(
+            self.map, self.records_offset + position * record_struct.size
+        )
+        fields = {}
+
+        for name, value in zip(package_store.column_types, values):  # O(1) - for loop
+            kind = package_store.column_types[name][1]
+
+            if kind == "string":
+                fields[name] = self._string(value)
+            elif kind == "status":
+                fields[name] = package_store.statuses[value]
+            elif kind == "optional_int":
+                fields[name] = None if value == -1 else value
+            else:
+                fields[name] = value
+
+        return package_history.PackageVersion(**fields)
+
+    def get(self, key) -> package_history.PackageVersion or None:
+        """
+        Gets the package with the given ID.
+
+        Args:
+            key: The package ID.
+
+        Returns:
+            package_history.PackageVersion or None: The package, or None if the package is not in the table.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(log n)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        position = self._find(key)  # O(1) - function call
+
+        if position == -1:
+            return None
+
+        return self._read(position)
+
+    def get_many(self, keys) -> [package_history.PackageVersion]:
+        """
+        Gets the packages with the given IDs.
+
+        Args:
+            keys (iterable): The package IDs.
+
+        Returns:
+            list: Each package, or None for IDs that are not in the table.
+        """
+        return [self.get(i) for i in keys]  # O(k) - list comprehension
+
+    def items(self):
+        """
+        Yields the package IDs and packages in ascending package ID order.
+
+        Yields:
+            tuple: A package ID and its package.
+        """
+        for i in range(self.record_count):  # O(n) - for loop
+            value = self._read(i)
+            yield value.id, value
+
+    def range(self, low, high):
+        """
+        Yields the package IDs at least low and less than high and their packages in ascending order.
+
+        Args:
+            low: The smallest package ID to yield.
+            high: The package ID to stop before.
+
+        Yields:
+            tuple: A package ID and its package.
+        """
+        start = bisect.bisect_left(
+            range(self.record_count), low, key=self._id_at
+        )  # O(log n) - binary search
+
+        for i in range(start, self.record_count):  # O(k) - for loop
+            value = self._read(i)
+            if value.id >= high:
+                return
+            yield value.id, value
+
+    def get_all(self) -> []:
+        """
+        Gets all the package IDs and packages.
+
+        Returns:
+            list: A list of package ID and package pairs, sorted by package ID.
+        """
+        return list(self.items())
+
+    def lookup(self, name: str, value) -> [any]:
+        """
+        Gets the package IDs with the given indexed value in the named secondary index, building the index on first
+        use.
+
+        Args:
+            name (str): The name of the index, one of package.package_indexes.
+            value: The indexed value to look up.
+
+        Returns:
+            list: The package IDs with the given indexed value, sorted.
+        """
+        if name not in package.package_indexes:
+            raise KeyError(f"Package table has no index named {name}.")
+
+        if name not in self.indexes:
+            index = hash_table.SecondaryIndex(package.package_indexes[name])
+            for key, package_version in self.items():  # O(n) - for loop
+                index.insert(key, package_version)
+            self.indexes[name] = index
+
+        return self.indexes[name].lookup(value)  # O(k log k) - function call
+
+    def snapshot(self, time) -> package_history.Snapshot:
+        """
+        Gets a read-only snapshot of every package as it was at the given time.
+
+        Args:
+            time (int): The time to get the snapshot at, in seconds since midnight.
+
+        Returns:
+            package_history.Snapshot: The packages as they were at the given time.
+        """
+        return self.history.snapshot(time, self)  # O(log n) - function call
+
+    def __len__(self) -> int:
+        """Returns the number of packages in the table."""
+        return self.record_count
+
+    def __iter__(self):
+        """Iterates over the package IDs in ascending order."""
+        return (self._id_at(i) for i in range(self.record_count))
@@ -0,0 +1,600 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import bisect
+import collections
+
+import delivery_time_calculator
+
+# The attributes of a package, in the order they are stored in a package version
+package_fields = [
+    "id",
+    "address_id",
+    "address_name",
+    "address",
+    "city",
+    "state",
+    "zip",
+    "delivery_deadline",
+    "weight_kilo",
+    "special_notes",
+    "delivery_status",
+    "truck_id",
+    "arrival_time",
+    "load_time",
+    "departure_time",
+    "delivery_time",
+    "modified_time",
+    "old_address_id",
+    "old_address_name",
+    "old_address",
+]
+
+
+class PackageVersion(collections.namedtuple("PackageVersion", package_fields)):
+    """An immutable record of a package as it was at a point in time, with the same attributes as package.Package."""
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        """Returns the string representation of the package version."""
+        return (
+            f"Package ID: {self.id}\n"
+            f"Address ID: {self.address_id}\n"
+            f"City: {self.city}\n"
+            f"State: {self.state}\n"
+            f"Zip: {self.zip}\n"
+            f"Delivery Deadline: {self.delivery_deadline}\n"
+            f"Weight: {self.weight_kilo} kilos\n"
+            f"Special Notes: {self.special_notes}\n"
+            f"Delivery Status: {self.delivery_status}\n"
+            f"Truck ID: {self.truck_id}\n"
+            f"Arrival Time: {delivery_time_calculator.to_time(self.arrival_time)}\n"
+            f"Load Time: {delivery_time_calculator.to_time(self.load_time)}\n"
+            f"Departure Time: {delivery_time_calculator.to_time(self.departure_time)}\n"
+            f"Delivery Time: {delivery_time_calculator.to_time(self.delivery_time)}\n"
+        )
+
+
+class PersistentVector:
+    """
+    An immutable vector stored as a tree of 32-wide tuples. Setting a value copies only the path from the root to the
+    value and shares every other node with the previous vector, so each version costs O(log n) new nodes.
+
+    Attributes:
+        root (tuple): The root node of the tree.
+        size (int): The number of values in the vector.
+        shift (int): The number of index bits below the root node.
+    """
+
+    bits = 5
+    width = 1 << bits
+    mask = width - 1
+
+    def __init__(self, root: tuple, size: int, shift: int):
+        """
+        Initializes a vector from the root node of its tree.
+
+        Args:
+            root (tuple): The root node of the tree.
+            size (int): The number of values in the vector.
+            shift (int): The number of index bits below the root node.
+        """
+        self.root = root
+        self.size = size
+        self.shift = shift
+
+    @classmethod
+    def from_list(cls, values: list):
+        """
+        Builds a vector holding the given values.
+
+        Args:
+            values (list): The values of the vector.
+
+        Returns:
+            PersistentVector: The vector.
+
+        Notes:
+            time complexity:
+                best case: O(n)
+                worst case: O(n)
+                average case: O(n)
+            space complexity:
+                best case: O(n)
+                worst case: O(n)
+                average case: O(n)
+        """
+        nodes = [
+            tuple(values[i:i + cls.width]) for i in range(0, len(values), cls.width)
+        ]  # O(n) - list comprehension
+        shift = 0
+
+        # Group the nodes of each level under parent nodes until a single root is left
+        while len(nodes) > 1:  # O(log n) - while loop
+            nodes = [
+                tuple(nodes[i:i + cls.width]) for i in range(0, len(nodes), cls.width)
+            ]
+            shift += cls.bits
+
+        return cls(nodes[0] if len(nodes) > 0 else (), len(values), shift)
+
+    def get(self, index: int):
+        """
+        Gets the value at the given index.
+
+        Args:
+            index (int): The index of the value.
+
+        Returns:
+            any: The value.
+
+        Notes:
+            time complexity:
+                best case: O(log n)
+                worst case: O(log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        node = self.root
+        level = self.shift
+
+        while level > 0:  # O(log n) - while loop
+            node = node[(index >> level) & self.mask]
+            level -= self.bits
+
+        return node[index & self.mask]
+
+    def set(self, index: int, value):
+        """
+        Returns a new vector with the value at the given index replaced, sharing every untouched node with this one.
+
+        Args:
+            index (int): The index of the value.
+            value: The new value.
+
+        Returns:
+            PersistentVector: The new vector.
+
+        Notes:
+            time complexity:
+                best case: O(log n)
+                worst case: O(log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(log n)
+                worst case: O(log n)
+                average case: O(log n)
+        """
+        return PersistentVector(
+            self._set(self.root, self.shift, index, value), self.size, self.shift
+        )
+
+    def _set(self, node: tuple, level: int, index: int, value) -> tuple:
+        """
+        Copies the path to the index below the given node with the value replaced.
+
+        Args:
+            node (tuple): The node to copy.
+            level (int): The number of index bits below the node.
+            index (int): The index of the value.
+            value: The new value.
+
+        Returns:
+            tuple: The copied node.
+        """
+        position = (index >> level) & self.mask
+
+        if level == 0:
+            child = value
+        else:
+            child = self._set(node[position], level - self.bits, index, value)
+
+        return node[:position] + (child,) + node[position + 1:]
+
+    def __iter__(self):
+        """Iterates over the values of the vector in index order."""
+        return self._iterate(self.root, self.shift)
+
+    def _iterate(self, node: tuple, level: int):
+        """
+        Yields the values below the given node in index order.
+
+        Args:
+            node (tuple): The node to iterate over.
+            level (int): The number of index bits below the node.
+
+        Yields:
+            any: A value of the vector.
+        """
+        if level == 0:
+            yield from node
+        else:
+            for i in node:
+                yield from self._iterate(i, level - self.bits)
+
+    def __len__(self) -> int:
+        """Returns the number of values in the vector."""
+        return self.size
+
+
+class Snapshot:
+    """
+    A read-only view of every package as it was at a point in time.
+
+    Attributes:
+        vector (PersistentVector): The package versions at that time, in ascending package ID order.
+        positions (dict): The position of each package ID in the vector.
+    """
+
+    def __init__(self, vector: PersistentVector, positions: dict):
+        """
+        Initializes a snapshot from a version of the package vector.
+
+        Args:
+            vector (PersistentVector): The package versions at that time, in ascending package ID order.
+            positions (dict): The position of each package ID in the vector.
+        """
+        self.vector = vector
+        self.positions = positions
+
+    def get(self, key) -> PackageVersion or None:
+        """
+        Gets the version of the package with the given ID.
+
+        Args:
+            key: The package ID.
+
+        Returns:
+            PackageVersion or None: The package version, or None if the package is not in the snapshot.
+        """
+        if key not in self.positions:
+            return None
+
+        return self.vector.get(self.positions[key])  # O(log n) - vector get
+
+    def items(self):
+        """
+        Yields the package IDs and package versions in ascending package ID order.
+
+        Yields:
+            tuple: A package ID and its package version.
+        """
+        for i in self.vector:  # O(n) - for loop
+            yield i.id, i
+
+    def get_all(self) -> []:
+        """
+        Gets all the package IDs and package versions.
+
+        Returns:
+            list: A list of package ID and package version pairs, sorted by package ID.
+        """
+        return list(self.items())
+
+    def __iter__(self):
+        """Iterates over the package IDs in ascending order."""
+        return (i.id for i in self.vector)
+
+    def __len__(self) -> int:
+        """Returns the number of packages in the snapshot."""
+        return len(self.vector)
+
+
+class PackageHistory:
+    """
+    The point-in-time versions of a package store. Every arrival, load, departure, delivery and address correction of
+    a package is an event, and each event produces a new version of the package vector sharing structure with the
+    version before it. Versions are ordered by the time of their event, so they can be read by binary search on time.
+
+    An event recorded after every event before it in time is applied to the latest version as it happens, copying only
+    the path to the package. The simulation drives one truck at a time, so it also records events earlier than ones it
+    already recorded. Such an event, a new package, or a change to an earlier event marks the versions stale instead,
+    and they are rebuilt once from the store at the next snapshot.
+
+    Attributes:
+        stale (bool): Whether the store changed in a way the versions were not updated for.
+        times (list): The time of each version, in ascending order.
+        versions (list): The package vector of each version.
+        base (Snapshot): The snapshot before the first event.
+        positions (dict): The position of each package ID in the package vectors.
+        recorded (dict): The fields no event changes and the event times of each package ID, as of its last version.
+        last_event (tuple): The time, kind and position of the event of the latest version.
+    """
+
+    # The events of a package in the order they are applied when they happen at the same time
+    event_kinds = ["arrival", "load", "departure", "delivery", "address"]
+
+    # The fields of a package that its events change
+    event_fields = [
+        "address_id",
+        "address_name",
+        "address",
+        "delivery_status",
+        "truck_id",
+        "arrival_time",
+        "load_time",
+        "departure_time",
+        "delivery_time",
+        "modified_time",
+    ]
+
+    def __init__(self):
+        """Initializes an empty, stale package history."""
+        self.stale = True
+        self.times = []
+        self.versions = []
+        self.base = None
+        self.positions = {}
+        self.recorded = {}
+        self.last_event = None
+
+    def invalidate(self) -> None:
+        """
+        Marks the versions as stale after the package store changed.
+
+        Returns:
+            None
+        """
+        self.stale = True
+
+    @staticmethod
+    def _base_record(value) -> PackageVersion:
+        """
+        Returns the record of a package before its first event: not available and at its original address.
+
+        Args:
+            value: The package.
+
+        Returns:
+            PackageVersion: The record of the package.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        return PackageVersion(*(getattr(value, i) for i in package_fields))._replace(
+            delivery_status="Not Available",
+            address_id=value.old_address_id,
+            address_name=value.old_address_name,
+            address=value.old_address,
+        )
+
+    @classmethod
+    def _static_fields(cls, value) -> tuple:
+        """
+        Returns the fields of a package that none of its events change.
+
+        Args:
+            value: The package.
+
+        Returns:
+            tuple: The fields of the package.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        return tuple(getattr(value, i) for i in package_fields if i not in cls.event_fields)
+
+    @staticmethod
+    def _event_times(value) -> tuple:
+        """
+        Returns the time of each event of a package, in the order of event_kinds, or None for events not yet happened.
+
+        Args:
+            value: The package.
+
+        Returns:
+            tuple: The time of each event.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        return (
+            value.arrival_time,
+            value.load_time,
+            value.departure_time,
+            value.delivery_time,
+            value.modified_time,
+        )
+
+    def _apply(self, vector: PersistentVector, kind: int, position: int, value) -> PersistentVector:
+        """
+        Returns the package vector after an event of a package, sharing every other package with the vector before it.
+
+        Args:
+            vector (PersistentVector): The package vector before the event.
+            kind (int): The kind of the event, as an index of event_kinds.
+            position (int): The position of the package in the vector.
+            value: The package.
+
+        Returns:
+            PersistentVector: The package vector after the event.
+
+        Notes:
+            time complexity: O(log n)
+            space complexity: O(log n)
+        """
+        # Every version after the event has the times and truck of the package as of the event
+        record = vector.get(position)._replace(
+            truck_id=value.truck_id,
+            arrival_time=value.arrival_time,
+            load_time=value.load_time,
+            departure_time=value.departure_time,
+            delivery_time=value.delivery_time,
+            modified_time=value.modified_time,
+        )  # O(log n) - vector get
+        kind_name = self.event_kinds[kind]
+
+        if kind_name == "address":
+            record = record._replace(
+                address_id=value.address_id,
+                address_name=value.address_name,
+                address=value.address,
+            )
+        elif kind_name == "departure":
+            record = record._replace(delivery_status="En Route")
+        elif kind_name == "delivery":
+            record = record._replace(delivery_status="Delivered")
+        else:
+            record = record._replace(delivery_status="At Hub")
+
+        return vector.set(position, record)  # O(log n) - vector set
+
+    def record(self, key, value) -> None:
+        """
+        Records a change of a package. The new events of the package are applied to the latest version as they happen
+        when none of them is earlier than the event of the latest version, and the versions are marked stale
+        otherwise.
+
+        Args:
+            key: The package ID.
+            value: The package after the change.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(1)
+                worst case: O(log n)
+                average case: O(log n)
+        """
+        if self.stale:
+            return
+
+        if key not in self.positions:
+            self.stale = True
+            return
+
+        static_fields, recorded_times = self.recorded[key]
+        event_times = self._event_times(value)
+        if event_times == recorded_times:
+            return
+
+        changed = [
+            i for i in range(len(self.event_kinds)) if event_times[i] != recorded_times[i]
+        ]  # O(1) - list comprehension
+        position = self.positions[key]
+        events = [(event_times[i], i, position) for i in changed]
+
+        # Only new events after the latest version can be applied to it
+        if (
+            any(recorded_times[i] is not None or event_times[i] is None for i in changed)
+            or (self.last_event is not None and min(events) < self.last_event)
+            or self._static_fields(value) != static_fields
+        ):
+            self.stale = True
+            return
+
+        vector = self.versions[-1] if len(self.versions) > 0 else self.base.vector
+        for event in sorted(events):  # O(1) - for loop
+            vector = self._apply(vector, event[1], position, value)  # O(log n) - function call
+            self.times.append(event[0])
+            self.versions.append(vector)
+            self.last_event = event
+
+        self.recorded[key] = (static_fields, event_times)
+
+    def rebuild(self, packages) -> None:
+        """
+        Builds every version of the package vector from the current packages in the store.
+
+        Args:
+            packages (iterable): The package ID and package pairs of the store, in ascending package ID order.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(n log n)
+                worst case: O(n log n)
+                average case: O(n log n)
+            space complexity:
+                best case: O(n log n)
+                worst case: O(n log n)
+                average case: O(n log n)
+        """
+        records = []
+        events = []
+        self.positions = {}
+        self.recorded = {}
+
+        for key, value in packages:  # O(n) - for loop
+            position = len(records)
+            self.positions[key] = position
+
+            base_record = self._base_record(value)
+            event_times = self._event_times(value)
+            records.append(base_record)
+            self.recorded[key] = (self._static_fields(value), event_times)
+
+            for kind in range(len(self.event_kinds)):  # O(1) - for loop
+                if event_times[kind] is not None:
+                    events.append((event_times[kind], kind, position, value))
+
+        events.sort(key=lambda x: (x[0], x[1], x[2]))  # O(n log n) - sort
+
+        vector = PersistentVector.from_list(records)  # O(n) - function call
+        self.base = Snapshot(vector, self.positions)
+        self.times = []
+        self.versions = []
+        self.last_event = None
+
+        for time, kind, position, value in events:  # O(n) - for loop
+            vector = self._apply(vector, kind, position, value)  # O(log n) - function call
+            self.times.append(time)
+            self.versions.append(vector)
+            self.last_event = (time, kind, position)
+
+        self.stale = False
+
+    def snapshot(self, time: int, packages) -> Snapshot:
+        """
+        Gets the snapshot of the packages at the given time, rebuilding the versions first if the store changed.
+
+        Args:
+            time (int): The time to get the snapshot at, in seconds since midnight.
+            packages: The package store, read only if the versions are stale.
+
+        Returns:
+            Snapshot: The packages as they were at the given time.
+
+        Notes:
+            time complexity:
+                best case: O(log n)
+                worst case: O(n log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(1)
+                worst case: O(n log n)
+                average case: O(1)
+        """
+        if self.stale:
+            self.rebuild(packages.items())  # O(n log n) - function call
+
+        # Find the last version whose event happened at or before the time
+        version = bisect.bisect_right(self.times, time)  # O(log n) - binary search
+
+        if version == 0:
+            return self.base
+
+        return Snapshot(self.versions[version - 1], self.positions)
@@ -0,0 +1,518 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import array
+import bisect
+
+import hash_table
+import package
+import package_history
+
+# The delivery statuses a package can have, stored in the status column by their position in this list
+statuses = [None, "Not Available", "At Hub", "En Route", "Delivered"]
+
+# The array type code and kind of value stored in each column of the package store
+column_types = {
+    "id": ("q", "int"),
+    "address_id": ("q", "int"),
+    "address_name": ("i", "string"),
+    "address": ("i", "string"),
+    "city": ("i", "string"),
+    "state": ("i", "string"),
+    "zip": ("i", "string"),
+    "delivery_deadline": ("i", "string"),
+    "weight_kilo": ("q", "int"),
+    "special_notes": ("i", "string"),
+    "delivery_status": ("b", "status"),
+    "truck_id": ("q", "optional_int"),
+    "arrival_time": ("i", "optional_int"),
+    "load_time": ("i", "optional_int"),
+    "departure_time": ("i", "optional_int"),
+    "delivery_time": ("i", "optional_int"),
+    "modified_time": ("i", "optional_int"),
+    "old_address_id": ("q", "int"),
+    "old_address_name": ("i", "string"),
+    "old_address": ("i", "string"),
+}
+
+
+class StringPool:
+    """
+    Stores each distinct string once and refers to it by its position in the pool.
+
+    Attributes:
+        strings (list): The distinct strings in the pool.
+        positions (dict): The position of each string in the pool.
+    """
+
+    def __init__(self):
+        """Initializes an empty string pool."""
+        self.strings = []
+        self.positions = {}
+
+    def intern(self, value: str) -> int:
+        """
+        Gets the position of the string in the pool, adding the string if it is not in the pool yet.
+
+        Args:
+            value (str): The string to intern.
+
+        Returns:
+            int: The position of the string in the pool.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        if value not in self.positions:
+            self.positions[value] = len(self.strings)
+            self.strings.append(value)
+
+        return self.positions[value]
+
+    def __getitem__(self, position: int) -> str:
+        """
+        Gets the string at the given position in the pool.
+
+        Args:
+            position (int): The position of the string.
+
+        Returns:
+            str: The string.
+        """
+        return self.strings[position]
+
+    def __len__(self) -> int:
+        """Returns the number of distinct strings in the pool."""
+        return len(self.strings)
+
+
+class PackageRow:
+    """
+    A view of one row of a columnar package store. Reading or setting an attribute reads or writes the column of the
+    row, and the state transition methods are the same as those of package.Package, so a row can be used wherever a
+    Package is expected.
+
+    Attributes:
+        store (ColumnarPackageStore): The package store holding the row.
+        row (int): The position of the row in the columns of the store.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row: int):
+        """
+        Initializes a view of a row of a columnar package store.
+
+        Args:
+            store (ColumnarPackageStore): The package store holding the row.
+            row (int): The position of the row in the columns of the store.
+        """
+        self.store = store
+        self.row = row
+
+    @property
+    def package_table(self):
+        """The package store holding the row, which is notified of state changes."""
+        return self.store
+
+    update_address = package.Package.update_address
+    update_delivery_status = package.Package.update_delivery_status
+    set_arrival_time = package.Package.set_arrival_time
+    load_package = package.Package.load_package
+    package_departure = package.Package.package_departure
+    deliver_package = package.Package.deliver_package
+    _notify = package.Package._notify
+    __str__ = package.Package.__str__
+
+
+def _column_property(name: str) -> property:
+    """
+    Builds a property of PackageRow that reads and writes the named column of the row.
+
+    Args:
+        name (str): The name of the column.
+
+    Returns:
+        property: The property reading and writing the column.
+    """
+
+    def get_value(self: PackageRow):
+        return self.store.decode(name, self.store.columns[name][self.row])
+
+    def set_value(self: PackageRow, value) -> None:
+        self.store.columns[name][self.row] = self.store.encode(name, value)
+
+    return property(get_value, set_value)
+
+
+for column_name in column_types:
+    setattr(PackageRow, column_name, _column_property(column_name))
+
+
+class ColumnarPackageStore:
+    """
+    A package store keeping each package attribute in its own typed array instead of one object per package. Numbers
+    are stored in integer arrays, times as seconds since midnight, delivery statuses as small integer codes and strings
+    as positions in a shared string pool, so each distinct city, state, zip code or note is stored once. Packages are
+    read and updated through PackageRow views, and the store keeps the same secondary indexes as package.PackageTable.
+
+    Attributes:
+        columns (dict): The array of values of each column, by column name.
+        strings (StringPool): The pool of the strings referred to by the string columns.
+        rows (hash_table.DirectAddressHashTable): The row position of each package ID.
+        ordered_keys (list): The package IDs in ascending order.
+        indexes (dict): The secondary indexes of the store by name.
+        history (package_history.PackageHistory): The point-in-time versions of the packages in the store.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty columnar package store with its secondary indexes and history.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        self.columns = {}
+        for name, (typecode, _) in column_types.items():  # O(1) - for loop
+            self.columns[name] = array.array(typecode)
+
+        self.strings = StringPool()
+        self.rows = hash_table.DirectAddressHashTable()
+        self.ordered_keys = []
+        self.indexes = {}
+        self.history = package_history.PackageHistory()
+
+        for name, key_function in package.package_indexes.items():  # O(1) - for loop
+            self.indexes[name] = hash_table.SecondaryIndex(key_function)
+
+    def encode(self, name: str, value) -> int:
+        """
+        Converts an attribute value to the integer stored in its column.
+
+        Args:
+            name (str): The name of the column.
+            value: The attribute value.
+
+        Returns:
+            int: The value to store in the column.
+        """
+        kind = column_types[name][1]
+
+        if kind == "string":
+            return self.strings.intern(value)
+        elif kind == "status":
+            return statuses.index(value)
+        elif kind == "optional_int":
+            return -1 if value is None else value
+
+        return value
+
+    def decode(self, name: str, value: int):
+        """
+        Converts the integer stored in a column back to its attribute value.
+
+        Args:
+            name (str): The name of the column.
+            value (int): The value stored in the column.
+
+        Returns:
+            any: The attribute value.
+        """
+        kind = column_types[name][1]
+
+        if kind == "string":
+            return self.strings[value]
+        elif kind == "status":
+            return statuses[value]
+        elif kind == "optional_int":
+            return None if value == -1 else value
+
+        return value
+
+    def get(self, key) -> PackageRow or None:
+        """
+        Gets a view of the package with the given ID.
+
+        Args:
+            key: The package ID.
+
+        Returns:
+            PackageRow or None: A view of the package, or None if the package is not in the store.
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        row = self.rows.get(key)  # O(1) - hash table get
+
+        if row is None:
+            return None
+
+        return PackageRow(self, row)
+
+    def get_many(self, keys) -> [PackageRow]:
+        """
+        Gets views of the packages with the given IDs.
+
+        Args:
+            keys (iterable): The package IDs.
+
+        Returns:
+            list: A view of each package, or None for IDs that are not in the store.
+        """
+        return [
+            None if i is None else PackageRow(self, i)
+            for i in self.rows.get_many(keys)  # O(k) - batch get
+        ]
+
+    def get_all(self) -> []:
+        """
+        Gets all the package IDs and views of their packages.
+
+        Returns:
+            list: A list of package ID and package view pairs, sorted by package ID.
+        """
+        return list(self.items())  # O(n) - function call
+
+    def items(self):
+        """
+        Yields the package IDs and views of their packages in ascending package ID order.
+
+        Yields:
+            tuple: A package ID and a view of its package.
+        """
+        for key in self.ordered_keys:  # O(n) - for loop
+            yield key, self.get(key)  # O(1) - hash table get
+
+    def range(self, low, high):
+        """
+        Yields the package IDs at least low and less than high and views of their packages in ascending order.
+
+        Args:
+            low: The smallest package ID to yield.
+            high: The package ID to stop before.
+
+        Yields:
+            tuple: A package ID and a view of its package.
+        """
+        start = bisect.bisect_left(self.ordered_keys, low)  # O(log n) - binary search
+        end = bisect.bisect_left(self.ordered_keys, high)  # O(log n) - binary search
+
+        for i in range(start, end):  # O(k) - for loop
+            key = self.ordered_keys[i]
+            yield key, self.get(key)  # O(1) - hash table get
+
+    def add(self, key, value) -> None:
+        """
+        Copies a package into the store, appending a row for a new package ID or overwriting the row of an existing one.
+
+        Args:
+            key: The package ID.
+            value: The package to copy.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1) amortized
+            space complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1) amortized
+        """
+        row = self.rows.get(key)  # O(1) - hash table get
+
+        if row is None:
+            row = len(self.columns["id"])
+            for name, column in self.columns.items():  # O(1) - for loop
+                column.append(self.encode(name, getattr(value, name)))
+
+            self.rows.add(key, row)  # O(1) - hash table add
+
+            if len(self.ordered_keys) == 0 or self.ordered_keys[-1] < key:
+                self.ordered_keys.append(key)
+            else:
+                bisect.insort(self.ordered_keys, key)  # O(n) - insertion into the sorted keys
+        else:
+            self._write(row, value)
+
+        self._index(key, PackageRow(self, row))
+
+    def add_many(self, items) -> None:
+        """
+        Copies many packages into the store.
+
+        Args:
+            items (iterable): The package ID and package pairs to copy.
+
+        Returns:
+            None
+        """
+        for key, value in items:  # O(k) - for loop
+            self.add(key, value)
+
+    def update(self, key, value) -> None:
+        """
+        Updates the row of a package that is already in the store.
+
+        Args:
+            key: The package ID.
+            value: The package to copy, or a view of the row itself after it was changed.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case: O(1)
+                worst case: O(n)
+                average case: O(1)
+            space complexity:
+                best case: O(1)
+                worst case: O(1)
+                average case: O(1)
+        """
+        row = self.rows.get(key)  # O(1) - hash table get
+
+        if row is None:
+            return
+
+        if not (isinstance(value, PackageRow) and value.store is self and value.row == row):
+            self._write(row, value)
+
+        self._index(key, PackageRow(self, row))
+
+    def update_many(self, items) -> None:
+        """
+        Updates the rows of many packages that are already in the store.
+
+        Args:
+            items (iterable): The package ID and package pairs to update.
+
+        Returns:
+            None
+        """
+        for key, value in items:  # O(k) - for loop
+            self.update(key, value)
+
+    def _write(self, row: int, value) -> None:
+        """
+        Overwrites every column of a row with the attributes of a package.
+
+        Args:
+            row (int): The position of the row.
+            value: The package to copy.
+
+        Returns:
+            None
+        """
+        for name, column in self.columns.items():  # O(1) - for loop
+            column[row] = self.encode(name, getattr(value, name))
+
+    def lookup(self, name: str, value) -> [any]:
+        """
+        Gets the package IDs with the given indexed value in the named secondary index.
+
+        Args:
+            name (str): The name of the index.
+            value: The indexed value to look up.
+
+        Returns:
+            list: The package IDs with the given indexed value, sorted.
+        """
+        if name not in self.indexes:
+            raise KeyError(f"Package store has no index named {name}.")
+
+        return self.indexes[name].lookup(value)  # O(k log k) - function call
+
+    def reindex(self, key) -> None:
+        """
+        Refreshes every secondary index entry of the given package after a state change.
+
+        Args:
+            key: The package ID.
+
+        Returns:
+            None
+        """
+        row = self.rows.get(key)  # O(1) - hash table get
+
+        if row is not None:
+            self._index(key, PackageRow(self, row))
+
+    def _index(self, key, value: PackageRow) -> None:
+        """
+        Records a package in every secondary index and its change in the history.
+
+        Args:
+            key: The package ID.
+            value (PackageRow): A view of the package.
+
+        Returns:
+            None
+        """
+        for i in self.indexes.values():  # O(1) - for loop over the indexes
+            i.insert(key, value)
+
+        self.history.record(key, value)
+
+    def snapshot(self, time: int) -> package_history.Snapshot:
+        """
+        Gets a read-only snapshot of every package as it was at the given time.
+
+        Args:
+            time (int): The time to get the snapshot at, in seconds since midnight.
+
+        Returns:
+            package_history.Snapshot: The packages as they were at the given time.
+
+        Notes:
+            time complexity:
+                best case: O(log n)
+                worst case: O(n log n)
+                average case: O(log n)
+            space complexity:
+                best case: O(1)
+                worst case: O(n log n)
+                average case: O(1)
+        """
+        return self.history.snapshot(time, self)  # O(log n) - function call
+
+    def __len__(self) -> int:
+        """Returns the number of packages in the store."""
+        return len(self.rows)
+
+    def __iter__(self):
+        """Iterates over the package IDs in ascending order."""
+        return iter(self.ordered_keys)
@@ -12,14 +12,21 @@ import csv
 
 import __init__
 import address
-import hash_table
+import distance_file
+import distance_matrix
+import distance_oracle
 import package
+import package_store
+import road_graph
 
 
-def init():
+def init(load_packages: bool = True):
     """
     Initializes the data structures and variables for the program.
 
+    Args:
+        load_packages (bool): Whether to read the packages as well. Defaults to True.
+
     Returns:
         None
 
@@ -31,12 +38,22 @@ def init():
     __init__.addresses = get_addresses(
         __init__.address_csv_file
     )
-    __init__.distances = get_distances(
-        __init__.distance_csv_file
-    )
-    __init__.packages = get_packages(
-        __init__.package_csv_file
-    )
+    if __init__.road_edge_csv_file is not None:
+        __init__.distances = get_road_distances(
+            __init__.road_edge_csv_file, size=len(__init__.addresses)
+        )
+    elif __init__.address_coordinate_csv_file is not None:
+        __init__.distances = get_distance_oracle(
+            __init__.address_coordinate_csv_file, __init__.addresses
+        )
+    else:
+        __init__.distances = get_distances(
+            __init__.distance_csv_file
+        )
+    if load_packages:
+        __init__.packages = get_packages(
+            __init__.package_csv_file, __init__.columnar_package_store
+        )
 
 
 def get_addresses(
@@ -74,105 +91,319 @@ def get_addresses(
 
 def get_distances(
         file: str = __init__.distance_csv_file,
-) -> [[float]]:
+        cache: bool = True,
+) -> distance_matrix.DistanceMatrix:
     """
-    This function reads a csv file and returns a list of Location objects.
+    This function returns the distance matrix of a csv file, from its binary cache when the file has not changed since
+    it was last parsed.
 
     Args:
         file (str): The file to read from.
+        cache (bool): Whether to use and write the binary cache of the distance matrix. Defaults to True.
 
     Returns:
-        [[float]]: List of sublists of distance data from csv file as a distance matrix.
+        distance_matrix.DistanceMatrix: The distance matrix.
 
     Notes:
         time complexity:
-            best case: O(n^2)
+            best case: O(n) when the file has not changed
             worst case: O(n^2)
-            average case: O(n^2)
+            average case: O(n)
         space complexity:
-            best case: O(n^2)
+            best case: O(n)
             worst case: O(n^2)
-            average case: O(n^2)
+            average case: O(n)
     """
-    distance_matrix = []
-    csv_reader = csv.reader(open(file, "r"))
+    if cache:
+        return distance_file.cached_distances(
+            file, parse_distances
+        )  # O(n) - function call when the file has not changed
 
-    # Read the csv file and store the rows in a list
-    for row in csv_reader:  # O(n) - for loop
-        distance_row = []
-        # Convert the string values to float values
-        for column in row:  # O(n) - for loop
-            if column == "":
-                # If the value is empty, add None to the distance matrix
-                distance_row.append(None)
-            else:
-                # If the value is not empty, convert it to a float and add it to the distance matrix
-                distance_row.append(float(column))
-        # Add the row to the distance matrix
-        distance_matrix.append(distance_row)
-
-    # Fill in the missing values in the distance matrix
-    for row in range(len(distance_matrix)):  # O(n) - for loop
-        for column in range(len(distance_matrix[row])):  # O(n) - for loop
-            if distance_matrix[row][column] is None:
-                distance_matrix[row][column] = distance_matrix[column][row]
-
-    return distance_matrix
+    return parse_distances(file)  # O(n^2) - function call
 
 
-def get_packages(
-        file: str = __init__.package_csv_file,
-) -> hash_table.HashTable:
+def get_road_distances(
+        file: str = __init__.road_edge_csv_file,
+        cache: bool = True,
+        size: int = None,
+) -> distance_matrix.DistanceMatrix:
+    """
+    This function returns the distance matrix of a road graph in an edge list csv file, with one road segment per row
+    as the IDs of the two addresses it connects and its length. The distances are the shortest paths between the
+    addresses, found with Dijkstra's algorithm from every address across a process pool, and are cached like the
+    distance csv file.
+
+    Args:
+        file (str): The edge list file to read from.
+        cache (bool): Whether to use and write the binary cache of the distance matrix. Defaults to True.
+        size (int): The number of addresses. Defaults to one more than the largest address ID in the file.
+
+    Returns:
+        distance_matrix.DistanceMatrix: The distance matrix.
+
+    Raises:
+        ValueError: If the file is not a valid edge list or some address cannot be reached from another.
+
+    Notes:
+        time complexity:
+            best case: O(n) when the file has not changed
+            worst case: O(n (n + e) log n / p)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n^2)
+            average case: O(n)
+    """
+    if cache:
+        distances = distance_file.cached_distances(
+            file, lambda i: road_graph.read_distances(i, size=size)
+        )  # O(n) - function call when the file has not changed
+
+        # The cache is keyed by the edge list only, so a cached matrix can be for another number of addresses
+        if size is None or len(distances) == size:
+            return distances
+
+    return road_graph.read_distances(file, size=size)  # O(n (n + e) log n / p) - function call
+
+
+def get_coordinates(
+        file: str = __init__.address_coordinate_csv_file,
+        addresses: [address.Address] = None,
+) -> None:
+    """
+    This function reads a csv file of address coordinates, with one address per row as its ID, latitude and
+    longitude in degrees, and sets the coordinates of the addresses.
+
+    Args:
+        file (str): The file to read from.
+        addresses ([address.Address]): The addresses, in address ID order. Defaults to __init__.addresses.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a row is for an address that is not in the addresses.
+
+    Notes:
+        time complexity: O(n)
+        space complexity: O(1)
+    """
+    if addresses is None:
+        addresses = __init__.addresses
+
+    with open(file, "r", newline="") as csv_file:
+        for row in csv.reader(csv_file):  # O(n) - for loop
+            if len(row) == 0:
+                continue
+
+            address_id = int(row[0])
+            if not 0 <= address_id < len(addresses):
+                raise ValueError(f"Address {address_id} of {file} is not a known address.")
+
+            addresses[address_id].latitude = float(row[1])
+            addresses[address_id].longitude = float(row[2])
+
+
+def get_distance_oracle(
+        file: str = __init__.address_coordinate_csv_file,
+        addresses: [address.Address] = None,
+) -> distance_oracle.DistanceOracle:
+    """
+    This function reads the coordinates of the addresses from a csv file and returns a distance oracle over them, which
+    computes the distances between addresses when they are asked for instead of storing a distance matrix.
+
+    Args:
+        file (str): The file of address coordinates to read from.
+        addresses ([address.Address]): The addresses, in address ID order. Defaults to __init__.addresses.
+
+    Returns:
+        distance_oracle.DistanceOracle: The distances between the addresses.
+
+    Raises:
+        ValueError: If an address has no coordinates.
+
+    Notes:
+        time complexity: O(n)
+        space complexity: O(n)
+    """
+    if addresses is None:
+        addresses = __init__.addresses
+
+    get_coordinates(file, addresses)  # O(n) - function call
+
+    return distance_oracle.DistanceOracle(addresses)  # O(n) - function call
+
+
+def parse_distances(
+        file: str = __init__.distance_csv_file,
+) -> distance_matrix.DistanceMatrix:
     """
-    This function reads a csv file and returns a list of Package objects.
+    This function reads a lower triangular distance csv file one row at a time into a distance matrix. Only the
+    distances below the diagonal are read, so a full square file works as well.
 
     Args:
         file (str): The file to read from.
 
     Returns:
-        list: A list of Package objects.
+        distance_matrix.DistanceMatrix: The distance matrix.
+
+    Raises:
+        ValueError: If a distance below the diagonal is missing.
 
     Notes:
         time complexity:
             best case: O(n^2)
             worst case: O(n^2)
             average case: O(n^2)
+        space complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+    """
+    distances = distance_matrix.DistanceMatrix()
+
+    with open(file, "r", newline="") as csv_file:
+        # Add each row's distances to the locations before it to the matrix
+        for row in csv.reader(csv_file):  # O(n) - for loop
+            below_diagonal = row[: len(distances)]
+            if len(below_diagonal) < len(distances) or "" in below_diagonal:  # O(n) - list search
+                raise ValueError(f"Row {len(distances)} of {file} is missing a distance below the diagonal.")
+
+            distances.append_row([float(i) for i in below_diagonal])  # O(n) - function call
+
+    return distances
+
+
+def address_index(addresses: [address.Address] = None) -> {str: address.Address}:
+    """
+    This function returns the addresses keyed by their street address, so a package row can find its address in O(1)
+    instead of scanning every address. When two addresses share a street address, the later one is kept.
+
+    Args:
+        addresses ([address.Address]): The addresses to index. Defaults to __init__.addresses.
+
+    Returns:
+        {str: address.Address}: The addresses keyed by street address.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
         space complexity:
             best case: O(n)
             worst case: O(n)
             average case: O(n)
     """
+    if addresses is None:
+        addresses = __init__.addresses
 
-    # Create an empty hash table to store the packages
-    __hash_table__ = hash_table.HashTable()
+    return {i.address: i for i in addresses}  # O(n) - dict comprehension
 
-    # Open the csv file and read the rows into a list
-    csv_file = open(file, "r")
-    reader = csv.reader(csv_file)
-
-    # Parse the csv file and create a list of Package objects
-    for row in reader:  # O(n) - for loop
-
-        matching_address = int
-        for i in __init__.addresses:  # O(n) - for loop
-            if i.address == row[1]:
-                matching_address = i
-
-        # Create a Package object
-        new_package = package.Package(
-            id=int(row[0]),
-            address_id=matching_address.id,
-            address_name=matching_address.name,
-            address=matching_address.address,
-            city=row[2],
-            state=row[3],
-            zip=row[4],
-            delivery_deadline=(row[5]),
-            weight_kilo=int(row[6]),
-            special_notes=row[7],
-        )
 
-        # Add package to hash table
-        __hash_table__.add(new_package.id, new_package)
+def read_package_chunks(
+        file: str = __init__.package_csv_file,
+        addresses: [address.Address] = None,
+        chunk_size: int = None,
+):
+    """
+    This function reads a package csv file one row at a time and yields the packages in chunks, so only one chunk of
+    Package objects is held at a time however long the file is.
+
+    Args:
+        file (str): The file to read from.
+        addresses ([address.Address]): The addresses to match the packages to. Defaults to __init__.addresses.
+        chunk_size (int): The most packages in a chunk. Defaults to __init__.package_chunk_size.
+
+    Yields:
+        [(int, package.Package)]: The next chunk of package ID and package pairs, in file order.
+
+    Raises:
+        ValueError: If a package has an address that is not in the addresses.
+
+    Notes:
+        time complexity:
+            best case: O(n + a)
+            worst case: O(n + a)
+            average case: O(n + a)
+        space complexity:
+            best case: O(c + a)
+            worst case: O(c + a)
+            average case: O(c + a)
+    """
+    if chunk_size is None:
+        chunk_size = __init__.package_chunk_size
+
+    addresses_by_street = address_index(addresses)  # O(a) - function call
+    chunk = []
+
+    with open(file, "r", newline="") as csv_file:
+        for row in csv.reader(csv_file):  # O(n) - for loop
+            matching_address = addresses_by_street.get(row[1])  # O(1) - dict get
+            if matching_address is None:
+                raise ValueError(f"Package {row[0]} has an unknown address {row[1]}.")
+
+            # Create a Package object
+            new_package = package.Package(
+                id=int(row[0]),
+                address_id=matching_address.id,
+                address_name=matching_address.name,
+                address=matching_address.address,
+                city=row[2],
+                state=row[3],
+                zip=row[4],
+                delivery_deadline=(row[5]),
+                weight_kilo=int(row[6]),
+                special_notes=row[7],
+            )
+
+            chunk.append((new_package.id, new_package))
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+    if len(chunk) > 0:
+        yield chunk
+
+
+def get_packages(
+        file: str = __init__.package_csv_file,
+        columnar: bool = False,
+        chunk_size: int = None,
+) -> package.PackageTable or package_store.ColumnarPackageStore:
+    """
+    This function reads a csv file and returns a package table of Package objects. The file is streamed into the
+    table in chunks, so apart from the table itself only one chunk of packages is in memory at a time.
+
+    Args:
+        file (str): The file to read from.
+        columnar (bool): Whether to store the packages in a columnar package store instead of a package table of
+            Package objects. Defaults to False.
+        chunk_size (int): The most packages to add to the table in one batch. Defaults to __init__.package_chunk_size.
+
+    Returns:
+        package.PackageTable or package_store.ColumnarPackageStore: The packages keyed by package ID.
+
+    Notes:
+        time complexity:
+            best case: O(n + a)
+            worst case: O(n + a)
+            average case: O(n + a)
+        space complexity:
+            best case: O(n + a)
+            worst case: O(n + a)
+            average case: O(n + a)
+    """
+
+    # Create an empty package store to store the packages
+    if columnar:
+        __hash_table__ = package_store.ColumnarPackageStore()
+    else:
+        __hash_table__ = package.PackageTable()
+
+    # Add the packages to the hash table one chunk at a time
+    for chunk in read_package_chunks(file, __init__.addresses, chunk_size):  # O(n / c) - for loop
+        __hash_table__.add_many(chunk)  # O(c) - function call
 
     return __hash_table__
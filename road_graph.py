@@ -0,0 +1,292 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import array
+import concurrent.futures
+import csv
+import heapq
+import os
+
+import distance_matrix
+
+# The adjacency lists of the road graph in a shortest path worker process
+_worker_adjacency = None
+
+
+def read_edges(file: str, size: int = None) -> [[(int, float)]]:
+    """
+    Reads a road graph from an edge list csv file with one road segment per row as the IDs of the two locations it
+    connects and its length. Segments can be driven both ways, and the shortest of repeated segments is kept.
+
+    Args:
+        file (str): The edge list file to read from.
+        size (int): The number of locations, numbered from 0, such as the number of addresses. Defaults to one more
+            than the largest ID in the file.
+
+    Returns:
+        [[(int, float)]]: The neighboring locations of each location and the length of the segment to each.
+
+    Raises:
+        ValueError: If a row is not two location IDs and a length that is not negative, or has a location ID of size
+            or more.
+
+    Notes:
+        time complexity:
+            best case: O(e)
+            worst case: O(e)
+            average case: O(e)
+        space complexity:
+            best case: O(n + e)
+            worst case: O(n + e)
+            average case: O(n + e)
+    """
+    lengths = {}
+
+    with open(file, newline="") as file_open:
+        for row in csv.reader(file_open):  # O(e) - for loop
+            if len(row) == 0:
+                continue
+            if len(row) < 3:
+                raise ValueError(f"Road segment {row} needs two location IDs and a length.")
+
+            start, end, length = int(row[0]), int(row[1]), float(row[2])
+            if start < 0 or end < 0 or length < 0:
+                raise ValueError(f"Road segment {row} has a negative location ID or length.")
+            if size is not None and max(start, end) >= size:
+                raise ValueError(f"Road segment {row} has a location ID past the last of the {size} locations.")
+
+            key = (min(start, end), max(start, end))
+            lengths[key] = min(length, lengths.get(key, length))
+
+    if size is None:
+        size = 1 + max((max(i) for i in lengths), default=-1)
+    adjacency = [[] for _ in range(size)]
+
+    for (start, end), length in lengths.items():  # O(e) - for loop
+        adjacency[start].append((end, length))
+        adjacency[end].append((start, length))
+
+    return adjacency
+
+
+def dijkstra(adjacency: [[(int, float)]], source: int) -> [float]:
+    """
+    Finds the length of the shortest path from a location to every location of a road graph with Dijkstra's algorithm
+    over a binary heap.
+
+    Args:
+        adjacency ([[(int, float)]]): The neighboring locations of each location and the length of the segment to each.
+        source (int): The location to start from.
+
+    Returns:
+        [float]: The shortest distance from the source to each location, or infinity if it cannot be reached.
+
+    Notes:
+        time complexity:
+            best case: O((n + e) log n)
+            worst case: O((n + e) log n)
+            average case: O((n + e) log n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n + e)
+            average case: O(n)
+    """
+    distances = [float("inf")] * len(adjacency)
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+
+    while len(heap) > 0:  # O(e) - while loop
+        distance, location = heapq.heappop(heap)  # O(log n) - heap pop
+        if distance > distances[location]:
+            # A shorter path to the location was already settled
+            continue
+
+        for neighbor, length in adjacency[location]:  # O(d) - for loop
+            new_distance = distance + length
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))  # O(log n) - heap push
+
+    return distances
+
+
+def check_connected(adjacency: [[(int, float)]]) -> None:
+    """
+    Checks every location of a road graph can be reached from location 0, so a distance matrix can be built from it.
+
+    Args:
+        adjacency ([[(int, float)]]): The neighboring locations of each location and the length of the segment to each.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If some location cannot be reached, naming every such location and those without any segment.
+
+    Notes:
+        time complexity:
+            best case: O(n + e)
+            worst case: O(n + e)
+            average case: O(n + e)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    if len(adjacency) == 0:
+        return
+
+    reached = [False] * len(adjacency)
+    reached[0] = True
+    stack = [0]
+
+    while len(stack) > 0:  # O(n) - while loop
+        for neighbor, _ in adjacency[stack.pop()]:  # O(d) - for loop
+            if not reached[neighbor]:
+                reached[neighbor] = True
+                stack.append(neighbor)
+
+    unreached = [i for i in range(len(adjacency)) if not reached[i]]  # O(n) - list comprehension
+    if len(unreached) > 0:
+        isolated = [i for i in unreached if len(adjacency[i]) == 0]  # O(n) - list comprehension
+        raise ValueError(
+            f"Locations {unreached} cannot be reached from location 0"
+            + (f", and locations {isolated} have no road segment." if len(isolated) > 0 else ".")
+        )
+
+
+def _attach_adjacency(adjacency: [[(int, float)]]) -> None:
+    """
+    Gives a shortest path worker process the road graph. Runs once when the worker starts, so the graph is sent once
+    per worker instead of once per source.
+
+    Args:
+        adjacency ([[(int, float)]]): The neighboring locations of each location and the length of the segment to each.
+
+    Returns:
+        None
+    """
+    global _worker_adjacency
+
+    _worker_adjacency = adjacency
+
+
+def _dijkstra_from(source: int) -> array.array:
+    """
+    Runs Dijkstra's algorithm from a source over the road graph of a worker process. Only the distances to the
+    locations before the source are returned, which is the source's row of a DistanceMatrix, as an array of doubles
+    that is sent back to the main process as raw bytes instead of one float object at a time.
+
+    Args:
+        source (int): The location to start from.
+
+    Returns:
+        array.array: The shortest distance from the source to each location before it.
+    """
+    return array.array("d", dijkstra(_worker_adjacency, source)[:source])
+
+
+def all_pairs_distances(
+    adjacency: [[(int, float)]], workers: int = None
+) -> distance_matrix.DistanceMatrix:
+    """
+    Builds the distance matrix of a road graph by running Dijkstra's algorithm from every location, with the sources
+    spread across a process pool. Each distance is the length of a shortest path, so the matrix is symmetric and meets
+    the triangle inequality.
+
+    Args:
+        adjacency ([[(int, float)]]): The neighboring locations of each location and the length of the segment to each.
+        workers (int): The number of worker processes, or 1 to run in this process. Defaults to the number of
+            processors.
+
+    Returns:
+        distance_matrix.DistanceMatrix: The shortest distance between each pair of locations.
+
+    Raises:
+        ValueError: If some location cannot be reached from another, before any shortest paths are searched.
+
+    Notes:
+        time complexity:
+            best case: O(n (n + e) log n / p)
+            worst case: O(n (n + e) log n / p)
+            average case: O(n (n + e) log n / p)
+        space complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+    """
+    check_connected(adjacency)  # O(n + e) - function call
+
+    size = len(adjacency)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    distances = distance_matrix.DistanceMatrix()
+
+    if workers <= 1 or size < 2:
+        rows = (dijkstra(adjacency, i)[:i] for i in range(size))  # O(n) - Dijkstra per source
+        _add_rows(distances, rows)  # O(n^2) - function call
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_adjacency,
+            initargs=(adjacency,),
+        ) as executor:
+            rows = executor.map(
+                _dijkstra_from, range(size), chunksize=max(1, size // (workers * 4))
+            )  # O(n) - Dijkstra per source across the pool
+            _add_rows(distances, rows)  # O(n^2) - function call
+
+    return distances
+
+
+def _add_rows(distances: distance_matrix.DistanceMatrix, rows) -> None:
+    """
+    Adds the shortest distances from each location to the locations before it to a distance matrix, as they arrive.
+
+    Args:
+        distances (distance_matrix.DistanceMatrix): The distance matrix to add the rows to.
+        rows (iterable): The distances from each location to the locations before it, in location order.
+
+    Returns:
+        None
+    """
+    for row in rows:  # O(n) - for loop
+        distances.append_row(row)  # O(n) - function call
+
+
+def read_distances(file: str, workers: int = None, size: int = None) -> distance_matrix.DistanceMatrix:
+    """
+    Reads a road graph from an edge list csv file and returns its distance matrix.
+
+    Args:
+        file (str): The edge list file to read from.
+        workers (int): The number of worker processes, or 1 to run in this process. Defaults to the number of
+            processors.
+        size (int): The number of locations, such as the number of addresses. Defaults to one more than the largest
+            ID in the file.
+
+    Returns:
+        distance_matrix.DistanceMatrix: The shortest distance between each pair of locations.
+
+    Raises:
+        ValueError: If the file is not a valid edge list or some location cannot be reached from another.
+
+    Notes:
+        time complexity:
+            best case: O(n (n + e) log n / p)
+            worst case: O(n (n + e) log n / p)
+            average case: O(n (n + e) log n / p)
+        space complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+    """
+    return all_pairs_distances(read_edges(file, size), workers)  # O(n (n + e) log n / p) - function call
@@ -0,0 +1,999 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import array
+import concurrent.futures
+import heapq
+import random
+import time
+from multiprocessing import shared_memory
+
+import __init__
+import delivery_time_calculator
+import distance_matrix
+import nearest_neighbor
+
+# The smallest change in distance counted as an improvement, so rounding noise cannot make a move loop forever
+epsilon = 1e-9
+
+
+def route_distance(route: [int], distances: [[float]]) -> float:
+    """
+    Returns the distance of a route.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The distance matrix.
+
+    Returns:
+        float: The sum of the distances between consecutive addresses of the route.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    return sum(
+        distances[route[i]][route[i + 1]] for i in range(len(route) - 1)
+    )  # O(n) - generator sum
+
+
+def stop_distances(route: [int], distances) -> ([int], [array.array]):
+    """
+    Returns the addresses of a route in ascending order and the distances between them as one array of doubles per
+    address, so the optimizers index plain rows of the route's own addresses instead of a compact distance matrix of
+    every address. Route address i is stop stops.index(i), and since the stops keep the order of the address IDs, ties
+    are broken the same way as over the whole matrix.
+
+    Args:
+        route ([int]): The address IDs of the route.
+        distances (distance_matrix.DistanceMatrix or [[float]]): The distance matrix of every address.
+
+    Returns:
+        ([int], [array.array]): The address ID of each stop, and the distances between the stops.
+
+    Notes:
+        time complexity:
+            best case: O(k^2)
+            worst case: O(k^2)
+            average case: O(k^2)
+        space complexity:
+            best case: O(k^2)
+            worst case: O(k^2)
+            average case: O(k^2)
+    """
+    stops = sorted(set(route))  # O(k log k) - sort
+    dist = distance_matrix.distance_function(distances)
+
+    return stops, [
+        array.array("d", [dist(i, j) for j in stops]) for i in stops
+    ]  # O(k^2) - sub-matrix
+
+
+def arrival_times(
+    route: [int], distances: [[float]], start_time: int, speed=None
+) -> [int]:
+    """
+    Returns the time a truck arrives at each address of a route, calculated the same way Truck.deliver_all does.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order, starting with the address the truck is at.
+        distances ([[float]]): The distance matrix.
+        start_time (int): The time the truck leaves the first address.
+        speed (float or delivery_time_calculator.SpeedProfile): The speed to travel at. Defaults to the speed of the
+            trucks.
+
+    Returns:
+        [int]: The arrival time at each address of the route, with the start time for the first address.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    return delivery_time_calculator.route_arrival_times(
+        route, distances, start_time, speed
+    )  # O(n) - function call
+
+
+def deadline_checker(
+    route: [int],
+    distances: [[float]],
+    start_time: int,
+    deadlines: dict,
+    speed=None,
+):
+    """
+    Creates a check for whether a reordering of a route keeps its deliveries on time. An address may be reached no
+    later than its deadline, or no later than the route reaches it if the route already misses the deadline, so an
+    improvement never makes a delivery late or a late delivery later.
+
+    Args:
+        route ([int]): The address IDs of the route being improved in visiting order.
+        distances ([[float]]): The distance matrix.
+        start_time (int): The time the truck leaves the first address.
+        deadlines (dict): The earliest delivery deadline of the packages for each address ID.
+        speed (float or delivery_time_calculator.SpeedProfile): The speed to travel at. Defaults to the speed of the
+            trucks, read when the check is created.
+
+    Returns:
+        function: A function that takes a reordered route and returns True if it keeps its deliveries on time.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(1)
+            worst case: O(n)
+            average case: O(n)
+    """
+    # Every order is on time when the route has no deadlines, so skip driving each candidate on paper
+    if not any(i in deadlines for i in route):
+        return lambda candidate: True
+
+    if speed is None:
+        speed = delivery_time_calculator.current_speed()
+
+    latest_arrivals = {}
+    for address_id, arrival_time in zip(
+        route, arrival_times(route, distances, start_time, speed)
+    ):  # O(n) - for loop
+        if address_id in deadlines:
+            latest_arrivals[address_id] = max(deadlines[address_id], arrival_time)
+
+    def on_time(candidate: [int]) -> bool:
+        for address_id, arrival_time in zip(
+            candidate, arrival_times(candidate, distances, start_time, speed)
+        ):  # O(n) - for loop
+            if address_id in latest_arrivals and arrival_time > latest_arrivals[address_id]:
+                return False
+        return True
+
+    return on_time
+
+
+def two_opt_delta(route: [int], i: int, j: int, distances: [[float]]) -> float:
+    """
+    Returns the change in distance from reversing the addresses of a route between two positions, from the four
+    distances of the two edges removed and the two edges added.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        i (int): The position of the first address to reverse, at least 1.
+        j (int): The position of the last address to reverse, at most the second to last position.
+        distances ([[float]]): The symmetric distance matrix.
+
+    Returns:
+        float: The change in the distance of the route. Negative if the reversal shortens it.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    before, first, last, after = route[i - 1], route[i], route[j], route[j + 1]
+
+    return (
+        distances[before][last]
+        + distances[first][after]
+        - distances[before][first]
+        - distances[last][after]
+    )
+
+
+def or_opt_delta(
+    route: [int], i: int, length: int, position: int, distances: [[float]]
+) -> float:
+    """
+    Returns the change in distance from moving a segment of a route to between two other consecutive addresses, from
+    the six distances of the three edges removed and the three edges added.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        i (int): The position of the first address of the segment, at least 1.
+        length (int): The number of addresses in the segment.
+        position (int): The position of the address the segment is moved after, outside the segment and the address
+            before it, and before the last position.
+        distances ([[float]]): The distance matrix.
+
+    Returns:
+        float: The change in the distance of the route. Negative if the move shortens it.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(1)
+            average case: O(1)
+    """
+    before, first, last, after = route[i - 1], route[i], route[i + length - 1], route[i + length]
+    left, right = route[position], route[position + 1]
+
+    return (
+        distances[before][after]
+        + distances[left][first]
+        + distances[last][right]
+        - distances[before][first]
+        - distances[last][after]
+        - distances[left][right]
+    )
+
+
+def route_positions(route: [int]) -> dict:
+    """
+    Returns the position of each address of a route except the last, which is the hub the route returns to.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+
+    Returns:
+        dict: The position of each address ID in the route.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    return {route[i]: i for i in range(len(route) - 1)}  # O(n) - dict comprehension
+
+
+def route_candidates(
+    distances: [[float]], min_locations: int = None, k: int = None
+) -> [[int]] or None:
+    """
+    Returns the candidate lists local search restricts its moves to, for distance matrices of at least
+    candidate_list_min_locations addresses.
+
+    Args:
+        distances ([[float]]): The distance matrix.
+        min_locations (int): The fewest addresses to use candidate lists for. Defaults to
+            candidate_list_min_locations.
+        k (int): The number of nearest addresses in each candidate list. Defaults to candidate_neighbors.
+
+    Returns:
+        [[int]] or None: The nearest addresses of each address, or None to try every move.
+
+    Notes:
+        time complexity:
+            best case: O(1)
+            worst case: O(n^2 log k) to build the candidate index
+            average case: O(1)
+        space complexity:
+            best case: O(1)
+            worst case: O(n * k)
+            average case: O(n * k)
+    """
+    if min_locations is None:
+        min_locations = __init__.candidate_list_min_locations
+
+    if len(distances) < min_locations:
+        return None
+
+    return nearest_neighbor.candidate_index(distances, k).candidates  # O(n^2 log k) - function call on the first use
+
+
+def two_opt_pass(
+    route: [int], distances: [[float]], on_time, deadline: float, candidates: [[int]] = None
+) -> bool:
+    """
+    Applies every improving 2-opt reversal found in one scan of a route, in place. The first and last addresses of the
+    route stay where they are. With candidate lists, only the reversals that join an address to one of its candidates
+    are tried, which is O(k) moves per address instead of O(n).
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The symmetric distance matrix.
+        on_time (function): Returns True if a reordered route keeps its deliveries on time.
+        deadline (float): The performance counter value to stop scanning at.
+        candidates ([[int]]): The nearest addresses of each address to restrict the moves to. Defaults to trying
+            every move.
+
+    Returns:
+        bool: True if the route was improved.
+
+    Notes:
+        time complexity:
+            best case: O(n^2), O(n * k) with candidates
+            worst case: O(n^3)
+            average case: O(n^2), O(n * k) with candidates
+        space complexity:
+            best case: O(1)
+            worst case: O(n)
+            average case: O(n)
+    """
+    if candidates is not None:
+        return _two_opt_candidate_pass(route, distances, on_time, deadline, candidates)
+
+    improved = False
+
+    for i in range(1, len(route) - 2):  # O(n) - for loop
+        if time.perf_counter() > deadline:
+            break
+
+        for j in range(i + 1, len(route) - 1):  # O(n) - for loop
+            if two_opt_delta(route, i, j, distances) < -epsilon:
+                candidate = route[:i] + route[i : j + 1][::-1] + route[j + 1 :]
+                if on_time(candidate):  # O(n) - function call on improving moves only
+                    route[:] = candidate
+                    improved = True
+
+    return improved
+
+
+def _two_opt_candidate_pass(
+    route: [int], distances: [[float]], on_time, deadline: float, candidates: [[int]]
+) -> bool:
+    """
+    Applies every improving 2-opt reversal that joins an address to one of its candidates found in one scan of a
+    route, in place. Joining the address at position x to the one at position y reverses the addresses after x up to
+    y when y comes later, and the addresses after y up to x when y comes earlier.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The symmetric distance matrix.
+        on_time (function): Returns True if a reordered route keeps its deliveries on time.
+        deadline (float): The performance counter value to stop scanning at.
+        candidates ([[int]]): The nearest addresses of each address to restrict the moves to.
+
+    Returns:
+        bool: True if the route was improved.
+    """
+    improved = False
+    positions = route_positions(route)  # O(n) - function call
+
+    for x in range(len(route) - 1):  # O(n) - for loop
+        if time.perf_counter() > deadline:
+            break
+
+        for c in candidates[route[x]]:  # O(k) - for loop
+            y = positions.get(c)
+            if y is None or y == x:
+                continue
+
+            i, j = (x + 1, y) if y > x else (y + 1, x)
+            if i < 1 or j > len(route) - 2 or i >= j:
+                continue
+
+            if two_opt_delta(route, i, j, distances) < -epsilon:
+                candidate = route[:i] + route[i : j + 1][::-1] + route[j + 1 :]
+                if on_time(candidate):  # O(n) - function call on improving moves only
+                    route[:] = candidate
+                    positions = route_positions(route)  # O(n) - function call on improving moves only
+                    improved = True
+                    break
+
+    return improved
+
+
+def or_opt_pass(
+    route: [int],
+    distances: [[float]],
+    on_time,
+    deadline: float,
+    max_length: int = 3,
+    candidates: [[int]] = None,
+) -> bool:
+    """
+    Applies every improving Or-opt move found in one scan of a route, in place. A move takes a segment of one to
+    max_length consecutive addresses and puts it between two other consecutive addresses. The first and last
+    addresses of the route stay where they are. With candidate lists, a segment is only put next to a candidate of
+    its first or last address.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The distance matrix.
+        on_time (function): Returns True if a reordered route keeps its deliveries on time.
+        deadline (float): The performance counter value to stop scanning at.
+        max_length (int): The largest number of addresses in a moved segment. Defaults to 3.
+        candidates ([[int]]): The nearest addresses of each address to restrict the moves to. Defaults to trying
+            every move.
+
+    Returns:
+        bool: True if the route was improved.
+
+    Notes:
+        time complexity:
+            best case: O(n^2), O(n * k) with candidates
+            worst case: O(n^3)
+            average case: O(n^2), O(n * k) with candidates
+        space complexity:
+            best case: O(1)
+            worst case: O(n)
+            average case: O(n)
+    """
+    improved = False
+    positions = route_positions(route) if candidates is not None else None
+
+    for length in range(1, max_length + 1):  # O(1) - for loop
+        for i in range(1, len(route) - length):  # O(n) - for loop
+            if time.perf_counter() > deadline:
+                return improved
+
+            # Moves never change the length of the route, so the ranges stay valid after a move
+            if candidates is None:
+                insert_positions = range(len(route) - 1)
+            else:
+                # Put the segment after a candidate of its first address or before a candidate of its last address
+                insert_positions = sorted(
+                    {positions[c] for c in candidates[route[i]] if c in positions}
+                    | {positions[c] - 1 for c in candidates[route[i + length - 1]] if c in positions}
+                )  # O(k log k) - sort
+
+            for position in insert_positions:  # O(n) - for loop, O(k) with candidates
+                if position < 0 or i - 1 <= position < i + length:
+                    continue
+
+                if or_opt_delta(route, i, length, position, distances) < -epsilon:
+                    segment = route[i : i + length]
+                    if position < i:
+                        candidate = (
+                            route[: position + 1]
+                            + segment
+                            + route[position + 1 : i]
+                            + route[i + length :]
+                        )
+                    else:
+                        candidate = (
+                            route[:i]
+                            + route[i + length : position + 1]
+                            + segment
+                            + route[position + 1 :]
+                        )
+
+                    if on_time(candidate):  # O(n) - function call on improving moves only
+                        route[:] = candidate
+                        if candidates is not None:
+                            positions = route_positions(route)  # O(n) - function call on improving moves only
+                        improved = True
+                        break
+
+    return improved
+
+
+def improve_route(
+    route: [int],
+    distances: [[float]],
+    time_budget: float = None,
+    on_time=None,
+    candidates: [[int]] = None,
+) -> [int]:
+    """
+    Improves a route with 2-opt and Or-opt moves until neither finds a shorter route or the time budget runs out. The
+    first and last addresses of the route stay where they are, so a route from the hub back to the hub keeps both ends
+    at the hub.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The symmetric distance matrix.
+        time_budget (float): The number of seconds to spend improving the route. Defaults to
+            route_improvement_time_budget, read when the search starts.
+        on_time (function): Returns True if a reordered route keeps its deliveries on time. Defaults to accepting
+            every route.
+        candidates ([[int]]): The nearest addresses of each address to restrict the moves to, such as from
+            route_candidates. Defaults to trying every move.
+
+    Returns:
+        [int]: The improved route, never longer than the given one.
+
+    Notes:
+        time complexity:
+            best case: O(n^2), O(n * k) with candidates
+            worst case: O(n^3) per round, bounded by the time budget
+            average case: O(n^2) per round, O(n * k) with candidates
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    if time_budget is None:
+        time_budget = __init__.route_improvement_time_budget
+
+    if on_time is None:
+        on_time = lambda candidate: True
+
+    deadline = time.perf_counter() + time_budget
+    route = list(route)
+
+    # Alternate the two neighborhoods until neither improves the route
+    improved = True
+    while improved and time.perf_counter() < deadline:  # O(r) - while loop over rounds
+        improved = two_opt_pass(route, distances, on_time, deadline, candidates)
+        improved = (
+            or_opt_pass(route, distances, on_time, deadline, candidates=candidates)
+            or improved
+        )
+
+    return route
+
+
+# The exact routes solved by solve_exact, by first address, stop set and last address as address IDs of the distance
+# matrix in _exact_routes_distances
+_exact_routes = {}
+_exact_routes_distances = None
+
+# The most bytes the Held-Karp tables of solve_exact may take, so larger routes are improved heuristically instead
+exact_route_max_table_bytes = 1 << 28
+
+
+def exact_table_bytes(stop_count: int) -> int:
+    """
+    Returns the number of bytes the Held-Karp tables of solve_exact take for a number of stops: a double and a byte
+    for each stop set and last stop.
+
+    Args:
+        stop_count (int): The number of stops of the route.
+
+    Returns:
+        int: The size of the tables in bytes.
+
+    Notes:
+        time complexity: O(1)
+        space complexity: O(1)
+    """
+    return (1 << stop_count) * stop_count * 9
+
+
+def solve_exact(
+    route: [int], distances: [[float]], addresses: [int] = None
+) -> [int]:
+    """
+    Finds the shortest order to visit the stops of a route in with the Held-Karp bitmask dynamic program, keeping the
+    first and last addresses of the route where they are. The table holds the shortest distance from the first address
+    through each set of stops ending at each stop, in one flat array of doubles indexed by the stop set as a bitmask
+    times the number of stops plus the last stop, with the previous stop of each entry in a parallel array of bytes.
+    Solved routes over the distances of the addresses, directly or through the sub-matrix of some of them, are
+    remembered by their address IDs, so a truck that routes the same stops again gets the answer without solving it
+    again.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order, with at least one stop between the first and
+            last addresses and no stop listed twice.
+        distances ([[float]]): The distance matrix.
+        addresses ([int]): The address ID of each location of distances when they are a sub-matrix of the distances
+            of the addresses, such as the stops from stop_distances. Defaults to remembering routes only over the
+            distances of the addresses themselves.
+
+    Returns:
+        [int]: The shortest route through the same stops with the same first and last addresses.
+
+    Raises:
+        ValueError: If the route has more than 127 stops, or more than its Held-Karp tables fit in
+            exact_route_max_table_bytes.
+
+    Notes:
+        time complexity:
+            best case: O(1) when the stop set was solved before
+            worst case: O(2^n * n^2)
+            average case: O(2^n * n^2)
+        space complexity:
+            best case: O(n)
+            worst case: O(2^n * n)
+            average case: O(2^n * n)
+    """
+    global _exact_routes, _exact_routes_distances
+
+    first, last = route[0], route[-1]
+
+    # Remember routes by their address IDs, which stay the same across the sub-matrices of different trucks
+    key = None
+    if addresses is None and distances is __init__.distances:
+        addresses = range(len(distances))
+    if addresses is not None:
+        if _exact_routes_distances is not __init__.distances:
+            _exact_routes = {}
+            _exact_routes_distances = __init__.distances
+
+        key = (addresses[first], frozenset(addresses[i] for i in route[1:-1]), addresses[last])
+        if key in _exact_routes:
+            location = {addresses[i]: i for i in route}  # O(n) - dictionary comprehension
+            return [location[i] for i in _exact_routes[key]]
+
+    # Number the stops in ascending address ID order so equal stop sets give the same route
+    stops = sorted(route[1:-1])
+    n = len(stops)
+    if n > 127:
+        raise ValueError("Held-Karp cannot solve routes with more than 127 stops.")
+    if exact_table_bytes(n) > exact_route_max_table_bytes:
+        raise ValueError(f"The Held-Karp tables of {n} stops do not fit in exact_route_max_table_bytes.")
+
+    stop_distances = [[distances[i][j] for j in stops] for i in stops]  # O(n^2) - sub-matrix
+
+    full = (1 << n) - 1
+    costs = array.array("d", [float("inf")]) * ((full + 1) * n)
+    previous = array.array("b", [-1]) * ((full + 1) * n)
+
+    for j in range(n):  # O(n) - for loop
+        costs[(1 << j) * n + j] = distances[first][stops[j]]
+
+    for mask in range(1, full + 1):  # O(2^n) - for loop over stop sets
+        base = mask * n
+        for j in range(n):  # O(n) - for loop over last stops
+            cost = costs[base + j]
+            if cost == float("inf"):
+                continue
+
+            row = stop_distances[j]
+            for k in range(n):  # O(n) - for loop over next stops
+                if mask & (1 << k):
+                    continue
+
+                index = (mask | (1 << k)) * n + k
+                new_cost = cost + row[k]
+                if new_cost < costs[index] - epsilon:
+                    costs[index] = new_cost
+                    previous[index] = j
+
+    # Close the route at the last address and walk the previous stops back from the best end
+    base = full * n
+    end = min(
+        range(n), key=lambda j: costs[base + j] + distances[stops[j]][last]
+    )  # O(n) - min
+
+    order = []
+    mask = full
+    while end != -1:  # O(n) - while loop
+        order.append(stops[end])
+        end, mask = previous[mask * n + end], mask & ~(1 << end)
+
+    solved = [first] + order[::-1] + [last]
+    if key is not None:
+        _exact_routes[key] = tuple(addresses[i] for i in solved)
+
+    return solved
+
+
+def optimize_route(
+    route: [int],
+    distances: [[float]],
+    time_budget: float = None,
+    on_time=None,
+    max_exact_stops: int = None,
+    candidates: [[int]] = None,
+    addresses: [int] = None,
+) -> [int]:
+    """
+    Shortens a route, exactly when it has few enough stops and heuristically otherwise. A route with at most
+    max_exact_stops stops whose Held-Karp tables fit in exact_route_max_table_bytes is solved with Held-Karp, and the
+    optimal route is used if it keeps every delivery on time. Otherwise, or when the route is larger, the given route
+    is improved with 2-opt and Or-opt moves.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        distances ([[float]]): The symmetric distance matrix.
+        time_budget (float): The number of seconds to spend improving the route heuristically. Defaults to
+            route_improvement_time_budget, read when the search starts.
+        on_time (function): Returns True if a reordered route keeps its deliveries on time. Defaults to accepting
+            every route.
+        max_exact_stops (int): The largest number of stops solved exactly. Defaults to exact_route_max_stops, read
+            when the route is optimized.
+        candidates ([[int]]): The nearest addresses of each address to restrict the heuristic moves to. Defaults to
+            trying every move.
+        addresses ([int]): The address ID of each location of distances when they are a sub-matrix, such as the
+            stops from stop_distances, so solve_exact can remember the exact routes. Defaults to none.
+
+    Returns:
+        [int]: The shortened route, never longer than the given one.
+
+    Notes:
+        time complexity:
+            best case: O(2^n * n^2) for small routes
+            worst case: O(n^3) per round, bounded by the time budget
+            average case: O(n^2) per round
+        space complexity:
+            best case: O(n)
+            worst case: O(2^n * n)
+            average case: O(n)
+    """
+    if max_exact_stops is None:
+        max_exact_stops = __init__.exact_route_max_stops
+
+    if on_time is None:
+        on_time = lambda candidate: True
+
+    stop_count = len(route) - 2
+    if (
+        0 < stop_count <= max_exact_stops
+        and exact_table_bytes(stop_count) <= exact_route_max_table_bytes
+        and len(set(route[1:-1])) == stop_count
+    ):
+        exact_route = solve_exact(route, distances, addresses)  # O(2^n * n^2) - function call
+        if on_time(exact_route):
+            return exact_route
+
+    return improve_route(
+        route, distances, time_budget, on_time, candidates
+    )  # O(n^2) - function call
+
+
+# The distance matrix shared with a multi-start worker process, and the shared memory block holding it
+_worker_distances = None
+_worker_memory = None
+
+
+def share_distances(distances: [[float]]) -> shared_memory.SharedMemory:
+    """
+    Copies a distance matrix into a new shared memory block as rows of doubles, so worker processes can read it
+    without it being pickled for every task. The caller closes and unlinks the block when the workers are done.
+
+    Args:
+        distances ([[float]]): The square distance matrix.
+
+    Returns:
+        shared_memory.SharedMemory: The shared memory block holding the matrix.
+
+    Notes:
+        time complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+        space complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+    """
+    size = len(distances)
+    memory = shared_memory.SharedMemory(create=True, size=max(1, size * size) * 8)
+    view = memory.buf.cast("d")
+
+    for i in range(size):  # O(n) - for loop
+        view[i * size : (i + 1) * size] = array.array("d", distances[i])  # O(n) - row copy
+
+    view.release()
+    return memory
+
+
+def shared_rows(memory: shared_memory.SharedMemory, size: int) -> [memoryview]:
+    """
+    Returns the rows of a distance matrix in a shared memory block as views into the block, so distances[i][j]
+    indexing works without copying the matrix.
+
+    Args:
+        memory (shared_memory.SharedMemory): The shared memory block holding the matrix.
+        size (int): The number of rows and columns of the matrix.
+
+    Returns:
+        [memoryview]: A view of doubles for each row of the matrix.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    view = memory.buf.cast("d")
+
+    return [view[i * size : (i + 1) * size] for i in range(size)]  # O(n) - row views
+
+
+def _attach_distances(name: str, size: int) -> None:
+    """
+    Attaches a multi-start worker process to the shared distance matrix. Runs once when the worker starts.
+
+    Args:
+        name (str): The name of the shared memory block holding the matrix.
+        size (int): The number of rows and columns of the matrix.
+
+    Returns:
+        None
+    """
+    global _worker_distances, _worker_memory
+
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_distances = shared_rows(_worker_memory, size)
+
+
+def randomized_route(
+    route: [int],
+    distances: [[float]],
+    generator: random.Random,
+    choices: int = 3,
+    candidates: [[int]] = None,
+) -> [int]:
+    """
+    Builds a route through the stops of a route nearest address first, except that each step picks at random among
+    the few nearest unvisited stops, so every seed starts the improvement from a different route.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order. The first and last addresses stay in place.
+        distances ([[float]]): The distance matrix.
+        generator (random.Random): The random number generator to pick with.
+        choices (int): The number of nearest unvisited stops to pick among at each step. Defaults to 3.
+        candidates ([[int]]): The nearest addresses of each address to pick among first, falling back to every
+            unvisited stop when none of them is unvisited. Defaults to picking among every unvisited stop.
+
+    Returns:
+        [int]: The randomized route with the same first and last addresses.
+
+    Notes:
+        time complexity:
+            best case: O(n * k) with candidates
+            worst case: O(n^2 log n)
+            average case: O(n^2 log n), O(n * k) with candidates
+        space complexity:
+            best case: O(n)
+            worst case: O(n)
+            average case: O(n)
+    """
+    unvisited = set(route[1:-1])
+    randomized = [route[0]]
+
+    while len(unvisited) > 0:  # O(n) - while loop
+        row = distances[randomized[-1]]
+        nearest = []
+        if candidates is not None:
+            nearest = [i for i in candidates[randomized[-1]] if i in unvisited][:choices]  # O(k) - candidate scan
+        if len(nearest) == 0:
+            nearest = heapq.nsmallest(
+                choices, sorted(unvisited), key=lambda i: row[i]
+            )  # O(n log n) - nearest unvisited stops
+        next_stop = generator.choice(nearest)
+        randomized.append(next_stop)
+        unvisited.remove(next_stop)
+
+    return randomized + [route[-1]]
+
+
+def _multi_start_run(
+    route: [int],
+    seed: int,
+    time_budget: float,
+    start_time: int,
+    deadlines: dict,
+    speed,
+    min_locations: int,
+    k: int,
+) -> (float, [int]) or None:
+    """
+    Runs one start of a multi-start search in a worker process: the given route for seed 0 and a randomized route
+    otherwise, improved with 2-opt and Or-opt moves against the shared distance matrix. Every setting is passed in,
+    since a worker process started by spawn or forkserver only has the settings of __init__ at import.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order.
+        seed (int): The seed of the randomized route.
+        time_budget (float): The number of seconds to spend improving the route.
+        start_time (int): The time the truck leaves the first address.
+        deadlines (dict): The earliest delivery deadline for each address ID.
+        speed (float or delivery_time_calculator.SpeedProfile): The speed to travel at.
+        min_locations (int): The fewest addresses to use candidate lists for.
+        k (int): The number of nearest addresses in each candidate list.
+
+    Returns:
+        (float, [int]) or None: The distance and the improved route, or None if the route is not on time.
+    """
+    distances = _worker_distances
+    on_time = deadline_checker(route, distances, start_time, deadlines, speed)
+    candidates = route_candidates(distances, min_locations, k)
+
+    if seed == 0:
+        start = route
+    else:
+        start = randomized_route(
+            route, distances, random.Random(seed), candidates=candidates
+        )
+    improved = improve_route(start, distances, time_budget, on_time, candidates)
+
+    if not on_time(improved):
+        return None
+
+    return route_distance(improved, distances), improved
+
+
+def multi_start_route(
+    route: [int],
+    distances: [[float]],
+    start_time: int,
+    deadlines: dict,
+    starts: int = None,
+    time_budget: float = None,
+    workers: int = None,
+) -> [int]:
+    """
+    Improves a route from many starts in parallel and keeps the shortest. The given route and randomized nearest
+    address first routes are each improved with 2-opt and Or-opt moves in a process pool, with the distance matrix
+    shared through shared memory instead of pickled for every start.
+
+    Args:
+        route ([int]): The address IDs of the route in visiting order. The first and last addresses stay in place.
+        distances ([[float]]): The symmetric distance matrix.
+        start_time (int): The time the truck leaves the first address.
+        deadlines (dict): The earliest delivery deadline for each address ID.
+        starts (int): The number of starts, including the given route. Defaults to multi_start_routes, read when the
+            search starts.
+        time_budget (float): The number of seconds each start spends improving its route. Defaults to
+            route_improvement_time_budget, read when the search starts.
+        workers (int): The number of worker processes. Defaults to the number of processors.
+
+    Returns:
+        [int]: The shortest on time route found, never longer than the given one improved on its own.
+
+    Notes:
+        time complexity:
+            best case: O(s * n^2 / p)
+            worst case: O(s * n^3 / p) per round, bounded by the time budget
+            average case: O(s * n^2 / p)
+        space complexity:
+            best case: O(n^2)
+            worst case: O(n^2)
+            average case: O(n^2)
+    """
+    # Read the settings here, since the worker processes may not share them
+    if starts is None:
+        starts = __init__.multi_start_routes
+
+    if time_budget is None:
+        time_budget = __init__.route_improvement_time_budget
+
+    speed = delivery_time_calculator.current_speed()
+    min_locations = __init__.candidate_list_min_locations
+    k = __init__.candidate_neighbors
+
+    memory = share_distances(distances)  # O(n^2) - function call
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_distances,
+            initargs=(memory.name, len(distances)),
+        ) as executor:
+            results = list(
+                executor.map(
+                    _multi_start_run,
+                    [route] * max(1, starts),
+                    range(max(1, starts)),
+                    [time_budget] * max(1, starts),
+                    [start_time] * max(1, starts),
+                    [deadlines] * max(1, starts),
+                    [speed] * max(1, starts),
+                    [min_locations] * max(1, starts),
+                    [k] * max(1, starts),
+                )
+            )
+    finally:
+        memory.close()
+        memory.unlink()
+
+    # Ties go to the lowest seed, so the given route wins unless a randomized start is shorter
+    best = min(
+        (i for i in results if i is not None),
+        key=lambda i: i[0],
+        default=(None, route),
+    )
+
+    return best[1]
@@ -15,185 +15,127 @@
 #  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
 #
 #  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
-import copy
-import datetime
-
 import __init__
-import hash_table
+import delivery_time_calculator
 import package
+import package_history
 import truck
 
 
 def specific_package_at_time(
-    packages_table: hash_table.HashTable, package_id: int, time: datetime.time = None
-) -> package.Package or None:
-    found_package = packages_table.get(package_id)
-
-    if found_package is None:
-        return None
-
-    new_delivery_status = found_package.delivery_status
-
-    current_address_id, current_address_name, current_address = (
-        found_package.address_id,
-        found_package.address_name,
-        found_package.address,
-    )
-
-    if time.__class__ == datetime.time:
-        if found_package.modified_time != None and time < found_package.modified_time:
-            current_address_id, current_address_name, current_address = (
-                found_package.old_address_id,
-                found_package.old_address_name,
-                found_package.old_address,
-            )
-        else:
-            current_address_id, current_address_name, current_address = (
-                found_package.address_id,
-                found_package.address_name,
-                found_package.address,
-            )
-
-        if time < found_package.arrival_time:
-            new_delivery_status = "Not Available"
-        elif time < found_package.load_time:
-            new_delivery_status = "At Hub"
-        elif time < found_package.departure_time:
-            new_delivery_status = "At Hub"
-        elif time < found_package.delivery_time:
-            new_delivery_status = "En Route"
-        else:
-            new_delivery_status = "Delivered"
-
-    cloned_package = package.Package(
-        copy.deepcopy(found_package.id),
-        copy.deepcopy(current_address_id),
-        copy.deepcopy(current_address_name),
-        copy.deepcopy(current_address),
-        copy.deepcopy(found_package.city),
-        copy.deepcopy(found_package.state),
-        copy.deepcopy(found_package.zip),
-        copy.deepcopy(found_package.delivery_deadline),
-        copy.deepcopy(found_package.weight_kilo),
-        copy.deepcopy(found_package.special_notes),
-        new_delivery_status,
-        copy.deepcopy(found_package.truck_id),
-        copy.deepcopy(found_package.arrival_time),
-        copy.deepcopy(found_package.load_time),
-        copy.deepcopy(found_package.departure_time),
-        copy.deepcopy(found_package.delivery_time),
-        copy.deepcopy(found_package.modified_time),
-    )
-
-    return cloned_package
+    packages_table: package.PackageTable, package_id: int, time: int = None
+) -> package_history.PackageVersion or None:
+    """
+    Returns the package with the given ID as it was at a given time.
+
+    Args:
+        packages_table (package.PackageTable): The package table to look the package up in.
+        package_id (int): The ID of the package.
+        time (int): The time to look the package up at. Defaults to after every event of the day.
+
+    Returns:
+        package_history.PackageVersion or None: The package at the given time, or None if the package does not exist.
+
+    Notes:
+        time complexity:
+            best case: O(log n)
+            worst case: O(n log n)
+            average case: O(log n)
+        space complexity:
+            best case: O(1)
+            worst case: O(n log n)
+            average case: O(1)
+    """
+    if time is None:
+        time = delivery_time_calculator.latest_time
+
+    # Read the package from the snapshot of the table at the given time
+    return packages_table.snapshot(time).get(package_id)  # O(log n) - snapshot get
 
 
 def package_status_at_time(
-    packages_list: [package.Package],
-    time: datetime.time = None,
-) -> [package.Package]:
-    cloned_packages_list = []
-
-    for i in packages_list:  # O(n) - for loop
-        if time.__class__ == datetime.time:
-            if time < i.arrival_time:
-                i.delivery_status = "Not Available"
-            elif time < i.load_time:
-                i.delivery_status = "At Hub"
-            elif time < i.departure_time:
-                i.delivery_status = "At Hub"
-            elif time < i.delivery_time:
-                i.delivery_status = "En Route"
-            else:
-                i.delivery_status = "Delivered"
-
-        current_address_id, current_address_name, current_address = (
-            i.address_id,
-            i.address_name,
-            i.address,
-        )
+    packages_table: package.PackageTable,
+    time: int = None,
+) -> [package_history.PackageVersion]:
+    """
+    Returns every package as it was at a given time, in ascending package ID order.
 
-        if i.modified_time is not None and i.modified_time > time:
-            current_address_id, current_address_name, current_address = (
-                i.old_address_id,
-                i.old_address_name,
-                i.old_address,
-            )
-
-        package_copy = package.Package(
-            i.id,
-            current_address_id,
-            current_address_name,
-            current_address,
-            i.city,
-            i.state,
-            i.zip,
-            i.delivery_deadline,
-            i.weight_kilo,
-            i.special_notes,
-            i.delivery_status,
-            i.truck_id,
-            i.arrival_time,
-            i.load_time,
-            i.departure_time,
-            i.delivery_time,
-            i.modified_time,
-        )
-        cloned_packages_list.append(package_copy)
+    Args:
+        packages_table (package.PackageTable): The package table to read the packages from.
+        time (int): The time to read the packages at. Defaults to after every event of the day.
 
-    return cloned_packages_list
+    Returns:
+        [package_history.PackageVersion]: The packages at the given time.
+
+    Notes:
+        time complexity:
+            best case: O(n)
+            worst case: O(n log n)
+            average case: O(n)
+        space complexity:
+            best case: O(n)
+            worst case: O(n log n)
+            average case: O(n)
+    """
+    if time is None:
+        time = delivery_time_calculator.latest_time
+
+    # Read the packages from the snapshot of the table at the given time
+    return [i[1] for i in packages_table.snapshot(time).items()]  # O(n) - snapshot iteration
 
 
 def distance_traveled(
     truck: truck.Truck,
-    packages_at_time: [package.Package],
-    time: datetime.time,
+    packages: package.PackageTable,
+    time: int,
 ) -> float:
     """
     Returns the distance traveled by each truck at a given time.
 
     Args:
         truck (data_structures_and_algorithms_ii.truck.Truck): The truck to check the distance of.
-        packages_at_time (list) : A list of packages at a given time.
+        packages (package.PackageTable) : The package table to look up the packages of the truck in.
+        time (int): The time to check the distance at.
 
     Returns:
         float: distance traveled by the truck.
 
     Notes:
         time complexity:
-            best case: O(n^2)
-            worst case: O(n^2)
-            average case: O(n^2)
+            best case: O(k log k)
+            worst case: O(k log k)
+            average case: O(k log k)
 
         space complexity:
-            best case: O(n)
-            worst case: O(n)
-            average case: O(n)
+            best case: O(k)
+            worst case: O(k)
+            average case: O(k)
     """
 
-    # Add all the packages in the truck to a list
-    packages_in_truck = []
-    for package in packages_at_time:  # O(n) - for loop
-        if package.truck_id == truck.id:
-            packages_in_truck.append(package)
+    # Look up the packages in the truck in the truck id index
+    packages_in_truck = [
+        packages.get(i) for i in packages.lookup("truck_id", truck.id)
+    ]  # O(k log k) - index lookup
 
-    # Sort the packages by delivery time
-    packages_in_truck = sorted(
-        packages_in_truck, key=lambda x: x.delivery_time
-    )  # O(n log n) - sort
-
-    # Add all the delivered packages to a list
+    # Add all the packages delivered by the given time to a list
     delivered_packages = []
-    for package in packages_in_truck:  # O(n) - for loop
-        if package.delivery_status == "Delivered":
+    for package in packages_in_truck:  # O(k) - for loop
+        if package.delivery_time is not None and package.delivery_time <= time:
             delivered_packages.append(package)
 
+    # Sort the delivered packages by delivery time
+    delivered_packages = sorted(
+        delivered_packages, key=lambda x: x.delivery_time
+    )  # O(k log k) - sort
+
     # Add all the addresses of the delivered packages to a list
     delivered_addresses = [0]
-    for package in delivered_packages:  # O(n) - for loop
+    delivered_address_set = {0}
+    for package in delivered_packages:  # O(k) - for loop
         address_id = package.address_id
-        if address_id not in delivered_addresses:  # O(n) - list search
+        if address_id not in delivered_address_set:  # O(1) - set search
             delivered_addresses.append(address_id)
+            delivered_address_set.add(address_id)
 
     # Calculate the distance traveled by the truck
     current_address = 0
@@ -201,36 +143,37 @@ def distance_traveled(
 
     # Add the distances between the delivered addresses
     for address_id in delivered_addresses:  # O(n) - for loop
-        distance_visited += __init__.distances[current_address][address_id]
+        distance_visited += __init__.distances.dist(current_address, address_id)
         current_address = address_id
 
     # Add the distance back to the hub if the truck has returned
     if truck.return_time <= time:
-        distance_visited += __init__.distances[current_address][0]
+        distance_visited += __init__.distances.dist(current_address, 0)
 
     return distance_visited
 
 
 def total_distance_traveled(
     trucks: [truck.Truck],
-    packages_at_time: [package.Package],
-    time: datetime.time,
+    packages: package.PackageTable,
+    time: int,
 ) -> float:
     """
     Returns the total distance traveled by all trucks at a given time.
 
     Args:
         trucks (list): A list of trucks.
-        packages_at_time (list) : A list of packages at a given time.
+        packages (package.PackageTable) : The package table to look up the packages of the trucks in.
+        time (int): The time to check the distance at.
 
     Returns:
         float: total distance traveled by all trucks.
 
     Notes:
         time complexity:
-            best case: O(n^3)
-            worst case: O(n^3)
-            average case: O(n^3)
+            best case: O(n log n)
+            worst case: O(n log n)
+            average case: O(n log n)
 
         space complexity:
             best case: O(n)
@@ -241,14 +184,14 @@ def total_distance_traveled(
 
     # Add the distance traveled by each truck to the total distance
     for truck in trucks:  # O(n) - for loop
-        total_distance += distance_traveled(truck, packages_at_time, time)
+        total_distance += distance_traveled(truck, packages, time)
 
     return total_distance
 
 
 def distance_traveled_at_time(
-    package_list_at_time: [package.Package],
-    input_time: datetime.time,
+    packages: package.PackageTable,
+    input_time: int,
     trucks=__init__.trucks,
 ):
     distance_traveled_list = []
@@ -258,12 +201,12 @@ def distance_traveled_at_time(
 
     for i in trucks:  # O(n) - for loop
         truck_distance_traveled = distance_traveled(
-            i, package_list_at_time, input_time
-        )  # O(n^2) - function call
+            i, packages, input_time
+        )  # O(k log k) - function call
 
         distance_traveled_list.append(truck_distance_traveled)
 
-        total_distance_traveled_at_time += distance_traveled
+        total_distance_traveled_at_time += truck_distance_traveled
         total_distance_traveled_by_end_of_day += i.distance_traveled
 
         truck_status = ""
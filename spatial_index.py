@@ -0,0 +1,234 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import math
+
+# The number of points a grid cell holds on average
+points_per_cell = 2
+
+
+class GridIndex:
+    """
+    A uniform grid over points in the plane, for finding the nearest point to a point without measuring the distance
+    to every point. Each cell holds the points inside it, and a search looks at the cells in rings of growing size
+    around the point it starts from, so it only measures the distances to points near the nearest one.
+
+    Attributes:
+        points ([(float, float)]): The x and y coordinates of each point.
+        min_x (float): The smallest x coordinate of the points.
+        min_y (float): The smallest y coordinate of the points.
+        cell_size (float): The width and height of a cell.
+        cells (dict): The points in each cell, keyed by the column and row of the cell.
+    """
+
+    def __init__(self, points: [(float, float)]):
+        """
+        Places every point in a cell of a grid sized for points_per_cell points per cell on average.
+
+        Args:
+            points ([(float, float)]): The x and y coordinates of each point.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        self.points = points
+        self.min_x = min((i[0] for i in points), default=0.0)
+        self.min_y = min((i[1] for i in points), default=0.0)
+        width = max((i[0] for i in points), default=0.0) - self.min_x
+        height = max((i[1] for i in points), default=0.0) - self.min_y
+
+        # Fit the cells to the area the points cover, with room for the points on the far edges
+        area = max(width * height, max(width, height) ** 2 / max(1, len(points)), 1e-12)
+        self.cell_size = math.sqrt(area * points_per_cell / max(1, len(points)))
+
+        self.cells = {}
+        for i in range(len(points)):  # O(n) - for loop
+            self.cells.setdefault(self.cell(i), []).append(i)
+
+    def cell(self, point: int) -> (int, int):
+        """
+        Returns the cell a point is in.
+
+        Args:
+            point (int): The index of the point.
+
+        Returns:
+            (int, int): The column and row of the cell.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        x, y = self.points[point]
+        return int((x - self.min_x) // self.cell_size), int((y - self.min_y) // self.cell_size)
+
+    def distance(self, i: int, j: int) -> float:
+        """
+        Returns the straight line distance between two points.
+
+        Args:
+            i (int): The index of the first point.
+            j (int): The index of the second point.
+
+        Returns:
+            float: The distance between the points.
+
+        Notes:
+            time complexity: O(1)
+            space complexity: O(1)
+        """
+        return math.dist(self.points[i], self.points[j])
+
+    def cursor(self, visited_point_indices: [int] = ()) -> "GridCursor":
+        """
+        Creates a cursor over the grid that skips the given points.
+
+        Args:
+            visited_point_indices ([int]): The points that are already visited or must never be visited.
+
+        Returns:
+            GridCursor: A cursor for finding the nearest unvisited points.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        return GridCursor(self, visited_point_indices)
+
+
+class GridCursor:
+    """
+    Finds the nearest unvisited point to a point of a grid index, taking visited points out of their cells.
+
+    Attributes:
+        index (GridIndex): The grid index the cursor searches.
+        cells (dict): The unvisited points in each cell that has any, keyed by the column and row of the cell.
+    """
+
+    def __init__(self, index: GridIndex, visited_point_indices: [int] = ()):
+        """
+        Creates a cursor over a grid index.
+
+        Args:
+            index (GridIndex): The grid index to search.
+            visited_point_indices ([int]): The points that are already visited or must never be visited.
+
+        Notes:
+            time complexity: O(n)
+            space complexity: O(n)
+        """
+        self.index = index
+        visited = set(visited_point_indices)
+
+        self.cells = {}
+        for cell, points in index.cells.items():  # O(n) - for loop over every point of every cell
+            unvisited = [i for i in points if i not in visited]
+            if len(unvisited) > 0:
+                self.cells[cell] = unvisited
+
+    def visit(self, point: int) -> None:
+        """
+        Marks a point as visited.
+
+        Args:
+            point (int): The index of the visited point.
+
+        Notes:
+            time complexity: O(c), where c is the number of points in the cell of the point
+            space complexity: O(1)
+        """
+        cell = self.index.cell(point)
+        points = self.cells.get(cell)
+
+        if points is not None and point in points:
+            points.remove(point)  # O(c) - list remove
+            if len(points) == 0:
+                del self.cells[cell]
+
+    def nearest(self, point: int) -> int or None:
+        """
+        Get the nearest unvisited point to a point. Ties in distance go to the lower index, the same as
+        nearest_neighbor.sorted_unvisited_neighbors.
+
+        The cells are searched in square rings around the cell of the point. Every point outside the rings searched so
+        far is at least ring * cell_size away, so the search stops once the nearest point found is closer than that.
+        When the rings would hold more cells than there are cells with unvisited points, those cells are searched
+        directly instead.
+
+        Args:
+            point (int): The index of the point to search from.
+
+        Returns:
+            int or None: The index of the nearest unvisited point. None if every point has been visited.
+
+        Notes:
+            time complexity: O(1) for evenly spread points, O(n) worst case
+            space complexity: O(1)
+        """
+        if len(self.cells) == 0:
+            return None
+
+        column, row = self.index.cell(point)
+        distance = self.index.distance
+        best = None
+        ring = 0
+
+        while True:  # O(r) - while loop over rings
+            if (2 * ring + 1) ** 2 > len(self.cells):
+                # The rings cover more cells than are left, so search the cells that are left
+                for points in self.cells.values():  # O(n) - for loop
+                    for i in points:  # O(c) - for loop
+                        key = (distance(point, i), i)
+                        if best is None or key < best:
+                            best = key
+                return best[1]
+
+            for cell in _ring(column, row, ring):  # O(r) - for loop over the cells of the ring
+                for i in self.cells.get(cell, ()):  # O(c) - for loop
+                    key = (distance(point, i), i)
+                    if best is None or key < best:
+                        best = key
+
+            # A point in a later ring is at least this far away, and a tie there could have a lower index
+            if best is not None and best[0] < ring * self.index.cell_size:
+                return best[1]
+
+            ring += 1
+
+
+def _ring(column: int, row: int, ring: int) -> [(int, int)]:
+    """
+    Returns the cells on the border of the square of cells around a cell.
+
+    Args:
+        column (int): The column of the center cell.
+        row (int): The row of the center cell.
+        ring (int): The distance of the border from the center cell in cells, 0 for the center cell itself.
+
+    Returns:
+        [(int, int)]: The column and row of each cell on the border.
+
+    Notes:
+        time complexity: O(r)
+        space complexity: O(r)
+    """
+    if ring == 0:
+        return [(column, row)]
+
+    cells = []
+    for i in range(-ring, ring + 1):  # O(r) - for loop
+        cells.append((column + i, row - ring))
+        cells.append((column + i, row + ring))
+    for i in range(-ring + 1, ring):  # O(r) - for loop
+        cells.append((column - ring, row + i))
+        cells.append((column + ring, row + i))
+
+    return cells
@@ -0,0 +1,298 @@
+#  MIT License
+#
+#  Copyright (c) 2024 Sheldon Handler
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import concurrent.futures
+import itertools
+import math
+import os
+import random
+import tempfile
+import threading
+
+import delivery_time_calculator
+import distance_file
+import distance_matrix
+import hash_table
+import package
+import package_file
+import package_history
+import read_csv_file
+import route_optimizer
+
+
+def test_concurrent_table_resize() -> None:
+    """
+    Adds keys to a small concurrent hash table from many threads at once, so it grows while other threads write, and
+    checks that no pair is lost or duplicated and the keys stay in order.
+
+    Returns:
+        None
+    """
+    table = hash_table.ConcurrentHashTable(size=2, stripes=4)
+    threads = 8
+    keys_per_thread = 5_000
+    barrier = threading.Barrier(threads)
+
+    def write(thread: int) -> None:
+        barrier.wait()
+        for key in range(thread, threads * keys_per_thread, threads):
+            table.add(key, -key)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(write, range(threads)))
+
+    key_count = threads * keys_per_thread
+    assert len(table) == key_count, f"Table has {len(table)} keys instead of {key_count}."
+    assert len(table.table) > 2, "Table never grew."
+    assert table.ordered_keys == list(range(key_count)), "Keys are out of order or missing."
+    assert all(table.get(i) == -i for i in range(key_count)), "A key lost its value."
+    assert sum(len(i) for i in table.table) == key_count, "A pair was stored twice."
+
+
+def test_direct_address_fallback() -> None:
+    """
+    Stores dense package IDs together with negative and far away integer keys in a direct address hash table, and
+    checks the dense keys go to the slot list, the others to the chaining buckets, and every key reads, updates and
+    iterates in order either way.
+
+    Returns:
+        None
+    """
+    table = hash_table.DirectAddressHashTable()
+    dense = list(range(1, 41))
+    sparse = [-7, -1, 10**9, 10**12]
+
+    for key in dense + sparse:
+        table.add(key, str(key))
+
+    assert table.direct_count == len(dense), f"{table.direct_count} keys are directly addressed."
+    assert table.chained_count == len(sparse), f"{table.chained_count} keys are chained."
+    assert all(table.get(i) == str(i) for i in dense + sparse), "A key lost its value."
+    assert table.get(-2) is None and table.get(10**9 + 1) is None, "A missing key was found."
+
+    table.update(-7, "updated")
+    table.update(10**12, "updated")
+    assert table.get(-7) == "updated" and table.get(10**12) == "updated", "A chained key was not updated."
+    assert table.chained_count == len(sparse), "Updating a chained key moved it."
+
+    assert [i[0] for i in table.items()] == sorted(dense + sparse), "Keys are out of order."
+    assert len(table) == len(dense) + len(sparse), f"Table has {len(table)} keys."
+
+
+def test_persistent_vector_snapshots() -> None:
+    """
+    Sets values one at a time in persistent vectors of one, two and three tree levels, and checks every earlier
+    version still reads its own values while each new version shares every node off the changed path.
+
+    Returns:
+        None
+    """
+    generator = random.Random(0)
+
+    for size in (1, 32, 33, 1024, 1025, 5000):
+        versions = [package_history.PersistentVector.from_list(list(range(size)))]
+        expected = [list(range(size))]
+
+        for step in range(50):
+            index = generator.randrange(size)
+            versions.append(versions[-1].set(index, -step - 1))
+            expected.append(list(expected[-1]))
+            expected[-1][index] = -step - 1
+
+        for vector, values in zip(versions, expected):
+            assert len(vector) == size, f"A vector of {size} values has length {len(vector)}."
+            assert list(vector) == values, f"A version of {size} values changed."
+            assert all(vector.get(i) == values[i] for i in range(size)), f"A version of {size} values reads wrong."
+
+        if size > package_history.PersistentVector.width:
+            # Only the root to leaf path of the set index is copied, so every other child of the root is shared
+            shared = sum(i is j for i, j in zip(versions[0].root, versions[1].root))
+            assert shared == len(versions[0].root) - 1, f"A vector of {size} values copied more than the changed path."
+
+
+def test_speed_profile_fifo() -> None:
+    """
+    Leaves every second around each period boundary of a speed profile, including a period shorter than a minute and
+    the wrap past midnight, and checks that leaving later never means arriving earlier. Checks that the travel time
+    tables give the same times as the profile.
+
+    Returns:
+        None
+    """
+    profile = delivery_time_calculator.SpeedProfile(
+        [(7 * 3600, 12), (9 * 3600, 40), (9 * 3600 + 30, 5), (17 * 3600, 25)]
+    )
+    seconds_per_day = delivery_time_calculator.seconds_per_day
+    boundaries = profile.starts + [seconds_per_day]
+    distances = distance_matrix.DistanceMatrix.from_rows([[0.0, 0.4, 3.0], [0.4, 0.0, 17.5], [3.0, 17.5, 0.0]])
+    tables = delivery_time_calculator.travel_times(distances, profile)
+
+    for distance in (0.0, 0.05, 0.4, 3.0, 17.5, 60.0):
+        for boundary in boundaries:
+            last_arrival = None
+            for departure in range(boundary - 3600, boundary + 3600):
+                arrival = departure + profile.travel_time(distance, departure)
+                assert last_arrival is None or arrival >= last_arrival, (
+                    f"Leaving at {departure} to drive {distance} miles arrives before leaving a second earlier."
+                )
+                last_arrival = arrival
+
+    for i, j in ((0, 1), (1, 2), (0, 2)):
+        for boundary in boundaries:
+            for departure in range(boundary - 120, boundary + 120, 7):
+                assert tables.time(i, j, departure) == profile.travel_time(distances.dist(i, j), departure), (
+                    f"The travel time tables differ from the profile leaving at {departure}."
+                )
+
+
+def test_held_karp_matches_brute_force() -> None:
+    """
+    Solves small random routes with Held-Karp, open and closed, and checks each is as short as the shortest of every
+    order of its stops, keeps its first and last addresses, and visits every stop once.
+
+    Returns:
+        None
+    """
+    generator = random.Random(0)
+
+    for size in range(1, 8):
+        for seed in range(10):
+            points = [(generator.random(), generator.random()) for _ in range(size + 2)]
+            distances = [[math.dist(i, j) for j in points] for i in points]
+            stops = generator.sample(range(1, size + 2), size)
+            last = generator.choice((0, size + 1 if size + 1 not in stops else 0))
+
+            route = [0] + stops + [last]
+            exact = route_optimizer.solve_exact(route, distances)
+            shortest = min(
+                route_optimizer.route_distance([0, *i, last], distances)
+                for i in itertools.permutations(stops)
+            )
+
+            assert exact[0] == 0 and exact[-1] == last, f"Held-Karp moved the ends of {route}."
+            assert sorted(exact[1:-1]) == sorted(stops), f"Held-Karp changed the stops of {route}."
+            assert route_optimizer.route_distance(exact, distances) <= shortest + 1e-9, (
+                f"Held-Karp found a longer route than the shortest order of {route}."
+            )
+
+
+def test_package_file_round_trip() -> None:
+    """
+    Saves a package table with dump and opens it again with open_saved, and checks every package reads back the same,
+    no temporary file is left behind, and a run with other inputs or a missing file gets nothing back.
+
+    Returns:
+        None
+    """
+    table = package.PackageTable()
+    for i in range(1, 41):
+        table.add(
+            i,
+            package.Package(
+                id=i,
+                address_id=i % 7,
+                address_name=f"Location {i % 7}",
+                address=f"{i % 7} Main St",
+                city="Salt Lake City",
+                state="UT",
+                zip="84101",
+                delivery_deadline="10:30 AM" if i % 3 else "EOD",
+                weight_kilo=i,
+                special_notes=None if i % 2 else f"Note {i}",
+                delivery_status="Delivered" if i % 5 else None,
+                truck_id=i % 3 + 1,
+                delivery_time=i * 60,
+            ),
+        )
+    expected = {
+        key: tuple(getattr(value, i) for i in package_history.package_fields[:17])
+        for key, value in table.items()
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "package.bin")
+        inputs = package_file.input_hash([None], ["round trip"])
+        other_inputs = package_file.input_hash([None], ["other run"])
+
+        assert package_file.open_saved(file, inputs) is None, "A missing package table file was opened."
+
+        package_file.dump(table, file, inputs)
+        assert os.listdir(directory) == ["package.bin"], "Saving the package table left a temporary file behind."
+
+        saved = package_file.open_saved(file, inputs)
+        assert saved is not None, "The package table saved with the same inputs was not opened."
+        with saved:
+            assert len(saved) == len(table), "The saved package table has a different number of packages."
+            for key, value in expected.items():
+                record = saved.get(key)
+                assert tuple(record[:17]) == value, f"Package {key} changed in the saved package table."
+
+        assert package_file.open_saved(file, other_inputs) is None, (
+            "The package table saved by a run with other inputs was opened."
+        )
+
+
+def test_distance_cache_invalidation() -> None:
+    """
+    Reads distance csv files through the distance cache, changes the contents of one of them, and checks the changed
+    file is read again with its new distances, the cache of its old contents is removed, and the cache of the other
+    file is kept.
+
+    Returns:
+        None
+    """
+    reads = []
+
+    def read(file: str) -> distance_matrix.DistanceMatrix:
+        reads.append(file)
+        return read_csv_file.parse_distances(file)
+
+    def write(file: str, distance: float) -> None:
+        with open(file, "w") as file_open:
+            file_open.write(f"0.0,,\n{distance},0.0,\n2.5,1.5,0.0\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_directory = os.path.join(directory, "cache")
+        source_file = os.path.join(directory, "distance.csv")
+        other_file = os.path.join(directory, "other.csv")
+        write(source_file, 3.5)
+        write(other_file, 4.5)
+
+        assert distance_file.cached_distances(source_file, read, cache_directory)[1][0] == 3.5, "Wrong distance read."
+        distance_file.cached_distances(other_file, read, cache_directory)
+        old_cache = distance_file.cache_file(source_file, cache_directory)
+        other_cache = distance_file.cache_file(other_file, cache_directory)
+
+        assert distance_file.cached_distances(source_file, read, cache_directory)[1][0] == 3.5, "Wrong cached distance."
+        assert reads == [source_file, other_file], "An unchanged distance file was read again instead of its cache."
+
+        write(source_file, 6.0)
+        distances = distance_file.cached_distances(source_file, read, cache_directory)
+
+        assert reads[-1] == source_file, "A changed distance file was not read again."
+        assert distances[1][0] == 6.0 and distances[0][1] == 6.0, "The cache of the old contents was used."
+        assert not os.path.exists(old_cache), "The cache of the old contents of the distance file was not removed."
+        assert os.path.exists(distance_file.cache_file(source_file, cache_directory)), "No cache was written."
+        assert os.path.exists(other_cache), "The cache of another distance file was removed."
+        assert distance_file.cached_distances(source_file, read, cache_directory)[1][0] == 6.0, (
+            "The cache of the new contents has the wrong distance."
+        )
+
+
+if __name__ == "__main__":
+    test_concurrent_table_resize()
+    test_direct_address_fallback()
+    test_persistent_vector_snapshots()
+    test_speed_profile_fifo()
+    test_held_karp_matches_brute_force()
+    test_package_file_round_trip()
+    test_distance_cache_invalidation()
+    print("All behavior tests passed")
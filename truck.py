@@ -8,11 +8,10 @@
 #
 #  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import datetime
-
 import __init__
 import delivery_time_calculator
 import nearest_neighbor
+import route_optimizer
 
 
 class Truck:
@@ -23,6 +22,8 @@ class Truck:
         truck_status (TruckStatus): The status of the truck.
         distance_traveled (float): The distance the truck has traveled.
         packages (list[int]): The list of package IDs the truck is carrying.
+        address_packages (dict): The IDs of the packages the truck is carrying for each address ID.
+        addresses_not_yet_delivered (set[int]): The address IDs the truck still has packages for.
 
 
     Returns:
@@ -34,10 +35,10 @@ class Truck:
         id: int,
         truck_status: str,
         distance_traveled: float = None,
-        departure_time: datetime.time = None,
-        truck_time: datetime.time = None,
+        departure_time: int = None,
+        truck_time: int = None,
         current_address: int = 0,
-        # load_time: datetime.time = None,
+        # load_time: int = None,
     ):
         """
         Initializes the truck class with its information.
@@ -52,6 +53,7 @@ class Truck:
         self.truck_status = truck_status
         self.distance_traveled = distance_traveled
         self.packages = []
+        self.address_packages = {}
         self.addresses = [0]
         self.packages_delivered = []
         self.departure_time = departure_time
@@ -61,7 +63,8 @@ class Truck:
         self.traveled_distances = []
         self.current_address = current_address
         self.addresses_not_in_this_truck = []
-        self.addresses_not_yet_delivered = []
+        self.addresses_not_yet_delivered = set()
+        self.neighbor_cursor = None
 
     def update_truck_status(self, truck_status: str) -> bool:
         """Updates the truck status.
@@ -87,13 +90,13 @@ class Truck:
     def load_truck(
         self,
         package_id: int,
-        load_time: datetime.time = datetime.time(hour=8, minute=2),
+        load_time: int = delivery_time_calculator.clock_time(8, 2),
     ) -> None:
         """Loads a package onto the truck.
 
         Args:
             package_id (int): The ID of the package to load onto the truck.
-            load_time (datetime.time): The time the package is loaded onto the truck.
+            load_time (int): The time the package is loaded onto the truck.
 
         Returns:
             None
@@ -102,7 +105,7 @@ class Truck:
             time complexity:
                 best case = O(1)
                 worst case = O(n)
-                average case = O(n)
+                average case = O(1)
             space complexity:
                 best case = O(1)
                 worst case = O(1)
@@ -114,50 +117,56 @@ class Truck:
         package.load_package(self.id, load_time)
         # Add the package ID to the truck's packages list
         self.packages.append(package_id)
-        # Add the address ID to list of addresses
-        if package.address_id not in self.addresses:  # O(n) - list search
+        # Add the address ID to list of addresses the first time the truck carries a package for it
+        address_package_ids = self.address_packages.setdefault(package.address_id, [])  # O(1) - dict lookup
+        if not address_package_ids and package.address_id != self.addresses[0]:
             self.addresses.append(package.address_id)
-            self.addresses_not_yet_delivered.append(package.address_id)
+            self.addresses_not_yet_delivered.add(package.address_id)
+        address_package_ids.append(package_id)
         # Update the package in the package hash table
         __init__.packages.update(package_id, package)  # O(n) - hash table update
 
-    def depart_truck(self, departure_time: datetime.time):
+    def depart_truck(self, departure_time: int):
         """Sends the truck to deliver the packages. Updates departure_time and delivery_status attributes of the
         packages in the truck.
 
         Args:
-            departure_time (datetime.time): The time that the truck will depart to deliver the packages.
+            departure_time (int): The time that the truck will depart to deliver the packages.
 
         Returns:
             None
 
         Notes:
             time complexity:
-                best case = O(n^2)
-                worst case = O(n^2)
-                average case = O(n^2)
+                best case = O(n)
+                worst case = O(n^2 log n) to build the neighbor index on the first departure
+                average case = O(n)
             space complexity:
-                best case = O(1)
-                worst case = O(1)
-                average case = O(1)
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
         """
         self.truck_status = "En Route"
         self.departure_time = departure_time
         self.truck_time = departure_time
 
-        # Loop through the packages the truck is carrying
-        for i in self.packages:  # O(n) - for loop
-            # Update the package in the package hash table
-            __init__.packages.get(i).package_departure(
-                departure_time
-            )  # O(n) - hash table get
+        # Get every package the truck is carrying in one batch and send it out
+        for i in __init__.packages.get_many(self.packages):  # O(n) - batch get
+            i.package_departure(departure_time)
 
         # Find addresses not in this truck
+        stops = set(self.addresses)
         self.addresses_not_in_this_truck = []
         for address in __init__.addresses:  # O(n) - for loop
-            if address.id not in self.addresses:
+            if address.id not in stops:  # O(1) - set search
                 self.addresses_not_in_this_truck.append(address.id)
 
+        # Skip the addresses the truck does not deliver to and the ones it has visited when finding the nearest address
+        self.neighbor_cursor = nearest_neighbor.neighbor_cursor(
+            __init__.distances,
+            self.addresses_not_in_this_truck + self.visited_addresses,
+        )  # O(n^2 log n) - function call on the first departure
+
     def sort_addresses(self) -> [int]:
         """
         Sorts the addresses by distance from the current address.
@@ -176,7 +185,7 @@ class Truck:
                 average case = O(n)
         """
         sorted_addresses = nearest_neighbor.sorted_unvisited_neighbors(  # O(n^2 log n)
-            __init__.distances[self.current_address],
+            __init__.distances.row(self.current_address),
             (self.addresses_not_in_this_truck + self.visited_addresses),
         )
 
@@ -184,17 +193,34 @@ class Truck:
 
     def nearest_address(self) -> int:
         """
+        Finds the nearest address the truck has not delivered to yet.
 
         Returns:
             int: ID of Address closes to current location
 
+        Notes:
+            time complexity:
+                best case = O(1)
+                worst case = O(n^2 log n)
+                average case = O(1) amortized
+            space complexity:
+                best case = O(1)
+                worst case = O(n)
+                average case = O(1)
         """
-        return self.sort_addresses()[0]
+        if self.neighbor_cursor is None:
+            return self.sort_addresses()[0]  # O(n^2 log n) - function call
 
-    def return_truck(self):
+        return self.neighbor_cursor.nearest(self.current_address)  # O(1) amortized - cursor advance
+
+    def return_truck(self, return_time: int = None):
         """
         Brings the truck back to the hub.
 
+        Args:
+            return_time (int): The time the truck gets back to the hub, when already known. Defaults to the time
+                after driving back.
+
         Returns:
             None
 
@@ -208,11 +234,12 @@ class Truck:
                 worst case = O(1)
                 average case = O(1)
         """
-        distance_between = __init__.distances[self.current_address][0]
-        self.truck_time = delivery_time_calculator.time_updater(
-            self.truck_time,
-            distance_between,
-        )  # O(n) - function call
+        distance_between = __init__.distances.dist(self.current_address, 0)
+        if return_time is None:
+            return_time = self.truck_time + delivery_time_calculator.travel_time_function(__init__.distances)(
+                self.current_address, 0, self.truck_time
+            )  # O(1) - travel time lookup once the tables are built
+        self.truck_time = return_time
         self.return_time = self.truck_time
         self.traveled_distances.append(distance_between)
         self.distance_traveled += distance_between
@@ -220,47 +247,44 @@ class Truck:
         self.truck_status = "At Hub"
         # print(f"Truck {self.id} has returned to the hub at {self.truck_time}.\n")
 
-    def deliver(self, address_id: int) -> None:
+    def deliver(self, address_id: int, delivery_time: int = None) -> None:
         """
         Delivers a package to an address.
 
         Args:
             address_id (int): ID of the address to deliver.
+            delivery_time (int): The time the truck arrives at the address, when already known. Defaults to the time
+                after driving there.
 
         Returns:
             None
 
         Notes:
             time complexity:
-                best case = O(n^3)
-                worst case = O(n^3)
-                average case = O(n^3)
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
             space complexity:
-                best case = O(n)
-                worst case = O(n)
-                average case = O(n)
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
         """
 
-        distance_between = __init__.distances[self.current_address][address_id]
+        if delivery_time is None:
+            delivery_time = self.truck_time + delivery_time_calculator.travel_time_function(__init__.distances)(
+                self.current_address, address_id, self.truck_time
+            )  # O(1) - travel time lookup once the tables are built
 
-        delivery_time = delivery_time_calculator.time_updater(
-            self.truck_time, distance_between
-        )
+        # Look up the packages on this truck for the address in the map built while loading
+        package_ids = self.address_packages.get(address_id, [])  # O(1) - dict lookup
 
-        package_list = __init__.packages.get_all()  # O(n^2) - function call
-        item_values = [i[1] for i in package_list]  # O(n) - list comprehension
-
-        # Loop through the package IDs to deliver the package
-        for i in item_values:  # O(n) - for loop
-            if i.address_id == address_id:
-                if i.id in self.packages:  # O(n) - list search
-                    __init__.packages.get(
-                        i.id  # O(n) - hash table get
-                    ).deliver_package(delivery_time)
-                    self.packages_delivered.append(i.id)
+        # Get the packages in one batch and deliver them
+        for package in __init__.packages.get_many(package_ids):  # O(k) - batch get
+            package.deliver_package(delivery_time)
+        self.packages_delivered.extend(package_ids)
 
         # Update the truck's distance traveled
-        added_distance = __init__.distances[self.current_address][address_id]
+        added_distance = __init__.distances.dist(self.current_address, address_id)
         self.traveled_distances.append(added_distance)
         self.distance_traveled += added_distance
 
@@ -272,30 +296,200 @@ class Truck:
 
         # Update the truck's visited addresses
         self.visited_addresses.append(address_id)
+        if self.neighbor_cursor is not None:
+            self.neighbor_cursor.visit(address_id)
 
         # Update the truck's addresses not in this truck
-        self.addresses_not_yet_delivered.remove(address_id)  # O(n) - list remove
+        self.addresses_not_yet_delivered.discard(address_id)  # O(1) - set remove
 
-    def deliver_all(self):
+    def plan_route(self) -> [int]:
         """
-        Delivers all packages in the truck.
+        Plans the order the truck visits its remaining addresses in, nearest address first, without moving the truck.
 
         Returns:
-            None
+            [int]: The address IDs the truck has not delivered to yet in visiting order.
 
         Notes:
             time complexity:
+                best case = O(n)
+                worst case = O(n^2 log n)
+                average case = O(n) amortized
+            space complexity:
                 best case = O(n)
                 worst case = O(n)
+                average case = O(n)
+        """
+        cursor = nearest_neighbor.neighbor_cursor(
+            __init__.distances,
+            self.addresses_not_in_this_truck + self.visited_addresses,
+        )  # O(n) - function call once the index is built
+
+        route = []
+        address_id = cursor.nearest(self.current_address)
+        while address_id is not None:  # O(n) - while loop
+            route.append(address_id)
+            cursor.visit(address_id)
+            address_id = cursor.nearest(address_id)  # O(1) amortized - cursor advance
+
+        return route
+
+    def address_deadlines(self) -> dict:
+        """
+        Finds the earliest delivery deadline of the packages on the truck for each address.
+
+        Returns:
+            dict: The earliest delivery deadline for each address ID with a deadline before the end of the day.
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+            space complexity:
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        deadlines = {}
+
+        for package in __init__.packages.get_many(self.packages):  # O(n) - batch get
+            deadline = delivery_time_calculator.deadline_time(package.delivery_deadline)
+            if deadline != delivery_time_calculator.end_of_day:
+                deadlines[package.address_id] = min(
+                    deadline, deadlines.get(package.address_id, deadline)
+                )
+
+        return deadlines
+
+    def deliver_all(self, planned_route: [int] = None):
+        """
+        Delivers all packages in the truck. The truck plans its route nearest address first, shortens it while keeping
+        every delivery on time, exactly with Held-Karp for up to exact_route_max_stops stops and with 2-opt and Or-opt
+        moves for up to route_improvement_time_budget seconds otherwise, from multi_start_routes starts in parallel
+        when that is above 0, and then drives it.
+
+        Args:
+            planned_route ([int]): The address IDs to visit in order, such as a route from a fleet plan, to shorten
+                instead of the nearest address first route. Defaults to planning the route.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(n)
+                worst case = O(n^3) per improvement round, bounded by the time budget
                 average case = O(n^2)
             space complexity:
-                best case = O(1)
-                worst case = O(1)
-                average case = O(1)
+                best case = O(n)
+                worst case = O(n)
+                average case = O(n)
+        """
+        if planned_route is None:
+            planned_route = self.plan_route()  # O(n) - function call
+
+        route = [self.current_address] + list(planned_route) + [0]
+
+        if __init__.route_improvement_time_budget > 0:
+            # Optimize over the distances between the route's own addresses, numbered by position in stops
+            stops, distances = route_optimizer.stop_distances(route, __init__.distances)  # O(n^2) - function call
+            stop_index = {stops[i]: i for i in range(len(stops))}
+            route = [stop_index[i] for i in route]
+            deadlines = {
+                stop_index[i]: deadline
+                for i, deadline in self.address_deadlines().items()
+                if i in stop_index
+            }
+
+            if (
+                __init__.multi_start_routes > 0
+                and len(route) - 2 > __init__.exact_route_max_stops
+            ):
+                # Improve large routes from many starts across all processors
+                route = route_optimizer.multi_start_route(
+                    route,
+                    distances,
+                    self.truck_time,
+                    deadlines,
+                    __init__.multi_start_routes,
+                    __init__.route_improvement_time_budget,
+                )  # O(s * n^2 / p) - function call
+            else:
+                route = route_optimizer.optimize_route(
+                    route,
+                    distances,
+                    __init__.route_improvement_time_budget,
+                    route_optimizer.deadline_checker(
+                        route, distances, self.truck_time, deadlines
+                    ),
+                    candidates=route_optimizer.route_candidates(distances),
+                    addresses=stops,
+                )  # O(2^n * n^2) - function call for small routes, O(n^2) otherwise
+
+            route = [stops[i] for i in route]
+
+        # Work out every arrival time of the route at once, then drive it
+        times = delivery_time_calculator.route_arrival_times(
+            route, __init__.distances, self.truck_time
+        )  # O(n) - function call
+
+        for address_id, delivery_time in zip(route[1:-1], times[1:-1]):  # O(n) - for loop
+            self.deliver(address_id, delivery_time)
+
+        self.return_truck(times[-1])
+
+    def restore(self, packages) -> None:
+        """
+        Restores the truck as it was at the end of the day from the packages it delivered, such as those of a package
+        table saved by an earlier run, without driving its route again. The truck visited the addresses in the order
+        of their delivery times and drove back to the hub after the last one.
+
+        Args:
+            packages: The package store the truck delivered the packages of, such as a package_file.MappedPackageTable.
+
+        Returns:
+            None
+
+        Notes:
+            time complexity:
+                best case = O(k log k)
+                worst case = O(k log k)
+                average case = O(k log k)
+            space complexity:
+                best case = O(k)
+                worst case = O(k)
+                average case = O(k)
         """
-        while len(self.addresses_not_yet_delivered) > 0:  # O(n) - while loop
-            self.deliver(self.nearest_address())
+        truck_packages = packages.get_many(packages.lookup("truck_id", self.id))  # O(k log k) - index lookup
+        delivered = sorted(
+            (i for i in truck_packages if i.delivery_time is not None),
+            key=lambda x: x.delivery_time,
+        )  # O(k log k) - sort
+
+        self.packages = [i.id for i in truck_packages]
+        self.packages_delivered = [i.id for i in delivered]
+        self.departure_time = min(
+            (i.departure_time for i in truck_packages if i.departure_time is not None), default=None
+        )
+        self.truck_time = self.departure_time
+        self.distance_traveled = 0
+        self.current_address = 0
 
+        # Drive the legs between the addresses again on paper, in the order they were reached
+        for package in delivered:  # O(k) - for loop
+            address_packages = self.address_packages.setdefault(package.address_id, [])
+            address_packages.append(package.id)
+            if len(address_packages) == 1:
+                added_distance = __init__.distances.dist(self.current_address, package.address_id)
+                self.traveled_distances.append(added_distance)
+                self.distance_traveled += added_distance
+                self.addresses.append(package.address_id)
+                self.visited_addresses.append(package.address_id)
+                self.current_address = package.address_id
+            self.truck_time = package.delivery_time
+
+        if self.truck_time is None:
+            self.truck_time = 0
         self.return_truck()
 
 